@@ -1,4 +1,5 @@
 import 'transaction.dart';
+import 'transaction_split.dart';
 
 class CategoryInfo {
   final int id;
@@ -118,6 +119,38 @@ class AnalyticsSummary {
   }
 }
 
+class TimeSeriesPoint {
+  final DateTime periodStart;
+  final int? groupId;
+  final double spending;
+  final double income;
+  final double net;
+
+  TimeSeriesPoint({
+    required this.periodStart,
+    this.groupId,
+    required this.spending,
+    required this.income,
+    required this.net,
+  });
+
+  factory TimeSeriesPoint.fromJson(Map<String, dynamic> json) {
+    return TimeSeriesPoint(
+      periodStart: DateTime.parse(json['period_start']),
+      groupId: json['group_id'],
+      spending: json['spending'].toDouble(),
+      income: json['income'].toDouble(),
+      net: json['net'].toDouble(),
+    );
+  }
+
+  static List<TimeSeriesPoint> listFromJson(Map<String, dynamic> json) {
+    return (json['points'] as List)
+        .map((p) => TimeSeriesPoint.fromJson(p))
+        .toList();
+  }
+}
+
 class AnalyticsResponse {
   final List<Transaction> transactions;
   final Map<int, CategoryInfo> categories;
@@ -135,9 +168,11 @@ class AnalyticsResponse {
 
   factory AnalyticsResponse.fromJson(Map<String, dynamic> json) {
     return AnalyticsResponse(
-      transactions: (json['transactions'] as List)
-          .map((t) => Transaction.fromJson(t))
-          .toList(),
+      transactions: json['columnar'] != null
+          ? _transactionsFromColumnar(json['columnar'])
+          : (json['transactions'] as List)
+              .map((t) => Transaction.fromJson(t))
+              .toList(),
       categories: Map<int, CategoryInfo>.from(
         (json['categories'] as Map).map(
           (k, v) => MapEntry(int.parse(k.toString()), CategoryInfo.fromJson(v)),
@@ -158,6 +193,71 @@ class AnalyticsResponse {
     );
   }
 
+  /// Decode the `format=columnar` parallel arrays back into transactions.
+  static List<Transaction> _transactionsFromColumnar(Map<String, dynamic> c) {
+    final deltaEncoded = c['delta_encoded'] == true;
+    final accountKeys = List<String>.from(c['account_keys']);
+    final subcategoryKeys = List<int>.from(c['subcategory_keys']);
+    int? subcategory(int index) => index >= 0 ? subcategoryKeys[index] : null;
+
+    // Epoch seconds hold the naive server timestamps; keep them as wall-clock
+    // values like DateTime.parse does for the JSON format
+    DateTime fromEpoch(int seconds) {
+      final utc = DateTime.fromMillisecondsSinceEpoch(seconds * 1000, isUtc: true);
+      return DateTime(utc.year, utc.month, utc.day, utc.hour, utc.minute, utc.second);
+    }
+
+    List<int> absolute(List<dynamic> values) {
+      final result = List<int>.from(values);
+      if (deltaEncoded) {
+        for (var i = 1; i < result.length; i++) {
+          result[i] += result[i - 1];
+        }
+      }
+      return result;
+    }
+
+    final ids = absolute(c['id']);
+    final posted = absolute(c['posted']);
+    final createdAt = absolute(c['created_at']);
+
+    final splits = c['splits'] as Map<String, dynamic>;
+    final splitsByTransaction = <int, List<TransactionSplit>>{};
+    final splitIds = splits['id'] as List;
+    for (var j = 0; j < splitIds.length; j++) {
+      splitsByTransaction
+          .putIfAbsent(splits['transaction_index'][j], () => [])
+          .add(TransactionSplit(
+            id: splitIds[j],
+            subcategoryId: subcategory(splits['subcategory_index'][j])!,
+            amount: (splits['amount'][j] as num).toDouble(),
+            memo: splits['memo'][j],
+            createdAt: fromEpoch(splits['created_at'][j]),
+          ));
+    }
+
+    return List<Transaction>.generate(ids.length, (i) {
+      final transactedAtOffset = c['transacted_at_offset'][i] as int?;
+      return Transaction(
+        id: ids[i],
+        accountId: accountKeys[c['account_index'][i]],
+        amount: (c['amount'][i] as num).toDouble(),
+        effectiveDate: fromEpoch(posted[i] + (transactedAtOffset ?? 0)),
+        name: c['name'][i],
+        memo: c['memo'][i],
+        subcategoryId: subcategory(c['subcategory_index'][i]),
+        pending: c['pending'][i],
+        createdAt: fromEpoch(createdAt[i]),
+        isTransfer: c['is_transfer'][i],
+        transferAccountId: c['transfer_account_id'][i],
+        predictedSubcategoryId: subcategory(c['predicted_subcategory_index'][i]),
+        predictedConfidence: (c['predicted_confidence'][i] as num?)?.toDouble(),
+        isSplit: c['is_split'][i],
+        splits: splitsByTransaction[i] ?? [],
+      );
+    });
+  }
+
   // Helper methods for easy lookups
   String? getCategoryName(int? subcategoryId) {
     if (subcategoryId == null) return null;
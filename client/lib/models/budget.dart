@@ -4,6 +4,8 @@ class Budget {
   final int month;
   final int year;
   final DateTime startDate;
+  final double income;
+  final double readyToAssign;
   final DateTime? createdAt;
   final DateTime? updatedAt;
   final List<SubcategoryBudget>? subcategoryBudgets;
@@ -14,6 +16,8 @@ class Budget {
     required this.month,
     required this.year,
     required this.startDate,
+    this.income = 0.0,
+    this.readyToAssign = 0.0,
     this.createdAt,
     this.updatedAt,
     this.subcategoryBudgets,
@@ -26,6 +30,8 @@ class Budget {
       month: json['month'],
       year: json['year'],
       startDate: DateTime.parse(json['start_date']),
+      income: (json['income'] ?? 0).toDouble(),
+      readyToAssign: (json['ready_to_assign'] ?? 0).toDouble(),
       createdAt: json['created_at'] != null
           ? DateTime.parse(json['created_at'])
           : null,
@@ -59,6 +65,8 @@ class Budget {
     int? month,
     int? year,
     DateTime? startDate,
+    double? income,
+    double? readyToAssign,
     DateTime? createdAt,
     DateTime? updatedAt,
     List<SubcategoryBudget>? subcategoryBudgets
@@ -69,6 +77,8 @@ class Budget {
       month: month ?? this.month,
       year: year ?? this.year,
       startDate: startDate ?? this.startDate,
+      income: income ?? this.income,
+      readyToAssign: readyToAssign ?? this.readyToAssign,
       createdAt: createdAt ?? this.createdAt,
       updatedAt: updatedAt ?? this.updatedAt,
       subcategoryBudgets: subcategoryBudgets ?? this.subcategoryBudgets
@@ -87,6 +97,9 @@ class SubcategoryBudget {
   final double totalBalance;
   final double monthlyActivity;
   final double monthlyAvailable;
+  final double projectedActivity;
+  final double stillNeeded;
+  final double suggestedAllocation;
   final DateTime? createdAt;
   final DateTime? updatedAt;
 
@@ -101,6 +114,9 @@ class SubcategoryBudget {
     required this.totalBalance,
     required this.monthlyActivity,
     required this.monthlyAvailable,
+    this.projectedActivity = 0.0,
+    this.stillNeeded = 0.0,
+    this.suggestedAllocation = 0.0,
     this.createdAt,
     this.updatedAt,
   });
@@ -117,6 +133,9 @@ class SubcategoryBudget {
       totalBalance: json['total_balance'].toDouble(),
       monthlyActivity: json['monthly_activity'].toDouble(),
       monthlyAvailable: json['monthly_available'].toDouble(),
+      projectedActivity: (json['projected_activity'] ?? 0).toDouble(),
+      stillNeeded: (json['still_needed'] ?? 0).toDouble(),
+      suggestedAllocation: (json['suggested_allocation'] ?? 0).toDouble(),
       createdAt: json['created_at'] != null
           ? DateTime.parse(json['created_at'])
           : null,
@@ -145,6 +164,9 @@ class SubcategoryBudget {
     double? totalBalance,
     double? monthlyActivity,
     double? monthlyAvailable,
+    double? projectedActivity,
+    double? stillNeeded,
+    double? suggestedAllocation,
     DateTime? createdAt,
     DateTime? updatedAt,
   }) {
@@ -159,6 +181,9 @@ class SubcategoryBudget {
       totalBalance: totalBalance ?? this.totalBalance,
       monthlyActivity: monthlyActivity ?? this.monthlyActivity,
       monthlyAvailable: monthlyAvailable ?? this.monthlyAvailable,
+      projectedActivity: projectedActivity ?? this.projectedActivity,
+      stillNeeded: stillNeeded ?? this.stillNeeded,
+      suggestedAllocation: suggestedAllocation ?? this.suggestedAllocation,
       createdAt: createdAt ?? this.createdAt,
       updatedAt: updatedAt ?? this.updatedAt,
     );
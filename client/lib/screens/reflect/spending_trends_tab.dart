@@ -1,16 +1,22 @@
 import 'package:flutter/material.dart';
 import 'package:fl_chart/fl_chart.dart';
 import 'package:intl/intl.dart';
+import 'package:provider/provider.dart';
 import '../../models/analytics.dart';
 import '../../models/transaction.dart';
+import '../../services/api_service.dart';
 
 class SpendingTrendsTab extends StatefulWidget {
   final AnalyticsResponse? analyticsData;
+  final DateTime? startDate;
+  final DateTime? endDate;
   final VoidCallback onRefresh;
 
   const SpendingTrendsTab({
     super.key,
     required this.analyticsData,
+    this.startDate,
+    this.endDate,
     required this.onRefresh,
   });
 
@@ -21,6 +27,51 @@ class SpendingTrendsTab extends StatefulWidget {
 class _SpendingTrendsTabState extends State<SpendingTrendsTab> {
   String _selectedView = 'daily'; // 'daily', 'weekly', 'monthly'
   int? _selectedCategoryId;
+  // Server-side buckets for the chart (one point per period, not per transaction)
+  List<TimeSeriesPoint> _series = [];
+
+  @override
+  void initState() {
+    super.initState();
+    _loadSeries();
+  }
+
+  @override
+  void didUpdateWidget(covariant SpendingTrendsTab oldWidget) {
+    super.didUpdateWidget(oldWidget);
+    if (oldWidget.analyticsData != widget.analyticsData ||
+        oldWidget.startDate != widget.startDate ||
+        oldWidget.endDate != widget.endDate) {
+      _loadSeries();
+    }
+  }
+
+  Future<void> _loadSeries() async {
+    final interval = _selectedView == 'daily'
+        ? 'day'
+        : _selectedView == 'weekly'
+            ? 'week'
+            : 'month';
+    try {
+      final apiService = Provider.of<ApiService>(context, listen: false);
+      final data = await apiService.analytics.getTimeSeries(
+        interval: interval,
+        groupBy: _selectedCategoryId != null ? 'category' : null,
+        startDate: widget.startDate,
+        endDate: widget.endDate,
+      );
+      if (!mounted) return;
+      setState(() {
+        _series = TimeSeriesPoint.listFromJson(data);
+      });
+    } catch (e) {
+      if (mounted) {
+        ScaffoldMessenger.of(context).showSnackBar(
+          SnackBar(content: Text('Failed to load spending trends: $e')),
+        );
+      }
+    }
+  }
 
   @override
   Widget build(BuildContext context) {
@@ -94,6 +145,7 @@ class _SpendingTrendsTabState extends State<SpendingTrendsTab> {
         setState(() {
           _selectedView = selection.first;
         });
+        _loadSeries();
       },
     );
   }
@@ -113,6 +165,7 @@ class _SpendingTrendsTabState extends State<SpendingTrendsTab> {
             setState(() {
               _selectedCategoryId = null;
             });
+            _loadSeries();
           },
         ),
         ...categories.map((category) {
@@ -123,6 +176,7 @@ class _SpendingTrendsTabState extends State<SpendingTrendsTab> {
               setState(() {
                 _selectedCategoryId = selected ? category.id : null;
               });
+              _loadSeries();
             },
           );
         }),
@@ -267,17 +321,27 @@ class _SpendingTrendsTabState extends State<SpendingTrendsTab> {
     return '$view Spending$category';
   }
 
-  List<FlSpot> _getChartData() {
-    final transactions = _getFilteredTransactions();
-    if (transactions.isEmpty) return [];
-
-    // Group transactions by the selected view
+  /// Spending per period start for the selected view and category filter.
+  Map<DateTime, double> _getBucketedSpending() {
     final Map<DateTime, double> groupedData = {};
-
-    for (var transaction in transactions) {
-      final date = _normalizeDate(transaction.effectiveDate);
-      groupedData[date] = (groupedData[date] ?? 0) + transaction.amount.abs();
+    for (var point in _series) {
+      if (_selectedCategoryId != null && point.groupId != _selectedCategoryId) {
+        continue;
+      }
+      if (point.spending == 0) continue;
+      final date = DateTime(
+        point.periodStart.year,
+        point.periodStart.month,
+        point.periodStart.day,
+      );
+      groupedData[date] = (groupedData[date] ?? 0) + point.spending.abs();
     }
+    return groupedData;
+  }
+
+  List<FlSpot> _getChartData() {
+    final groupedData = _getBucketedSpending();
+    if (groupedData.isEmpty) return [];
 
     // Convert to FlSpot list
     final sortedDates = groupedData.keys.toList()..sort();
@@ -300,20 +364,6 @@ class _SpendingTrendsTabState extends State<SpendingTrendsTab> {
     }).toList();
   }
 
-  DateTime _normalizeDate(DateTime date) {
-    if (_selectedView == 'daily') {
-      return DateTime(date.year, date.month, date.day);
-    } else if (_selectedView == 'weekly') {
-      // Get Monday of the week
-      final weekday = date.weekday;
-      final monday = date.subtract(Duration(days: weekday - 1));
-      return DateTime(monday.year, monday.month, monday.day);
-    } else {
-      // monthly
-      return DateTime(date.year, date.month, 1);
-    }
-  }
-
   DateTime _incrementDate(DateTime date) {
     if (_selectedView == 'daily') {
       return date.add(const Duration(days: 1));
@@ -326,14 +376,8 @@ class _SpendingTrendsTabState extends State<SpendingTrendsTab> {
   }
 
   DateTime _getDateForIndex(int index) {
-    final transactions = _getFilteredTransactions();
-    if (transactions.isEmpty) return DateTime.now();
-
-    final dates = transactions
-        .map((t) => _normalizeDate(t.effectiveDate))
-        .toSet()
-        .toList()
-      ..sort();
+    final dates = _getBucketedSpending().keys.toList()..sort();
+    if (dates.isEmpty) return DateTime.now();
 
     if (index >= dates.length) return dates.last;
 
@@ -352,14 +396,8 @@ class _SpendingTrendsTabState extends State<SpendingTrendsTab> {
   }
 
   double _getBottomInterval() {
-    final transactions = _getFilteredTransactions();
-    if (transactions.isEmpty) return 1;
-
-    final dates = transactions
-        .map((t) => _normalizeDate(t.effectiveDate))
-        .toSet()
-        .toList();
-    final count = dates.length;
+    final count = _getBucketedSpending().length;
+    if (count == 0) return 1;
 
     if (_selectedView == 'daily') {
       if (count <= 7) return 1;
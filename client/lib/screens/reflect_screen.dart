@@ -49,6 +49,7 @@ class _ReflectScreenState extends State<ReflectScreen>
       final data = await apiService.analytics.getAnalyticsData(
         startDate: _startDate,
         endDate: _endDate,
+        columnar: true,
       );
 
       setState(() {
@@ -132,6 +133,8 @@ class _ReflectScreenState extends State<ReflectScreen>
                       ),
                       SpendingTrendsTab(
                         analyticsData: _analyticsData,
+                        startDate: _startDate,
+                        endDate: _endDate,
                         onRefresh: _loadData,
                       ),
                       NetWorthTab(
@@ -15,6 +15,27 @@ class AccountApiService extends BaseApiService {
     return data['total_balance'].toDouble();
   }
 
+  /// Net worth over time from per-sync balance snapshots.
+  /// [interval] may be 'day', 'week' or 'month'.
+  Future<Map<String, dynamic>> getNetWorth({
+    DateTime? startDate,
+    DateTime? endDate,
+    String interval = 'day',
+  }) async {
+    final queryParams = <String, String>{'interval': interval};
+    if (startDate != null) {
+      queryParams['start_date'] = startDate.toIso8601String().split('T').first;
+    }
+    if (endDate != null) {
+      queryParams['end_date'] = endDate.toIso8601String().split('T').first;
+    }
+
+    final queryString =
+        '?${queryParams.entries.map((e) => '${e.key}=${e.value}').join('&')}';
+
+    return await get('/api/accounts/net_worth$queryString');
+  }
+
   Future<ApiResult> updateType(String id, AccountType newType) async {
     final data = await post(
       '/api/accounts/$id/updateType',
@@ -3,12 +3,23 @@ import 'base_api_service.dart';
 class AnalyticsApiService extends BaseApiService {
   AnalyticsApiService({required super.baseUrl});
 
-  /// Get comprehensive analytics data with normalized structure
+  /// Get comprehensive analytics data with normalized structure.
+  /// The transaction list is only included when [includeTransactions] is true.
+  /// With [columnar] the transactions come back as delta-encoded parallel
+  /// arrays, which AnalyticsResponse.fromJson decodes transparently.
   Future<Map<String, dynamic>> getAnalyticsData({
     DateTime? startDate,
     DateTime? endDate,
+    bool includeTransactions = true,
+    bool columnar = false,
   }) async {
     final queryParams = <String, String>{};
+    if (columnar) {
+      queryParams['format'] = 'columnar';
+      queryParams['delta'] = 'true';
+    } else if (includeTransactions) {
+      queryParams['include_transactions'] = 'true';
+    }
     if (startDate != null) {
       queryParams['start_date'] = startDate.toIso8601String();
     }
@@ -23,9 +34,13 @@ class AnalyticsApiService extends BaseApiService {
     return await get('/api/analytics/data$queryString');
   }
 
+  /// Split-aware spending per category. [drillDown] adds per-subcategory totals;
+  /// [accountIds] limits the breakdown to those accounts.
   Future<Map<String, dynamic>> getSpendingBreakdown({
     DateTime? startDate,
     DateTime? endDate,
+    List<String>? accountIds,
+    bool drillDown = false,
   }) async {
     final queryParams = <String, String>{};
     if (startDate != null) {
@@ -34,19 +49,30 @@ class AnalyticsApiService extends BaseApiService {
     if (endDate != null) {
       queryParams['end_date'] = endDate.toIso8601String();
     }
+    if (drillDown) {
+      queryParams['drill_down'] = 'true';
+    }
 
-    final queryString = queryParams.isEmpty
-        ? ''
-        : '?${queryParams.entries.map((e) => '${e.key}=${e.value}').join('&')}';
+    final params = [
+      ...queryParams.entries.map((e) => '${e.key}=${e.value}'),
+      ...?accountIds?.map((id) => 'account_id=${Uri.encodeQueryComponent(id)}'),
+    ];
+    final queryString = params.isEmpty ? '' : '?${params.join('&')}';
 
     return await get('/api/analytics/spending_breakdown$queryString');
   }
 
+  /// Income vs spending totals; [groupBy] may be 'month', 'account' or
+  /// 'category' to also get per-group totals in `groups`.
   Future<Map<String, dynamic>> getIncomeVsSpending({
     DateTime? startDate,
     DateTime? endDate,
+    String? groupBy,
   }) async {
     final queryParams = <String, String>{};
+    if (groupBy != null) {
+      queryParams['group_by'] = groupBy;
+    }
     if (startDate != null) {
       queryParams['start_date'] = startDate.toIso8601String();
     }
@@ -60,4 +86,54 @@ class AnalyticsApiService extends BaseApiService {
 
     return await get('/api/analytics/income_vs_spending$queryString');
   }
+
+  /// Get spending/income bucketed server-side per day, week or month.
+  /// [groupBy] may be 'category' or 'subcategory'.
+  Future<Map<String, dynamic>> getTimeSeries({
+    String interval = 'day',
+    String? groupBy,
+    DateTime? startDate,
+    DateTime? endDate,
+  }) async {
+    final queryParams = <String, String>{'interval': interval};
+    if (groupBy != null) {
+      queryParams['group_by'] = groupBy;
+    }
+    if (startDate != null) {
+      queryParams['start_date'] = startDate.toIso8601String();
+    }
+    if (endDate != null) {
+      queryParams['end_date'] = endDate.toIso8601String();
+    }
+
+    final queryString =
+        '?${queryParams.entries.map((e) => '${e.key}=${e.value}').join('&')}';
+
+    return await get('/api/analytics/timeseries$queryString');
+  }
+
+  /// Category (or subcategory) × month matrix with row/column totals.
+  /// Pass [year], or both [startDate] and [endDate].
+  Future<Map<String, dynamic>> getPivot({
+    int? year,
+    DateTime? startDate,
+    DateTime? endDate,
+    String groupBy = 'category',
+  }) async {
+    final queryParams = <String, String>{'group_by': groupBy};
+    if (year != null) {
+      queryParams['year'] = year.toString();
+    }
+    if (startDate != null) {
+      queryParams['start_date'] = startDate.toIso8601String();
+    }
+    if (endDate != null) {
+      queryParams['end_date'] = endDate.toIso8601String();
+    }
+
+    final queryString =
+        '?${queryParams.entries.map((e) => '${e.key}=${e.value}').join('&')}';
+
+    return await get('/api/analytics/pivot$queryString');
+  }
 }
@@ -4,12 +4,27 @@ import 'package:http/http.dart' as http;
 class BaseApiService {
   final String baseUrl;
 
+  // Last ETag and body per GET endpoint, shared by all API services so a
+  // repeated request for unchanged data is answered with 304 Not Modified
+  static final Map<String, _CachedResponse> _etagCache = {};
+
   BaseApiService({required this.baseUrl});
 
   Future<dynamic> get(String endpoint) async {
-    final response = await http.get(Uri.parse('$baseUrl$endpoint'));
+    final url = '$baseUrl$endpoint';
+    final cached = _etagCache[url];
+    final response = await http.get(
+      Uri.parse(url),
+      headers: cached != null ? {'If-None-Match': cached.etag} : null,
+    );
 
-    if (response.statusCode == 200) {
+    if (response.statusCode == 304 && cached != null) {
+      return jsonDecode(cached.body);
+    } else if (response.statusCode == 200) {
+      final etag = response.headers['etag'];
+      if (etag != null) {
+        _etagCache[url] = _CachedResponse(etag, response.body);
+      }
       return jsonDecode(response.body);
     } else if (response.statusCode == 404) {
       return null;
@@ -18,6 +33,18 @@ class BaseApiService {
     }
   }
 
+  /// GET that also returns the response headers (lower-cased names), for
+  /// endpoints that pass pagination cursors in headers. Not ETag-cached.
+  Future<(dynamic, Map<String, String>)> getWithHeaders(String endpoint) async {
+    final response = await http.get(Uri.parse('$baseUrl$endpoint'));
+
+    if (response.statusCode == 200) {
+      return (jsonDecode(response.body), response.headers);
+    } else {
+      throw Exception('GET $endpoint failed: ${response.statusCode}');
+    }
+  }
+
   Future<dynamic> post(String endpoint, {Map<String, dynamic>? body}) async {
     final response = await http.post(
       Uri.parse('$baseUrl$endpoint'),
@@ -46,3 +73,10 @@ class BaseApiService {
     }
   }
 }
+
+class _CachedResponse {
+  final String etag;
+  final String body;
+
+  _CachedResponse(this.etag, this.body);
+}
@@ -15,6 +15,35 @@ class BudgetApiService extends BaseApiService {
     return await get('/api/budgets/$year/$month');
   }
 
+  /// Budgets for [months] consecutive months starting at [year]/[month],
+  /// oldest first, in one request.
+  Future<List<dynamic>> getBudgetRange(
+    int year,
+    int month, {
+    int months = 12,
+  }) async {
+    return await get('/api/budgets/range?year=$year&month=$month&months=$months');
+  }
+
+  /// What-if projection of the coming months' balances. [scenario] may hold
+  /// months, assignment_changes, recurring_bills and income_change; nothing is
+  /// saved, so this can be called as the user adjusts values.
+  Future<Map<String, dynamic>> simulateBudget(
+    Map<String, dynamic> scenario,
+  ) async {
+    return await post('/api/budgets/simulate', body: scenario);
+  }
+
+  /// Per-subcategory needs for a budget's month and how [funds] (default:
+  /// ready to assign) would be allocated across them.
+  Future<Map<String, dynamic>> getFundingPlan(
+    int budgetId, {
+    double? funds,
+  }) async {
+    final query = funds != null ? '?funds=$funds' : '';
+    return await get('/api/budgets/$budgetId/funding-plan$query');
+  }
+
   Future<Map<String, dynamic>> createBudget(
     Map<String, dynamic> budgetData,
   ) async {
@@ -45,6 +74,31 @@ class BudgetApiService extends BaseApiService {
     );
   }
 
+  /// Applies several changes to a budget in one request, in order: copy
+  /// [copyFromYear]/[copyFromMonth]'s assignments (and targets if
+  /// [copyTargets]), assign every target if [assignToTargets], then [changes]
+  /// (maps with subcategory_budget_id and monthly_assigned/monthly_target).
+  /// Returns the updated budget.
+  Future<Map<String, dynamic>> applyBudgetChanges({
+    required int budgetId,
+    List<Map<String, dynamic>> changes = const [],
+    int? copyFromYear,
+    int? copyFromMonth,
+    bool copyTargets = false,
+    bool assignToTargets = false,
+  }) async {
+    return await post(
+      '/api/budgets/$budgetId/subcategories/batch',
+      body: {
+        if (copyFromYear != null && copyFromMonth != null)
+          'copy_from': {'year': copyFromYear, 'month': copyFromMonth},
+        'copy_targets': copyTargets,
+        'assign_to_targets': assignToTargets,
+        'changes': changes,
+      },
+    );
+  }
+
   Future<Map<String, dynamic>> createBudgetWithAllCategories(
     String budgetName,
   ) async {
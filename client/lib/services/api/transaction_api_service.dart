@@ -24,6 +24,73 @@ class TransactionApiService extends BaseApiService {
     return await get(url);
   }
 
+  /// One page of transactions, newest first, with server-side filters.
+  /// Pass the returned nextCursor back as [cursor] for the following page;
+  /// it is null on the last page.
+  Future<({List<dynamic> items, String? nextCursor})> getTransactionsPage({
+    String? cursor,
+    int limit = 100,
+    DateTime? startDate,
+    DateTime? endDate,
+    List<String>? accountIds,
+    int? subcategoryId,
+    int? categoryId,
+    bool uncategorized = false,
+    double? minAmount,
+    double? maxAmount,
+    bool? pending,
+    bool? isTransfer,
+  }) async {
+    final params = <String>['limit=$limit'];
+    if (cursor != null) params.add('cursor=$cursor');
+    if (startDate != null) {
+      params.add('start_date=${startDate.toIso8601String().split('T')[0]}');
+    }
+    if (endDate != null) {
+      params.add('end_date=${endDate.toIso8601String().split('T')[0]}');
+    }
+    for (final id in accountIds ?? const <String>[]) {
+      params.add('account_id=${Uri.encodeQueryComponent(id)}');
+    }
+    if (subcategoryId != null) params.add('subcategory_id=$subcategoryId');
+    if (categoryId != null) params.add('category_id=$categoryId');
+    if (uncategorized) params.add('uncategorized=true');
+    if (minAmount != null) params.add('min_amount=$minAmount');
+    if (maxAmount != null) params.add('max_amount=$maxAmount');
+    if (pending != null) params.add('pending=$pending');
+    if (isTransfer != null) params.add('is_transfer=$isTransfer');
+
+    final (data, headers) =
+        await getWithHeaders('/api/transactions/?${params.join('&')}');
+    return (items: data as List<dynamic>, nextCursor: headers['x-next-cursor']);
+  }
+
+  /// Full-text search over name, memo and merchant names. Words match as
+  /// prefixes; wrap text in double quotes for an exact phrase.
+  Future<List<dynamic>> searchTransactions(
+    String query, {
+    double? minAmount,
+    double? maxAmount,
+    DateTime? startDate,
+    DateTime? endDate,
+    int skip = 0,
+    int limit = 50,
+  }) async {
+    String url =
+        '/api/transactions/search?q=${Uri.encodeQueryComponent(query)}&skip=$skip&limit=$limit';
+
+    if (minAmount != null) url += '&min_amount=$minAmount';
+    if (maxAmount != null) url += '&max_amount=$maxAmount';
+    if (startDate != null) {
+      url += '&start_date=${startDate.toIso8601String().split('T')[0]}';
+    }
+    if (endDate != null) {
+      url += '&end_date=${endDate.toIso8601String().split('T')[0]}';
+    }
+
+    return await get(url);
+  }
+
   Future<void> categorizeTransaction(
       int transactionId, int subcategoryId) async {
     await post(
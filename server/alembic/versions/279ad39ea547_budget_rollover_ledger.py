@@ -0,0 +1,31 @@
+"""budget rollover ledger
+
+Revision ID: 279ad39ea547
+Revises: a3c084dda473
+Create Date: 2026-10-19 08:56:19.608265
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '279ad39ea547'
+down_revision: Union[str, None] = 'a3c084dda473'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Existing budgets start dirty so the first ledger pass fills in closing balances
+    op.add_column('budgets', sa.Column('ledger_dirty', sa.Boolean(), nullable=False, server_default=sa.true()))
+    op.create_index(op.f('ix_budgets_ledger_dirty'), 'budgets', ['ledger_dirty'], unique=False)
+    op.add_column('subcategory_budgets', sa.Column('closing_balance', sa.Float(), nullable=False, server_default='0'))
+
+
+def downgrade() -> None:
+    op.drop_column('subcategory_budgets', 'closing_balance')
+    op.drop_index(op.f('ix_budgets_ledger_dirty'), table_name='budgets')
+    op.drop_column('budgets', 'ledger_dirty')
@@ -0,0 +1,37 @@
+"""unique budget month
+
+Revision ID: 4971ddcb0b6a
+Revises: 279ad39ea547
+Create Date: 2026-10-19 08:58:01.957706
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4971ddcb0b6a'
+down_revision: Union[str, None] = '279ad39ea547'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Keep the oldest budget of any month that was auto-created twice
+    op.execute(
+        "DELETE FROM subcategory_budgets WHERE budget_id IN ("
+        "SELECT id FROM budgets WHERE id NOT IN (SELECT min(id) FROM budgets GROUP BY year, month))"
+    )
+    op.execute("DELETE FROM budgets WHERE id NOT IN (SELECT min(id) FROM budgets GROUP BY year, month)")
+    # SQLite cannot add a constraint in place, so the table is rebuilt
+    with op.batch_alter_table('budgets') as batch_op:
+        batch_op.create_unique_constraint('uq_budgets_year_month', ['year', 'month'])
+    # Recompute rollover on next startup in case a removed duplicate had fed it
+    op.execute("UPDATE budgets SET ledger_dirty = 1")
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('budgets') as batch_op:
+        batch_op.drop_constraint('uq_budgets_year_month', type_='unique')
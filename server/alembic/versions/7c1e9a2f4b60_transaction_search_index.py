@@ -0,0 +1,37 @@
+"""transaction search index
+
+Revision ID: 7c1e9a2f4b60
+Revises: 633c5a14d9bb
+Create Date: 2026-10-19 09:05:12.418203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.search_index import create_search_index, SEARCH_TABLE
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c1e9a2f4b60'
+down_revision: Union[str, None] = '633c5a14d9bb'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # FTS5 table plus sync triggers; indexes existing transactions
+    create_search_index(op.get_bind())
+
+
+def downgrade() -> None:
+    for trigger in (
+        'transactions_fts_insert',
+        'transactions_fts_update',
+        'transactions_fts_delete',
+        'transaction_merchants_fts_insert',
+        'transaction_merchants_fts_delete',
+    ):
+        op.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+    op.execute(f'DROP TABLE IF EXISTS {SEARCH_TABLE}')
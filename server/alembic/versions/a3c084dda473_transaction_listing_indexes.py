@@ -0,0 +1,38 @@
+"""transaction listing indexes
+
+Revision ID: a3c084dda473
+Revises: 7c1e9a2f4b60
+Create Date: 2026-10-19 08:49:46.036499
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3c084dda473'
+down_revision: Union[str, None] = '7c1e9a2f4b60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(op.f('ix_transaction_splits_subcategory_id'), 'transaction_splits', ['subcategory_id'], unique=False)
+    # Expression indexes (not detected by autogenerate) backing keyset pagination
+    effective_date = sa.text('coalesce(transacted_at, posted)')
+    op.create_index('ix_transactions_effective_date_id', 'transactions', [effective_date, 'id'], unique=False)
+    op.create_index(
+        'ix_transactions_account_effective_date', 'transactions', ['account_id', effective_date, 'id'], unique=False
+    )
+    op.create_index(
+        'ix_transactions_subcategory_effective_date', 'transactions', ['subcategory_id', effective_date, 'id'], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_transactions_subcategory_effective_date', table_name='transactions')
+    op.drop_index('ix_transactions_account_effective_date', table_name='transactions')
+    op.drop_index('ix_transactions_effective_date_id', table_name='transactions')
+    op.drop_index(op.f('ix_transaction_splits_subcategory_id'), table_name='transaction_splits')
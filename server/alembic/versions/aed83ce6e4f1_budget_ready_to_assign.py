@@ -0,0 +1,30 @@
+"""budget ready to assign
+
+Revision ID: aed83ce6e4f1
+Revises: 4971ddcb0b6a
+Create Date: 2026-10-19 09:00:31.694880
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'aed83ce6e4f1'
+down_revision: Union[str, None] = '4971ddcb0b6a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('budgets', sa.Column('income', sa.Float(), nullable=False, server_default='0'))
+    op.add_column('budgets', sa.Column('ready_to_assign', sa.Float(), nullable=False, server_default='0'))
+    # Filled in by the ledger pass on next startup
+    op.execute("UPDATE budgets SET ledger_dirty = 1")
+
+
+def downgrade() -> None:
+    op.drop_column('budgets', 'ready_to_assign')
+    op.drop_column('budgets', 'income')
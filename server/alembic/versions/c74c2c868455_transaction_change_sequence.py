@@ -0,0 +1,38 @@
+"""transaction change sequence
+
+Revision ID: c74c2c868455
+Revises: aed83ce6e4f1
+Create Date: 2026-10-19 09:13:08.870924
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.change_sequence import create_change_sequence, CHANGE_SEQUENCE_TRIGGERS
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c74c2c868455'
+down_revision: Union[str, None] = 'aed83ce6e4f1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('transactions', sa.Column('change_seq', sa.Integer(), server_default='0', nullable=False))
+    # Existing rows get distinct numbers; the transaction store reloads in full after the upgrade anyway
+    op.execute("UPDATE transactions SET change_seq = id")
+    op.create_index(op.f('ix_transactions_change_seq'), 'transactions', ['change_seq'], unique=False)
+    create_change_sequence(op.get_bind())
+    # change_seq replaces updated_at as the store's watermark; nothing reads by updated_at
+    op.drop_index(op.f('ix_transactions_updated_at'), table_name='transactions')
+
+
+def downgrade() -> None:
+    op.create_index(op.f('ix_transactions_updated_at'), 'transactions', ['updated_at'], unique=False)
+    for trigger in CHANGE_SEQUENCE_TRIGGERS:
+        op.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+    op.drop_index(op.f('ix_transactions_change_seq'), table_name='transactions')
+    op.drop_column('transactions', 'change_seq')
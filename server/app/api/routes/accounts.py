@@ -1,14 +1,18 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from datetime import datetime
+from datetime import date, datetime, timedelta
 
 from app.core.database import get_db
 from app.models.account import Account
-from app.schemas.account import AccountResponse, ChangeTypeRequest
+from app.schemas.account import AccountResponse, ChangeTypeRequest, NetWorthResponse
 from app.schemas.api_result import ApiResult
+from app.services.account_service import AccountService
 
 router = APIRouter()
+account_service = AccountService()
+
+NET_WORTH_INTERVALS = ("day", "week", "month")
 
 
 @router.get("", response_model=List[AccountResponse])
@@ -20,18 +24,33 @@ async def get_accounts(db: Session = Depends(get_db)):
 
 @router.get("/total_balance")
 async def get_total_balance(db: Session = Depends(get_db)):
-    """Get total balance across all accounts (credit balances are subtracted)"""
+    """Get total balance across all accounts (credit and loan balances are subtracted)"""
     accounts = db.query(Account).all()
-    total = 0.0
-    for account in accounts:
-        # Credit accounts have positive balances when you owe money
-        # So we need to negate them to subtract debt from net worth
-        if account.account_type == 'credit':
-            total -= account.current_balance
-        else:
-            total += account.current_balance
+    # Credit and loan accounts have positive balances when you owe money
+    total = sum(account.signed_balance for account in accounts)
     return {"total_balance": total}
 
+
+@router.get("/net_worth", response_model=NetWorthResponse)
+async def get_net_worth(
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    interval: str = "day",
+    db: Session = Depends(get_db)
+):
+    """
+    Get net worth over time from the balance snapshots recorded on each sync.
+    Defaults to the last year; interval may be day, week or month.
+    """
+    if interval not in NET_WORTH_INTERVALS:
+        raise HTTPException(status_code=400, detail=f"interval must be one of {', '.join(NET_WORTH_INTERVALS)}")
+    end_date = end_date or date.today()
+    start_date = start_date or end_date - timedelta(days=365)
+    if start_date > end_date:
+        raise HTTPException(status_code=400, detail="start_date must not be after end_date")
+
+    return account_service.get_net_worth_series(db, start_date, end_date, interval)
+
 @router.post("/{id}/updateType")
 async def update_type(id: str, typeRequest: ChangeTypeRequest, db: Session=Depends(get_db)):
     try:
@@ -1,74 +1,173 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
+from app.core.cache import cached_response
 from app.core.database import get_db
-from app.services.budget_service import BudgetService
+from app.services.budget_service import BudgetService, MAX_BUDGET_RANGE_MONTHS
+from app.services.budget_simulation_service import BudgetSimulationService
 from app.schemas.budget import (
     BudgetResponse, BudgetSimpleResponse, BudgetCreate, BudgetUpdate,
-    SubcategoryBudgetResponse
+    SubcategoryBudgetResponse, BudgetAssignmentBatch, BudgetScenario, BudgetSimulationResponse,
+    FundingPlanResponse
 )
 
 router = APIRouter()
 budget_service = BudgetService()
+simulation_service = BudgetSimulationService()
 
 
 @router.get("/current", response_model=BudgetResponse)
-async def get_current_budget(db: Session = Depends(get_db)):
+async def get_current_budget(request: Request, db: Session = Depends(get_db)):
     """Get the current active budget with subcategory allocations and spending."""
-    budget = budget_service.get_current_budget(db, eager_load=True)
-    
-    if not budget:
-        raise HTTPException(status_code=404, detail="No budget found")
-    
-    # Build response with current spending
-    spending_by_subcategory = budget_service.get_spending_by_subcategory(db, budget.id)
-    subcategory_budgets = budget_service.build_subcategory_budget_responses(budget, spending_by_subcategory)
-    
-    return BudgetResponse(
-        id=budget.id,
-        name=budget.name,
-        month=budget.month,
-        year=budget.year,
-        start_date=budget.start_date,
-        created_at=budget.created_at,
-        updated_at=budget.updated_at,
-        subcategory_budgets=subcategory_budgets
-    )
+    def compute():
+        budget = budget_service.get_current_budget(db, eager_load=True)
+
+        if not budget:
+            raise HTTPException(status_code=404, detail="No budget found")
+
+        # Build response with current spending
+        spending_by_subcategory = budget_service.get_spending_by_subcategory(db, budget.id)
+        subcategory_budgets = budget_service.build_subcategory_budget_responses(budget, spending_by_subcategory)
+
+        return BudgetResponse(
+            id=budget.id,
+            name=budget.name,
+            month=budget.month,
+            year=budget.year,
+            start_date=budget.start_date,
+            income=budget.income,
+            ready_to_assign=budget.ready_to_assign,
+            created_at=budget.created_at,
+            updated_at=budget.updated_at,
+            subcategory_budgets=subcategory_budgets
+        )
+
+    return cached_response(request, compute)
 
 
 @router.get("/", response_model=List[BudgetSimpleResponse])
-async def get_all_budgets(db: Session = Depends(get_db)):
+async def get_all_budgets(request: Request, db: Session = Depends(get_db)):
     """Get all budgets without category details."""
-    return budget_service.get_all_budgets(db)
+    return cached_response(
+        request,
+        lambda: [BudgetSimpleResponse.model_validate(b) for b in budget_service.get_all_budgets(db)]
+    )
+
+
+@router.get("/range", response_model=List[BudgetResponse])
+async def get_budget_range(
+    year: int,
+    month: int,
+    request: Request,
+    months: int = 12,
+    db: Session = Depends(get_db)
+):
+    """
+    Get `months` consecutive monthly budgets starting at year/month, with activity and
+    availability, for month navigation and year overviews. Missing months are created.
+    """
+    if month < 1 or month > 12:
+        raise HTTPException(status_code=400, detail="Month must be between 1 and 12")
+    if months < 1 or months > MAX_BUDGET_RANGE_MONTHS:
+        raise HTTPException(status_code=400, detail=f"months must be between 1 and {MAX_BUDGET_RANGE_MONTHS}")
+
+    def compute():
+        budgets = budget_service.get_budget_range(db, year, month, months)
+        spending_by_budget = budget_service.get_spending_by_budget(db, budgets)
+
+        return [
+            BudgetResponse(
+                id=budget.id,
+                name=budget.name,
+                month=budget.month,
+                year=budget.year,
+                start_date=budget.start_date,
+                income=budget.income,
+                ready_to_assign=budget.ready_to_assign,
+                created_at=budget.created_at,
+                updated_at=budget.updated_at,
+                subcategory_budgets=budget_service.build_subcategory_budget_responses(
+                    budget, spending_by_budget[budget.id]
+                ),
+            )
+            for budget in budgets
+        ]
+
+    return cached_response(request, compute)
+
+
+@router.get("/{budget_id}/funding-plan", response_model=FundingPlanResponse)
+async def get_funding_plan(
+    budget_id: int,
+    request: Request,
+    funds: Optional[float] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    How much each subcategory still needs this month (overspending, unmet target,
+    spending pace) and how `funds` (default: the budget's ready-to-assign) would be
+    allocated across those needs in priority order.
+    """
+    def compute():
+        budget = budget_service.get_budget_by_id(db, budget_id, eager_load=True)
+        if not budget:
+            raise HTTPException(status_code=404, detail="Budget not found")
+
+        spending_by_subcategory = budget_service.get_spending_by_subcategory(db, budget_id)
+        plans = budget_service.funding_planner.plan(budget, spending_by_subcategory, funds=funds)
+        return FundingPlanResponse(
+            budget_id=budget.id,
+            funds=funds if funds is not None else budget.ready_to_assign,
+            allocated=sum(plan.allocation for plan in plans),
+            subcategories=plans,
+        )
+
+    return cached_response(request, compute)
 
 
 @router.get("/{year}/{month}", response_model=BudgetResponse)
-async def get_budget_by_month(year: int, month: int, db: Session = Depends(get_db)):
+async def get_budget_by_month(year: int, month: int, request: Request, db: Session = Depends(get_db)):
     """Get or create a budget for a specific month and year."""
     # Validate month
     if month < 1 or month > 12:
         raise HTTPException(status_code=400, detail="Month must be between 1 and 12")
-    
-    budget = budget_service.get_budget_by_month(db, year, month, eager_load=True, auto_create=True)
-    
-    if not budget:
-        raise HTTPException(status_code=404, detail=f"Budget not found for {year}/{month}")
-    
-    # Build response with current spending
-    spending_by_subcategory = budget_service.get_spending_by_subcategory(db, budget.id)
-    subcategory_budgets = budget_service.build_subcategory_budget_responses(budget, spending_by_subcategory)
-    
-    return BudgetResponse(
-        id=budget.id,
-        name=budget.name,
-        month=budget.month,
-        year=budget.year,
-        start_date=budget.start_date,
-        created_at=budget.created_at,
-        updated_at=budget.updated_at,
-        subcategory_budgets=subcategory_budgets,
-    )
+
+    def compute():
+        budget = budget_service.get_budget_by_month(db, year, month, eager_load=True, auto_create=True)
+
+        if not budget:
+            raise HTTPException(status_code=404, detail=f"Budget not found for {year}/{month}")
+
+        # Build response with current spending
+        spending_by_subcategory = budget_service.get_spending_by_subcategory(db, budget.id)
+        subcategory_budgets = budget_service.build_subcategory_budget_responses(budget, spending_by_subcategory)
+
+        return BudgetResponse(
+            id=budget.id,
+            name=budget.name,
+            month=budget.month,
+            year=budget.year,
+            start_date=budget.start_date,
+            income=budget.income,
+            ready_to_assign=budget.ready_to_assign,
+            created_at=budget.created_at,
+            updated_at=budget.updated_at,
+            subcategory_budgets=subcategory_budgets,
+        )
+
+    return cached_response(request, compute)
+
+@router.post("/simulate", response_model=BudgetSimulationResponse)
+async def simulate_budget(scenario: BudgetScenario, db: Session = Depends(get_db)):
+    """
+    What-if projection of the next months' subcategory balances, overspending and
+    ready-to-assign under hypothetical assignment changes, recurring bills and an
+    income change. Starts from the current budgets and recent spending averages and
+    never writes to the database.
+    """
+    return simulation_service.simulate(db, scenario)
+
 
 @router.post("/", response_model=BudgetResponse, status_code=201)
 async def create_budget(
@@ -88,6 +187,8 @@ async def create_budget(
         month=db_budget.month,
         year=db_budget.year,
         start_date=db_budget.start_date,
+        income=db_budget.income,
+        ready_to_assign=db_budget.ready_to_assign,
         created_at=db_budget.created_at,
         updated_at=db_budget.updated_at,
         subcategory_budgets=subcategory_budgets
@@ -114,6 +215,8 @@ async def update_budget(
         month=updated_budget.month,
         year=updated_budget.year,
         start_date=updated_budget.start_date,
+        income=updated_budget.income,
+        ready_to_assign=updated_budget.ready_to_assign,
         created_at=updated_budget.created_at,
         updated_at=updated_budget.updated_at,
         subcategory_budgets=subcategory_budgets
@@ -130,14 +233,49 @@ async def delete_budget(budget_id: int, db: Session = Depends(get_db)):
 
 
 @router.get("/{budget_id}/subcategories", response_model=List[SubcategoryBudgetResponse])
-async def get_budget_subcategories(budget_id: int, db: Session = Depends(get_db)):
+async def get_budget_subcategories(budget_id: int, request: Request, db: Session = Depends(get_db)):
     """Get all subcategory allocations for a specific budget with current spending."""
-    budget = budget_service.get_budget_by_id(db, budget_id, eager_load=True)
+    def compute():
+        budget = budget_service.get_budget_by_id(db, budget_id, eager_load=True)
+        if not budget:
+            raise HTTPException(status_code=404, detail="Budget not found")
+
+        spending_by_subcategory = budget_service.get_spending_by_subcategory(db, budget_id)
+        return budget_service.build_subcategory_budget_responses(budget, spending_by_subcategory)
+
+    return cached_response(request, compute)
+
+
+@router.post("/{budget_id}/subcategories/batch", response_model=BudgetResponse)
+async def apply_assignment_batch(
+    budget_id: int,
+    batch: BudgetAssignmentBatch,
+    db: Session = Depends(get_db)
+):
+    """
+    Apply many assignment and target changes to a budget in one transaction: copy a
+    month's assignments, assign every target, and/or explicit per-subcategory changes.
+    Returns the updated budget.
+    """
+    budget = budget_service.apply_assignment_batch(db, budget_id, batch)
     if not budget:
         raise HTTPException(status_code=404, detail="Budget not found")
-    
-    spending_by_subcategory = budget_service.get_spending_by_subcategory(db, budget_id)
-    return budget_service.build_subcategory_budget_responses(budget, spending_by_subcategory)
+
+    spending_by_subcategory = budget_service.get_spending_by_subcategory(db, budget.id)
+    subcategory_budgets = budget_service.build_subcategory_budget_responses(budget, spending_by_subcategory)
+
+    return BudgetResponse(
+        id=budget.id,
+        name=budget.name,
+        month=budget.month,
+        year=budget.year,
+        start_date=budget.start_date,
+        income=budget.income,
+        ready_to_assign=budget.ready_to_assign,
+        created_at=budget.created_at,
+        updated_at=budget.updated_at,
+        subcategory_budgets=subcategory_budgets
+    )
 
 
 @router.put("/{budget_id}/subcategories/{subcategory_budget_id}")
@@ -4,12 +4,14 @@ from typing import List, Dict
 import logging
 
 from app.core.database import get_db
-from app.services.ml_service import MLService
+from app.services.budget_ledger_service import BudgetLedgerService
+from app.services.ml_service import get_ml_service
 from app.models.transaction import Transaction
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
-ml_service = MLService()
+ml_service = get_ml_service()
+budget_ledger_service = BudgetLedgerService()
 
 @router.post("/train")
 async def train_models(db: Session = Depends(get_db)):
@@ -113,6 +115,7 @@ async def auto_categorize_all(db: Session = Depends(get_db)):
         # Apply predictions
         applied_count = 0
         auto_assigned_count = 0
+        earliest_assigned = None
         for pred in predictions:
             txn = db.query(Transaction).get(pred['transaction_id'])
             if txn and pred.get('subcategory_id'):
@@ -125,7 +128,12 @@ async def auto_categorize_all(db: Session = Depends(get_db)):
                 if confidence >= 0.8:
                     txn.subcategory_id = pred['subcategory_id']
                     auto_assigned_count += 1
+                    if earliest_assigned is None or txn.posted < earliest_assigned:
+                        earliest_assigned = txn.posted
         
+        # Auto-assigned transactions now count as spending in their budget months
+        budget_ledger_service.mark_dirty(db, earliest_assigned)
+        budget_ledger_service.recompute(db)
         db.commit()
         
         return {
@@ -6,8 +6,10 @@ import base64
 from app.core.config import settings
 from app.core.database import get_db
 from app.services.simplefin_service import SimplefinService
+from app.services.budget_ledger_service import BudgetLedgerService
 from app.services.account_service import AccountService
 from app.services.transaction_service import TransactionService
+from app.services.recurring_service import RecurringService
 from app.models import Organization
 
 from app.models.simplefin_item import SimplefinItem
@@ -20,7 +22,7 @@ logger = logging.getLogger(__name__)
 # Initialize services
 transaction_service = TransactionService()
 account_service = AccountService()
-simplefin_service = SimplefinService(account_service, transaction_service)
+simplefin_service = SimplefinService(account_service, transaction_service, RecurringService(), BudgetLedgerService())
 
 @router.get("/institutions")
 async def get_institutions(db: Session = Depends(get_db)):
@@ -70,9 +72,12 @@ async def connect(access_code: str, db: Session = Depends(get_db)):
 async def sync(db: Session = Depends(get_db)):
     try:
         success, msg = simplefin_service.get_accounts(db)
-        db.commit()
         if not success:
+            # Don't keep a half-applied sync
+            db.rollback()
             return ApiResult.error(f"Failed to fetch/store accounts: {msg}").__dict__
+        db.commit()
         return ApiResult.success("Accounts synced successfully.").__dict__
     except Exception as ex:
+        db.rollback()
         return ApiResult.error(f"Failed to get/store accounts and transactions: {ex}").__dict__
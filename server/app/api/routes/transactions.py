@@ -1,10 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
-from sqlalchemy.orm import Session, joinedload
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, File, Query, Response, UploadFile
+from sqlalchemy import and_, exists, or_, select
+from sqlalchemy.orm import Session, selectinload
 from typing import List, Optional
 from datetime import datetime
+import io
 import logging
 
 from app.core.database import get_db
+from app.models.account import Account
 from app.models.transaction import Transaction
 from app.models.transaction_split import TransactionSplit
 from app.models.category import Category, Subcategory
@@ -12,48 +15,264 @@ from app.schemas.transaction import (
     TransactionResponse,
     CategorizeTransactionRequest,
     CreateSplitsRequest,
+    CsvColumnMapping,
+    ImportResult,
 )
-from app.services.ml_service import MLService
+from app.services.budget_ledger_service import BudgetLedgerService
+from app.services.export_service import ExportService, EXPORT_FORMATS, EXPORT_MEDIA_TYPES
+from app.services.import_service import ImportService, IMPORT_FORMATS
+from app.services.ml_service import get_ml_service
+from app.services.recurring_service import RecurringService
+from app.services.search_service import SearchService, MAX_SEARCH_LIMIT
+from app.utils.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor
+from app.utils.streaming import iter_ndjson, ndjson_response, stream_response
+from app.utils.transaction_lines import effective_date_column, load_splits
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
-ml_service = MLService()
+ml_service = get_ml_service()
+budget_ledger_service = BudgetLedgerService()
+import_service = ImportService(recurring_service=RecurringService(), budget_ledger_service=budget_ledger_service)
+export_service = ExportService()
+search_service = SearchService()
 
-@router.get("/", response_model=List[TransactionResponse])
-async def get_transactions(
-    skip: int = 0, 
-    limit: int = 100,
+def _transaction_filters(
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
-    db: Session = Depends(get_db)
-):
-    """
-    Get all transactions from the database.
-    
-    Supports filtering by date range using start_date and end_date parameters (ISO format: YYYY-MM-DD).
-    """
-    # Eager-load splits so Pydantic can serialize them
-    query = db.query(Transaction).options(joinedload(Transaction.splits))
-    
-    # Apply date filters if provided
+    account_ids: Optional[List[str]] = None,
+    subcategory_id: Optional[int] = None,
+    category_id: Optional[int] = None,
+    uncategorized: bool = False,
+    min_amount: Optional[float] = None,
+    max_amount: Optional[float] = None,
+    pending: Optional[bool] = None,
+    is_transfer: Optional[bool] = None,
+) -> list:
+    """SQL filters for transaction listings. Subcategory/category filters also match splits."""
+    filters = []
     if start_date:
         try:
-            start_dt = datetime.fromisoformat(start_date)
-            query = query.filter(Transaction.posted >= start_dt)
+            filters.append(Transaction.posted >= datetime.fromisoformat(start_date))
         except ValueError:
             raise HTTPException(status_code=400, detail="Invalid start_date format. Use YYYY-MM-DD")
-    
     if end_date:
         try:
-            end_dt = datetime.fromisoformat(end_date)
-            query = query.filter(Transaction.posted <= end_dt)
+            filters.append(Transaction.posted <= datetime.fromisoformat(end_date))
         except ValueError:
             raise HTTPException(status_code=400, detail="Invalid end_date format. Use YYYY-MM-DD")
-    
-    transactions = query.offset(skip).limit(limit).all()
+
+    if account_ids:
+        filters.append(Transaction.account_id.in_(account_ids))
+
+    subcategory_ids = None
+    if subcategory_id is not None:
+        subcategory_ids = [subcategory_id]
+    elif category_id is not None:
+        subcategory_ids = select(Subcategory.id).where(Subcategory.category_id == category_id)
+    if subcategory_ids is not None:
+        filters.append(or_(
+            Transaction.subcategory_id.in_(subcategory_ids),
+            Transaction.id.in_(
+                select(TransactionSplit.transaction_id).where(TransactionSplit.subcategory_id.in_(subcategory_ids))
+            )
+        ))
+    if uncategorized:
+        filters.append(Transaction.subcategory_id.is_(None))
+        filters.append(~exists().where(TransactionSplit.transaction_id == Transaction.id))
+
+    if min_amount is not None:
+        filters.append(Transaction.amount >= min_amount)
+    if max_amount is not None:
+        filters.append(Transaction.amount <= max_amount)
+    if pending is not None:
+        filters.append(Transaction.pending == pending)
+    if is_transfer is not None:
+        filters.append(Transaction.is_transfer == is_transfer)
+    return filters
+
+
+@router.get("/", response_model=List[TransactionResponse])
+async def get_transactions(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    account_id: Optional[List[str]] = Query(None),
+    subcategory_id: Optional[int] = None,
+    category_id: Optional[int] = None,
+    uncategorized: bool = False,
+    min_amount: Optional[float] = None,
+    max_amount: Optional[float] = None,
+    pending: Optional[bool] = None,
+    is_transfer: Optional[bool] = None,
+    format: str = "json",
+    db: Session = Depends(get_db)
+):
+    """
+    Get transactions, newest effective date first.
+
+    Supports filtering by date range using start_date and end_date parameters (ISO format: YYYY-MM-DD),
+    account (repeat account_id), subcategory or category (split-aware), uncategorized only,
+    signed amount range, pending and transfer status.
+
+    Pages are keyset-paginated on (effective date, id): pass the X-Next-Cursor header of
+    a page as cursor to get the next one, at the same cost as the first. The header is
+    absent on the last page. skip still works for the first pages but deep offsets get slower.
+    format=ndjson streams one transaction per line in id order; limit=0 then streams every match.
+    """
+    if format not in ("json", "ndjson"):
+        raise HTTPException(status_code=400, detail="format must be one of json, ndjson")
+
+    filters = _transaction_filters(
+        start_date=start_date,
+        end_date=end_date,
+        account_ids=account_id,
+        subcategory_id=subcategory_id,
+        category_id=category_id,
+        uncategorized=uncategorized,
+        min_amount=min_amount,
+        max_amount=max_amount,
+        pending=pending,
+        is_transfer=is_transfer,
+    )
+
+    if format == "ndjson":
+        def stream(stream_db: Session):
+            query = stream_db.query(Transaction).filter(*filters).order_by(Transaction.id).offset(skip)
+            if limit:
+                query = query.limit(limit)
+            return iter_ndjson(query, TransactionResponse, prepare_batch=lambda batch: load_splits(stream_db, batch))
+
+        return ndjson_response(stream)
+
+    if limit < 1:
+        raise HTTPException(status_code=400, detail="limit must be at least 1")
+
+    effective_date = effective_date_column()
+    if cursor:
+        try:
+            after_date, after_id = decode_cursor(cursor)
+        except ValueError as ex:
+            raise HTTPException(status_code=400, detail=str(ex))
+        filters.append(or_(
+            effective_date < after_date,
+            and_(effective_date == after_date, Transaction.id < after_id)
+        ))
+
+    # Eager-load splits so Pydantic can serialize them
+    query = db.query(Transaction).options(selectinload(Transaction.splits)).filter(*filters).order_by(
+        effective_date.desc(), Transaction.id.desc()
+    )
+    if not cursor:
+        query = query.offset(skip)
+    transactions = query.limit(limit).all()
+
+    if len(transactions) == limit:
+        last = transactions[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(last.transacted_at or last.posted, last.id)
     return transactions
 
 
+@router.get("/search", response_model=List[TransactionResponse])
+async def search_transactions(
+    q: str,
+    min_amount: Optional[float] = None,
+    max_amount: Optional[float] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    account_id: Optional[List[str]] = Query(None),
+    skip: int = 0,
+    limit: int = 50,
+    db: Session = Depends(get_db)
+):
+    """
+    Full-text search over transaction name, memo and merchant names, ranked by relevance.
+
+    Words match as prefixes ("amaz"); wrap text in double quotes for an exact phrase.
+    Combine with signed amount bounds, a posted date range and accounts (repeat account_id).
+    """
+    if limit < 1 or limit > MAX_SEARCH_LIMIT:
+        raise HTTPException(status_code=400, detail=f"limit must be between 1 and {MAX_SEARCH_LIMIT}")
+
+    return search_service.search(
+        db,
+        q,
+        min_amount=min_amount,
+        max_amount=max_amount,
+        start_date=start_date,
+        end_date=end_date,
+        account_ids=account_id,
+        skip=skip,
+        limit=limit
+    )
+
+
+@router.get("/export")
+async def export_transactions(
+    format: str = "csv",
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    account_id: Optional[List[str]] = Query(None),
+    include_transfers: bool = True,
+):
+    """
+    Stream every matching transaction as a CSV or Parquet file, one row per split line,
+    with account, category and subcategory names joined in. Rows are read and written in
+    batches, so memory use does not depend on the number of transactions.
+    Filter by posted date range and account (repeat account_id).
+    """
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of {', '.join(EXPORT_FORMATS)}")
+
+    filename = f"transactions.{format}"
+    return stream_response(
+        lambda stream_db: export_service.iter_export(
+            stream_db,
+            format,
+            start_date=start_date,
+            end_date=end_date,
+            account_ids=account_id,
+            include_transfers=include_transfers
+        ),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
+@router.post("/import", response_model=ImportResult)
+def import_transactions(
+    account_id: str,
+    file: UploadFile = File(...),
+    format: str = "csv",
+    mapping: CsvColumnMapping = Depends(),
+    db: Session = Depends(get_db)
+):
+    """
+    Bulk import historical transactions from a CSV or OFX/QFX bank export into an account.
+
+    The file is parsed and inserted in chunks. Rows already present, by bank id or by a
+    content hash, or matching a synced transaction on date and amount, are skipped, so
+    re-importing the same file is a no-op. CSV columns are detected from the header
+    unless given explicitly (see CsvColumnMapping). A plain def, so FastAPI runs the
+    parse and bulk insert in its threadpool instead of blocking the event loop.
+    """
+    if format not in IMPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of {', '.join(IMPORT_FORMATS)}")
+    if not db.query(Account).filter(Account.id == account_id).first():
+        raise HTTPException(status_code=404, detail="Account not found")
+
+    stream = io.TextIOWrapper(file.file, encoding="utf-8-sig", errors="replace", newline="")
+    try:
+        result = import_service.import_file(db, account_id, stream, file_format=format, mapping=mapping)
+    except ValueError as ex:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=str(ex))
+    db.commit()
+    return result
+
+
 @router.post("/{transaction_id}/splits")
 async def create_transaction_splits(
     transaction_id: str,
@@ -81,6 +300,9 @@ async def create_transaction_splits(
             db.query(TransactionSplit).filter(TransactionSplit.transaction_id == tid).delete(synchronize_session=False)
             transaction.is_split = False
             # keep transaction.subcategory_id as-is (frontend may set it later)
+            transaction.updated_at = datetime.utcnow()
+            budget_ledger_service.mark_dirty(db, transaction.posted)
+            budget_ledger_service.recompute(db)
             db.commit()
             return {"message": "All splits removed", "splits": []}
         else:
@@ -117,7 +339,12 @@ async def create_transaction_splits(
     # Mark transaction as split and clear its direct subcategory to avoid ambiguity
     transaction.is_split = True
     transaction.subcategory_id = None
+    # Splits live in their own table; touch the transaction so its change_seq moves and
+    # incremental readers (the transaction store) pick up the new lines
+    transaction.updated_at = datetime.utcnow()
 
+    budget_ledger_service.mark_dirty(db, transaction.posted)
+    budget_ledger_service.recompute(db)
     db.commit()
 
     # Refresh created splits to access fields like id/created_at
@@ -177,6 +404,9 @@ async def manually_categorize_transaction(
     
     # Update transaction
     transaction.subcategory_id = categorize_request.subcategory_id
+    if category_changed:
+        budget_ledger_service.mark_dirty(db, transaction.posted)
+        budget_ledger_service.recompute(db)
     db.commit()
     
     # Trigger retraining in background if enough labeled data exists
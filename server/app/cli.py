@@ -0,0 +1,172 @@
+"""
+Command line tools for bulk data operations.
+
+Run from the server directory:
+    python -m app.cli import --account <account_id> history.csv
+    python -m app.cli import --account <account_id> --format ofx statement.qfx
+    python -m app.cli export --format parquet --start 2024-01-01 transactions.parquet
+    python -m app.cli benchmark-analytics --runs 20
+"""
+import argparse
+import logging
+import sys
+import statistics
+import time
+from datetime import datetime
+
+from app.core.database import SessionLocal
+from app.models.account import Account
+from app.schemas.transaction import CsvColumnMapping
+from app.services.analytics_service import AnalyticsService
+from app.services.budget_ledger_service import BudgetLedgerService
+from app.services.export_service import ExportService, EXPORT_FORMATS
+from app.services.import_service import ImportService, IMPORT_FORMATS, IMPORT_CHUNK_SIZE
+from app.services.recurring_service import RecurringService
+from app.services.transaction_store import get_transaction_store
+
+logger = logging.getLogger(__name__)
+
+
+def _import(args: argparse.Namespace) -> int:
+    mapping = CsvColumnMapping(
+        date=args.date_column,
+        amount=args.amount_column,
+        debit=args.debit_column,
+        credit=args.credit_column,
+        description=args.description_column,
+        id=args.id_column,
+        memo=args.memo_column,
+        date_format=args.date_format,
+        negate=args.negate,
+    )
+    file_format = args.format or ("ofx" if args.file.lower().endswith((".ofx", ".qfx")) else "csv")
+    service = ImportService(recurring_service=RecurringService(), budget_ledger_service=BudgetLedgerService())
+
+    db = SessionLocal()
+    try:
+        if not db.query(Account).filter(Account.id == args.account).first():
+            print(f"Account {args.account} not found", file=sys.stderr)
+            return 1
+        started = time.perf_counter()
+        with open(args.file, encoding="utf-8-sig", errors="replace", newline="") as stream:
+            result = service.import_file(
+                db, args.account, stream, file_format=file_format, mapping=mapping, chunk_size=args.chunk_size
+            )
+        db.commit()
+    except ValueError as ex:
+        db.rollback()
+        print(f"Import failed: {ex}", file=sys.stderr)
+        return 1
+    finally:
+        db.close()
+
+    print(
+        f"Read {result.rows_read} rows: {result.inserted} inserted, {result.duplicates} duplicates "
+        f"({time.perf_counter() - started:.1f}s)"
+    )
+    return 0
+
+
+def _export(args: argparse.Namespace) -> int:
+    file_format = args.format or ("parquet" if args.file.lower().endswith(".parquet") else "csv")
+    service = ExportService()
+
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        with open(args.file, "wb") as out:
+            written = service.write_export(
+                db,
+                out,
+                file_format,
+                start_date=args.start,
+                end_date=args.end,
+                account_ids=args.account,
+                include_transfers=not args.exclude_transfers
+            )
+    finally:
+        db.close()
+
+    print(f"Wrote {written / 1024:.0f} KiB to {args.file} ({time.perf_counter() - started:.1f}s)")
+    return 0
+
+
+def _comparable_totals(totals) -> tuple:
+    transaction_count, account_ids, date_range_days, subcategory_rows = totals
+    rows = sorted(
+        (sub_id or 0, round(float(spending or 0.0), 2), round(float(income or 0.0), 2), round(float(net or 0.0), 2))
+        for sub_id, spending, income, net in subcategory_rows
+    )
+    return transaction_count, set(account_ids), date_range_days, rows
+
+
+def _benchmark_analytics(args: argparse.Namespace) -> int:
+    """Time the analytics summary inputs from grouped SQL against the columnar store on the configured database."""
+    service = AnalyticsService()
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        get_transaction_store().refresh(db)
+        print(f"Store load: {(time.perf_counter() - started) * 1000:.1f} ms")
+
+        results = {}
+        for name, totals in (("sql", service._sql_totals), ("store", service._store_totals)):
+            samples = []
+            for _ in range(args.runs):
+                started = time.perf_counter()
+                results[name] = totals(db, args.start, args.end)
+                samples.append((time.perf_counter() - started) * 1000)
+            print(f"{name:>5}: median {statistics.median(samples):.2f} ms, min {min(samples):.2f} ms over {args.runs} runs")
+    finally:
+        db.close()
+
+    if _comparable_totals(results["sql"]) != _comparable_totals(results["store"]):
+        print("Results differ between SQL and the store", file=sys.stderr)
+        return 1
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="Budget App data tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = commands.add_parser("import", help="Bulk import a CSV or OFX/QFX bank export")
+    import_parser.add_argument("file")
+    import_parser.add_argument("--account", required=True, help="Account id to import into")
+    import_parser.add_argument("--format", choices=IMPORT_FORMATS, help="Defaults to the file extension")
+    import_parser.add_argument("--chunk-size", type=int, default=IMPORT_CHUNK_SIZE)
+    import_parser.add_argument("--date-column")
+    import_parser.add_argument("--amount-column")
+    import_parser.add_argument("--debit-column")
+    import_parser.add_argument("--credit-column")
+    import_parser.add_argument("--description-column")
+    import_parser.add_argument("--id-column")
+    import_parser.add_argument("--memo-column")
+    import_parser.add_argument("--date-format", help='strptime format, e.g. "%%m/%%d/%%Y"')
+    import_parser.add_argument("--negate", action="store_true", help="Spending is listed as positive amounts")
+    import_parser.set_defaults(handler=_import)
+
+    export_parser = commands.add_parser("export", help="Export transactions as CSV or Parquet")
+    export_parser.add_argument("file")
+    export_parser.add_argument("--format", choices=EXPORT_FORMATS, help="Defaults to the file extension")
+    export_parser.add_argument("--start", type=datetime.fromisoformat, help="First posted date (YYYY-MM-DD)")
+    export_parser.add_argument("--end", type=datetime.fromisoformat, help="Last posted date (YYYY-MM-DD)")
+    export_parser.add_argument("--account", action="append", help="Account id; repeat for several")
+    export_parser.add_argument("--exclude-transfers", action="store_true")
+    export_parser.set_defaults(handler=_export)
+
+    benchmark_parser = commands.add_parser(
+        "benchmark-analytics", help="Compare the analytics summary from SQL and from the columnar store"
+    )
+    benchmark_parser.add_argument("--runs", type=int, default=20)
+    benchmark_parser.add_argument("--start", type=datetime.fromisoformat, help="First posted date (YYYY-MM-DD)")
+    benchmark_parser.add_argument("--end", type=datetime.fromisoformat, help="Last posted date (YYYY-MM-DD)")
+    benchmark_parser.set_defaults(handler=_benchmark_analytics)
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
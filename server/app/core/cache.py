@@ -0,0 +1,150 @@
+"""
+Data-versioned response cache.
+
+A process-wide data version is bumped whenever a session commits a change to
+any mapped row, or runs a bulk INSERT/UPDATE/DELETE. Cached GET responses are
+keyed by (endpoint, query params, version), so they stay valid exactly until
+the next write. Each response carries an ETag, and a matching If-None-Match
+gets a 304 without recomputing or re-sending the body.
+"""
+import hashlib
+import threading
+import uuid
+from collections import OrderedDict
+from datetime import date
+from typing import Any, Callable, Optional, Tuple
+
+import orjson
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+
+class DataVersion:
+    """Monotonic counter of committed data changes for this process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._value = 0
+        # Distinguishes versions of this process from ETags issued before a restart
+        self.boot_id = uuid.uuid4().hex[:8]
+
+    @property
+    def current(self) -> int:
+        return self._value
+
+    def bump(self) -> int:
+        with self._lock:
+            self._value += 1
+            return self._value
+
+
+data_version = DataVersion()
+
+
+@event.listens_for(Session, "before_flush")
+def _track_flush_changes(session, flush_context, instances):
+    if session.new or session.deleted or any(session.is_modified(obj) for obj in session.dirty):
+        session.info["data_changed"] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_bulk_changes(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["data_changed"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_version_on_commit(session):
+    if session.info.pop("data_changed", False):
+        data_version.bump()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changes_on_rollback(session):
+    session.info.pop("data_changed", None)
+
+
+class ResponseCache:
+    """LRU cache of serialized JSON responses, valid for a single data version."""
+
+    def __init__(self, max_entries: int):
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple, Tuple[int, bytes]]" = OrderedDict()
+        self.max_entries = max_entries
+
+    def get(self, key: Tuple, version: int) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            entry_version, body = entry
+            if entry_version != version:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return body
+
+    def put(self, key: Tuple, version: int, body: bytes) -> None:
+        with self._lock:
+            self._entries[key] = (version, body)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+response_cache = ResponseCache(settings.RESPONSE_CACHE_MAX_ENTRIES)
+
+
+def _request_key(request: Request) -> Tuple:
+    # Today's date is part of the key because some responses (e.g. the current
+    # budget) depend on it without any data changing
+    return (
+        request.url.path,
+        tuple(sorted(request.query_params.multi_items())),
+        date.today().isoformat(),
+    )
+
+
+def _etag(version: int, key: Tuple) -> str:
+    digest = hashlib.sha1(repr(key).encode()).hexdigest()[:16]
+    return f'"{data_version.boot_id}-{version}-{digest}"'
+
+
+def serialize_json(content: Any) -> bytes:
+    """Serialize a route result (Pydantic models, dicts, lists) to JSON bytes."""
+    return orjson.dumps(jsonable_encoder(content), option=orjson.OPT_NON_STR_KEYS)
+
+
+def cached_response(request: Request, compute: Callable[[], Any]) -> Response:
+    """
+    Serve a GET response from the versioned cache.
+
+    Answers 304 when If-None-Match matches the current ETag, returns the cached body
+    when the data version is unchanged, and otherwise calls compute() and caches it.
+    """
+    version = data_version.current
+    key = _request_key(request)
+    etag = _etag(version, key)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+
+    body = response_cache.get(key, version)
+    if body is None:
+        body = serialize_json(compute())
+        if data_version.current == version:
+            response_cache.put(key, version, body)
+        else:
+            # compute() itself wrote (e.g. auto-created a budget); label it with the new version
+            headers["ETag"] = _etag(data_version.current, key)
+
+    return Response(content=body, media_type="application/json", headers=headers)
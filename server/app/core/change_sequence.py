@@ -0,0 +1,34 @@
+"""
+Commit-ordered change sequence for transactions.
+
+Every insert or update of a transaction stamps its change_seq with one more than
+the highest in the table. Triggers do the stamping, so every write path (ORM, bulk
+executemany, raw SQL) is covered. SQLite admits one writer at a time, so numbers
+become visible in the order they were handed out: a reader that has seen everything
+up to N misses nothing by asking for change_seq > N next, however long the writing
+transaction took to commit. A wall-clock updated_at, stamped by the application
+before the commit, gives no such guarantee.
+
+Created by the migration and, for databases built with create_all, by init_db.
+"""
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+_NEXT_CHANGE = """
+    UPDATE transactions SET change_seq = (SELECT coalesce(max(change_seq), 0) + 1 FROM transactions)
+    WHERE id = new.id;
+"""
+
+CHANGE_SEQUENCE_TRIGGERS = {
+    "transactions_change_seq_insert": f"AFTER INSERT ON transactions BEGIN {_NEXT_CHANGE} END",
+    # The WHEN clause skips the trigger's own update of change_seq
+    "transactions_change_seq_update": (
+        f"AFTER UPDATE ON transactions WHEN new.change_seq = old.change_seq BEGIN {_NEXT_CHANGE} END"
+    ),
+}
+
+
+def create_change_sequence(connection: Connection) -> None:
+    """Create the change_seq triggers if missing."""
+    for name, body in CHANGE_SEQUENCE_TRIGGERS.items():
+        connection.execute(text(f"CREATE TRIGGER IF NOT EXISTS {name} {body}"))
@@ -11,6 +11,16 @@ class Settings(BaseSettings):
     
     # ML Models
     MODEL_PATH: str = Field(default="./ml_models/saved_models/")
+    ML_WARMUP_ON_STARTUP: bool = Field(default=True)  # Load ML stack in a background thread after startup
+    
+    # Analytics
+    ANALYTICS_COLUMNAR_STORE: bool = Field(default=True)  # Serve analytics aggregates from the in-memory store
+    
+    # Response cache
+    RESPONSE_CACHE_MAX_ENTRIES: int = Field(default=256)  # Cached GET responses, invalidated on every data change
+    
+    # Startup
+    STARTUP_TIME_BUDGET_SECONDS: float = Field(default=2.0)  # Warn when cold start exceeds this
     
     class Config:
         env_file = ".env"
@@ -20,9 +20,16 @@ def get_db():
     finally:
         db.close()
 
-def init_db():
-    """Create all tables defined in models"""
+def init_db(bind=None):
+    """Create all tables defined in models (on the app's engine unless another is given)"""
     import app.models
+    bind = bind or engine
     print(f"Creating tables... Models found: {Base.metadata.tables.keys()}")
-    Base.metadata.create_all(bind=engine)
+    Base.metadata.create_all(bind=bind)
+    if bind.dialect.name == "sqlite":
+        from app.core.search_index import create_search_index
+        from app.core.change_sequence import create_change_sequence
+        with bind.begin() as connection:
+            create_search_index(connection)
+            create_change_sequence(connection)
     print("Tables created successfully!")
\ No newline at end of file
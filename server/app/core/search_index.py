@@ -0,0 +1,61 @@
+"""
+SQLite FTS5 index over transaction text (name, memo and merchant names).
+
+The index is a standalone FTS5 table whose rowid is the transaction id. Triggers
+keep it in step with every write path (ORM, bulk executemany, raw SQL), so sync
+and imports need no extra work. Created by the migration and, for databases
+built with create_all, by init_db.
+"""
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+SEARCH_TABLE = "transactions_fts"
+
+_MERCHANT_NAMES = """(
+    SELECT group_concat(merchants.name, ' ') FROM merchants
+    JOIN transaction_merchants ON transaction_merchants.merchant_id = merchants.id
+    WHERE transaction_merchants.transaction_id = {transaction_id}
+)"""
+
+SEARCH_INDEX_DDL = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5(
+        name, memo, merchants,
+        tokenize = 'unicode61 remove_diacritics 2',
+        prefix = '2 3'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS transactions_fts_insert AFTER INSERT ON transactions BEGIN
+        INSERT INTO {SEARCH_TABLE}(rowid, name, memo, merchants) VALUES (new.id, new.name, new.memo, '');
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS transactions_fts_update AFTER UPDATE OF name, memo ON transactions BEGIN
+        UPDATE {SEARCH_TABLE} SET name = new.name, memo = new.memo WHERE rowid = new.id;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS transactions_fts_delete AFTER DELETE ON transactions BEGIN
+        DELETE FROM {SEARCH_TABLE} WHERE rowid = old.id;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS transaction_merchants_fts_insert AFTER INSERT ON transaction_merchants BEGIN
+        UPDATE {SEARCH_TABLE} SET merchants = {_MERCHANT_NAMES.format(transaction_id="new.transaction_id")}
+        WHERE rowid = new.transaction_id;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS transaction_merchants_fts_delete AFTER DELETE ON transaction_merchants BEGIN
+        UPDATE {SEARCH_TABLE} SET merchants = coalesce({_MERCHANT_NAMES.format(transaction_id="old.transaction_id")}, '')
+        WHERE rowid = old.transaction_id;
+    END""",
+]
+
+SEARCH_INDEX_POPULATE = f"""
+INSERT INTO {SEARCH_TABLE}(rowid, name, memo, merchants)
+SELECT transactions.id, transactions.name, transactions.memo,
+       coalesce({_MERCHANT_NAMES.format(transaction_id="transactions.id")}, '')
+FROM transactions
+"""
+
+
+def create_search_index(connection: Connection) -> None:
+    """Create the FTS table and triggers if missing, indexing existing transactions on first creation."""
+    exists = connection.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": SEARCH_TABLE}
+    ).first()
+    for statement in SEARCH_INDEX_DDL:
+        connection.execute(text(statement))
+    if not exists:
+        connection.execute(text(SEARCH_INDEX_POPULATE))
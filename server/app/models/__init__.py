@@ -1,6 +1,7 @@
 # Models package
 from app.models.transaction import Transaction
 from app.models.account import Account
+from app.models.account_balance_snapshot import AccountBalanceSnapshot
 from app.models.simplefin_item import SimplefinItem
 from app.models.merchant import Merchant
 from app.models.transaction_merchant import transaction_merchants
@@ -8,4 +9,4 @@ from app.models.category import Category, Subcategory
 from app.models.budget import Budget, SubcategoryBudget
 from app.models.organization import Organization
 from app.models.transaction_split import TransactionSplit
-
+from app.models.recurring_series import RecurringSeries
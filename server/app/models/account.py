@@ -5,6 +5,9 @@ from app.core.database import Base
 from datetime import datetime
 from app.schemas.account import AccountType
 
+# Accounts whose balance is money owed
+DEBT_ACCOUNT_TYPES = (AccountType.CREDIT, AccountType.LOAN)
+
 class Account(Base):
     __tablename__ = "accounts"
     
@@ -32,6 +35,12 @@ class Account(Base):
         else:
             raise ValueError("Invalid account type")
     
+    @property
+    def signed_balance(self) -> float:
+        """Balance as it counts toward net worth: debt accounts (credit, loan) are subtracted."""
+        balance = self.current_balance or 0.0
+        return -balance if self.type in DEBT_ACCOUNT_TYPES else balance
+    
     balance_date = Column(DateTime)
 
     created_at = Column(DateTime, default=datetime.utcnow)
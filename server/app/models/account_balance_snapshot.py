@@ -0,0 +1,23 @@
+from sqlalchemy import Column, Integer, String, Float, Date, DateTime, ForeignKey, UniqueConstraint
+from app.core.database import Base
+from datetime import datetime
+
+
+class AccountBalanceSnapshot(Base):
+    """
+    An account's balance as of a day. Written on sync only when the balance changed,
+    so a balance holds from its snapshot date until the next snapshot.
+    """
+    __tablename__ = "account_balance_snapshots"
+    __table_args__ = (
+        UniqueConstraint("account_id", "date", name="uq_account_balance_snapshots_account_date"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    account_id = Column(String, ForeignKey("accounts.id"), nullable=False)
+    date = Column(Date, nullable=False)
+    balance = Column(Float, nullable=False)
+    available_balance = Column(Float, nullable=True)
+
+    created_at = Column(DateTime, default=datetime.utcnow)
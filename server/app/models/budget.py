@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Float, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Float, ForeignKey, Boolean, UniqueConstraint
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 from datetime import datetime
@@ -7,11 +7,20 @@ import calendar
 
 class Budget(Base):
     __tablename__ = "budgets"
+    __table_args__ = (
+        UniqueConstraint("year", "month", name="uq_budgets_year_month"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
     month = Column(Integer, nullable=False)
     year = Column(Integer, nullable=False)
+    # Set when this month's opening balances may be stale; see BudgetLedgerService
+    ledger_dirty = Column(Boolean, nullable=False, default=True, index=True)
+    # Maintained by the ledger: Income subcategory totals for the month, and income
+    # minus assignments carried forward through this month
+    income = Column(Float, nullable=False, default=0.0)
+    ready_to_assign = Column(Float, nullable=False, default=0.0)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
@@ -38,7 +47,8 @@ class SubcategoryBudget(Base):
     subcategory_id = Column(Integer, ForeignKey("subcategories.id"), nullable=False)
     monthly_assigned = Column(Float, nullable=False, default=0.0)
     monthly_target = Column(Float, nullable=False, default=0.0)
-    total_balance = Column(Float, nullable=False, default=0.0)
+    total_balance = Column(Float, nullable=False, default=0.0)  # Opening balance carried in
+    closing_balance = Column(Float, nullable=False, default=0.0)  # total_balance + assigned - activity
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
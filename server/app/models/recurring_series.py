@@ -0,0 +1,34 @@
+from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, ForeignKey, UniqueConstraint
+from app.core.database import Base
+from datetime import datetime
+
+
+class RecurringSeries(Base):
+    """A detected recurring charge or deposit (subscription, bill, paycheque) for one payee."""
+    __tablename__ = "recurring_series"
+    __table_args__ = (
+        UniqueConstraint("payee", "is_income", name="uq_recurring_series_payee_direction"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    payee = Column(String, nullable=False, index=True)  # Normalized payee (Transaction.payee)
+    name = Column(String, nullable=False)  # Most recent raw description, for display
+    is_income = Column(Boolean, nullable=False, default=False)
+    account_id = Column(String, ForeignKey("accounts.id"), nullable=True)  # Account of the latest occurrence
+    subcategory_id = Column(Integer, ForeignKey("subcategories.id"), nullable=True)  # Subcategory of the latest occurrence
+
+    period = Column(String, nullable=False)  # weekly | biweekly | monthly | annual
+    interval_days = Column(Float, nullable=False)  # Median gap between occurrences
+    average_amount = Column(Float, nullable=False)  # Median amount (signed)
+    last_amount = Column(Float, nullable=False)
+    occurrences = Column(Integer, nullable=False)
+    confidence = Column(Float, nullable=False)  # 0.0-1.0, from gap regularity and amount stability
+
+    first_date = Column(DateTime, nullable=False)
+    last_date = Column(DateTime, nullable=False)
+    next_expected_date = Column(DateTime, nullable=False, index=True)
+    is_active = Column(Boolean, nullable=False, default=True)  # False once an expected occurrence was missed
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Boolean, JSON
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Boolean, JSON, Index, func
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 from datetime import datetime
@@ -6,6 +6,10 @@ from typing import Optional
 
 class Transaction(Base):
     __tablename__ = "transactions"
+    __table_args__ = (
+        # Sync and import match incoming rows on the bank's id within an account
+        Index("ix_transactions_account_transaction_id", "account_id", "transaction_id"),
+    )
     id = Column(Integer, index=True, primary_key=True)
     
     account_id = Column(String, ForeignKey("accounts.id"))
@@ -13,9 +17,10 @@ class Transaction(Base):
     
     # Basic transaction info
     amount = Column(Float)
-    posted = Column(DateTime)
+    posted = Column(DateTime, index=True)  # Date-range filter of every analytics query
     transacted_at = Column(DateTime, nullable=True)
     name = Column(String)  # Raw transaction name
+    payee = Column(String, nullable=True, index=True)  # Normalized name, groups recurring charges
         
     # Transaction metadata
     pending = Column(Boolean, default=False)
@@ -38,6 +43,8 @@ class Transaction(Base):
     
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Set by triggers on every insert/update (app.core.change_sequence); drives incremental refresh of the transaction store
+    change_seq = Column(Integer, nullable=False, default=0, server_default="0", index=True)
     # Split flag and relationship
     is_split = Column(Boolean, default=False)
     
@@ -62,4 +69,12 @@ class Transaction(Base):
             ]
             if merchant_names:
                 return ', '.join(merchant_names)
-        return None
\ No newline at end of file
+        return None
+
+
+# Keyset pagination order of transaction listings, alone and behind the common equality
+# filters so filtered pages are index range scans too; must match effective_date_column()
+_effective_date = func.coalesce(Transaction.transacted_at, Transaction.posted)
+Index("ix_transactions_effective_date_id", _effective_date, Transaction.id)
+Index("ix_transactions_account_effective_date", Transaction.account_id, _effective_date, Transaction.id)
+Index("ix_transactions_subcategory_effective_date", Transaction.subcategory_id, _effective_date, Transaction.id)
@@ -9,7 +9,7 @@ class TransactionSplit(Base):
     id = Column(Integer, primary_key=True, index=True)
 
     transaction_id = Column(Integer, ForeignKey("transactions.id"), nullable=False, index=True)
-    subcategory_id = Column(Integer, ForeignKey("subcategories.id"), nullable=False)
+    subcategory_id = Column(Integer, ForeignKey("subcategories.id"), nullable=False, index=True)
     amount = Column(Float, nullable=False)
     memo = Column(String, nullable=True)
 
@@ -1,7 +1,7 @@
 
 from pydantic import BaseModel
-from datetime import datetime
-from typing import Optional
+from datetime import date, datetime
+from typing import List, Optional
 from enum import IntEnum
 
 
@@ -33,3 +33,16 @@ class AccountResponse(AccountBase):
         
 class ChangeTypeRequest(BaseModel):
     new_type: int
+
+
+class NetWorthPoint(BaseModel):
+    """Net worth at the close of a day/week/month"""
+    date: date
+    assets: float
+    liabilities: float  # Credit and loan balances owed
+    net_worth: float
+
+
+class NetWorthResponse(BaseModel):
+    interval: str  # day | week | month
+    points: List[NetWorthPoint]
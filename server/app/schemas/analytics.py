@@ -1,5 +1,6 @@
 from pydantic import BaseModel
-from typing import Dict, List
+from datetime import date
+from typing import Dict, List, Optional
 from app.schemas.transaction import TransactionResponse
 from app.schemas.common import AccountInfo, CategoryInfo, SubcategoryInfo
 
@@ -21,10 +22,107 @@ class AnalyticsSummary(BaseModel):
     subcategory_breakdown: Dict[int, float]  # subcategory_id -> amount
 
 
+class ColumnarSplits(BaseModel):
+    """Splits of the columnar transactions as parallel arrays"""
+    id: List[int]
+    transaction_index: List[int]  # Position of the parent in ColumnarTransactions
+    subcategory_index: List[int]  # Index into ColumnarTransactions.subcategory_keys
+    amount: List[float]
+    memo: List[Optional[str]]
+    created_at: List[int]  # Epoch seconds
+
+
+class ColumnarTransactions(BaseModel):
+    """
+    Transactions as parallel arrays, one entry per transaction (oldest first).
+    Dates are epoch seconds; effective date is transacted_at if set, otherwise posted.
+    When delta_encoded is set, id, posted and created_at hold the difference to the
+    previous entry (the first entry is absolute).
+    """
+    delta_encoded: bool = False
+    account_keys: List[str]  # account_index -> account_id (key of AnalyticsResponse.accounts)
+    subcategory_keys: List[int]  # subcategory_index -> subcategory_id; -1 in an index array = none
+
+    id: List[int]
+    account_index: List[int]
+    amount: List[float]
+    posted: List[int]
+    transacted_at_offset: List[Optional[int]]  # Seconds after posted; None when transacted_at is unset
+    name: List[str]
+    memo: List[Optional[str]]
+    subcategory_index: List[int]
+    pending: List[bool]
+    created_at: List[int]
+    is_transfer: List[bool]
+    transfer_account_id: List[Optional[int]]
+    predicted_subcategory_index: List[int]
+    predicted_confidence: List[Optional[float]]
+    is_split: List[bool]
+    splits: ColumnarSplits
+
+
 class AnalyticsResponse(BaseModel):
     """Normalized analytics data structure"""
-    transactions: List[TransactionResponse]
+    transactions: List[TransactionResponse] = []  # Only populated when include_transactions is set
+    columnar: Optional[ColumnarTransactions] = None  # Replaces transactions with format=columnar
     categories: Dict[int, CategoryInfo]  # category_id -> category
     subcategories: Dict[int, SubcategoryInfo]  # subcategory_id -> subcategory
     accounts: Dict[str, AccountInfo]  # account_id -> account
     summary: AnalyticsSummary
+
+
+class TimeSeriesPoint(BaseModel):
+    """Spending and income for one time bucket (and optionally one category/subcategory)"""
+    period_start: date
+    group_id: Optional[int] = None  # category_id or subcategory_id when grouped; None = uncategorized
+    spending: float
+    income: float
+    net: float
+
+
+class TimeSeriesResponse(BaseModel):
+    """Server-side bucketed spending/income series"""
+    interval: str  # day | week | month
+    group_by: Optional[str] = None  # category | subcategory
+    points: List[TimeSeriesPoint]
+
+
+class ForecastPoint(BaseModel):
+    """Projected end-of-day balance and the flows behind it"""
+    date: date
+    balance: float
+    recurring_income: float
+    recurring_bills: float  # Negative
+    budgeted_spending: float  # Negative; remaining monthly targets spread over the days left
+
+
+class ForecastResponse(BaseModel):
+    """Daily cash-flow projection across the liquid accounts"""
+    days: int
+    account_ids: List[str]  # Checking, savings and credit accounts included in the balance
+    starting_balance: float
+    points: List[ForecastPoint]
+    lowest_balance: float
+    lowest_balance_date: date
+    next_payday: Optional[date] = None  # First expected recurring income in range
+    lowest_balance_before_payday: Optional[float] = None
+
+
+class PivotRow(BaseModel):
+    """One category (or subcategory) across the pivot's months"""
+    id: Optional[int] = None  # None = uncategorized
+    name: str
+    category_id: Optional[int] = None  # Parent category when pivoting by subcategory
+    values: List[float]  # Net amount per month, aligned with PivotResponse.months
+    total: float
+    average: float  # Per month
+
+
+class PivotResponse(BaseModel):
+    """Category × month matrix of split-aware net amounts (spending negative)"""
+    group_by: str  # category | subcategory
+    months: List[str]  # YYYY-MM
+    rows: List[PivotRow]
+    column_totals: List[float]
+    grand_total: float
+    monthly_average: float
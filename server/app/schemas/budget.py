@@ -17,6 +17,28 @@ class SubcategoryBudgetUpdate(BaseModel):
     monthly_target: Optional[float] = None
 
 
+class SubcategoryBudgetChange(BaseModel):
+    subcategory_budget_id: int
+    monthly_assigned: Optional[float] = None
+    monthly_target: Optional[float] = None
+
+
+class BudgetMonth(BaseModel):
+    year: int
+    month: int
+
+
+class BudgetAssignmentBatch(BaseModel):
+    """
+    Changes applied to one budget in a single transaction, in this order: copy from
+    another month, assign each target, then the explicit per-row changes.
+    """
+    copy_from: Optional[BudgetMonth] = None
+    copy_targets: bool = False  # Also copy monthly_target when copying a month
+    assign_to_targets: bool = False  # Set monthly_assigned to monthly_target wherever a target is set
+    changes: List[SubcategoryBudgetChange] = []
+
+
 class SubcategoryBudgetResponse(SubcategoryBudgetBase):
     id: int
     budget_id: int
@@ -24,8 +46,12 @@ class SubcategoryBudgetResponse(SubcategoryBudgetBase):
     subcategory_name: str
     monthly_target: float
     total_balance: float
+    closing_balance: float = 0.0
     monthly_activity: float
     monthly_available: float
+    projected_activity: float = 0.0  # Month's spending at the current pace
+    still_needed: float = 0.0  # To cover overspending, the target and the projected spending
+    suggested_allocation: float = 0.0  # Share of ready-to-assign, by funding priority
     created_at: datetime
     updated_at: datetime
     
@@ -52,6 +78,8 @@ class BudgetUpdate(BaseModel):
 class BudgetResponse(BudgetBase):
     id: int
     start_date: datetime
+    income: float = 0.0
+    ready_to_assign: float = 0.0
     created_at: datetime
     updated_at: datetime
     subcategory_budgets: List[SubcategoryBudgetResponse] = []
@@ -63,8 +91,67 @@ class BudgetResponse(BudgetBase):
 class BudgetSimpleResponse(BudgetBase):
     id: int
     start_date: datetime
+    income: float = 0.0
+    ready_to_assign: float = 0.0
     created_at: datetime
     updated_at: datetime
     
     class Config:
         from_attributes = True
+
+
+class ScenarioAssignment(BaseModel):
+    subcategory_id: int
+    monthly_assigned: float
+
+
+class ScenarioBill(BaseModel):
+    """A hypothetical recurring bill, charged to a subcategory."""
+    subcategory_id: int
+    amount: float  # Positive outflow per occurrence
+    interval_months: int = 1
+    start_month: int = 0  # Months from the current month of the first charge
+
+
+class BudgetScenario(BaseModel):
+    months: int = 12
+    assignment_changes: List[ScenarioAssignment] = []  # Replace monthly_assigned in every simulated month
+    recurring_bills: List[ScenarioBill] = []
+    income_change: float = 0.0  # Added to expected monthly income
+
+
+class SimulatedSubcategory(BaseModel):
+    subcategory_id: int
+    category_name: str
+    subcategory_name: str
+    balances: List[float]  # Closing balance per simulated month
+    first_overspent_month: Optional[str] = None  # YYYY-MM
+
+
+class BudgetSimulationResponse(BaseModel):
+    months: List[str]  # YYYY-MM, starting with the current month
+    subcategories: List[SimulatedSubcategory]
+    ready_to_assign: List[float]
+    overspent_total: List[float]  # Sum of negative balances per month, as a positive amount
+
+
+class SubcategoryFundingPlan(BaseModel):
+    """
+    What a subcategory still needs this month, split by funding priority: overspending
+    first, then the unmet target, then spending projected beyond both.
+    """
+    subcategory_budget_id: int
+    subcategory_id: int
+    projected_activity: float
+    overspent: float
+    target_shortfall: float
+    pace_shortfall: float
+    still_needed: float
+    allocation: float
+
+
+class FundingPlanResponse(BaseModel):
+    budget_id: int
+    funds: float  # Amount allocated from (ready-to-assign unless given)
+    allocated: float
+    subcategories: List[SubcategoryFundingPlan]
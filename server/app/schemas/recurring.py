@@ -0,0 +1,26 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Optional
+
+
+class RecurringSeriesResponse(BaseModel):
+    """A detected recurring charge or deposit"""
+    id: int
+    payee: str
+    name: str
+    is_income: bool
+    account_id: Optional[str] = None
+    subcategory_id: Optional[int] = None
+    period: str  # weekly | biweekly | monthly | annual
+    interval_days: float
+    average_amount: float
+    last_amount: float
+    occurrences: int
+    confidence: float
+    first_date: datetime
+    last_date: datetime
+    next_expected_date: datetime
+    is_active: bool
+
+    class Config:
+        from_attributes = True
@@ -77,6 +77,31 @@ class CreateSplitsRequest(BaseModel):
     replace_existing: bool = True
 
 
+class CsvColumnMapping(BaseModel):
+    """
+    Column names of a CSV bank export. Unset columns are matched against common
+    header names (case-insensitive). Either amount or debit/credit must resolve.
+    """
+    date: Optional[str] = None
+    amount: Optional[str] = None
+    debit: Optional[str] = None
+    credit: Optional[str] = None
+    description: Optional[str] = None
+    id: Optional[str] = None
+    transacted_at: Optional[str] = None
+    memo: Optional[str] = None
+    date_format: Optional[str] = None  # strptime format, e.g. "%m/%d/%Y"; ISO and common formats otherwise
+    negate: bool = False  # For exports that list spending as positive amounts
+
+
+class ImportResult(BaseModel):
+    """Outcome of a bulk file import"""
+    account_id: str
+    rows_read: int
+    inserted: int
+    duplicates: int
+
+
 # Resolve forward references for Pydantic models
 try:
     TransactionResponse.update_forward_refs()
@@ -1,10 +1,16 @@
 from fastapi import Depends
 from sqlalchemy.orm import Session
+from sqlalchemy import func
+from collections import defaultdict
 import logging
 
-from app.models import Account, Organization
+import numpy as np
+
+from app.models import Account, Organization, AccountBalanceSnapshot
+from app.models.account import DEBT_ACCOUNT_TYPES
 from app.core.database import get_db
-from datetime import datetime
+from app.schemas.account import NetWorthPoint, NetWorthResponse
+from datetime import date, datetime
 
 logger = logging.getLogger(__name__)
 
@@ -35,6 +41,7 @@ class AccountService:
                 existing_account.current_balance = account['balance']
                 existing_account.available_balance = account.get('available-balance')
                 existing_account.balance_date = datetime.fromtimestamp(account['balance-date'])
+                self.record_balance_snapshot(existing_account, db)
             else:
                 # Create new account
                 existing_org = db.query(Organization).filter(Organization.domain == account['org']['domain']).first() 
@@ -54,6 +61,7 @@ class AccountService:
                 )
                 db.add(account)
                 db.flush()
+                self.record_balance_snapshot(account, db)
             return (True, "")
         except Exception as ex:
             return (False, f"Failed to store accounts: {ex}")
@@ -71,4 +79,107 @@ class AccountService:
         except Exception as ex:
             return (False, f"Failed to add new organization ({org['domain']}): {ex}")
 
+    def record_balance_snapshot(self, account: Account, db: Session) -> None:
+        """
+        Record the account's current balance for its balance date.
+        Nothing is written when the balance is unchanged since the latest snapshot;
+        a second sync on the same day overwrites that day's snapshot.
+        """
+        day = (account.balance_date or datetime.utcnow()).date()
+        latest = db.query(AccountBalanceSnapshot).filter(
+            AccountBalanceSnapshot.account_id == account.id,
+            AccountBalanceSnapshot.date <= day
+        ).order_by(AccountBalanceSnapshot.date.desc()).first()
+
+        if latest and latest.date == day:
+            latest.balance = account.current_balance
+            latest.available_balance = account.available_balance
+        elif not latest or latest.balance != account.current_balance:
+            db.add(AccountBalanceSnapshot(
+                account_id=account.id,
+                date=day,
+                balance=account.current_balance,
+                available_balance=account.available_balance
+            ))
+            db.flush()
+
+    def get_net_worth_series(
+        self,
+        db: Session,
+        start_date: date,
+        end_date: date,
+        interval: str = "day"
+    ) -> NetWorthResponse:
+        """
+        Net worth at the close of each day, week (Sunday) or month in range, from balance
+        snapshots. Each account contributes its latest snapshot on or before the point;
+        credit and loan balances are subtracted.
+        """
+        accounts = {account.id: account for account in db.query(Account).all()}
+
+        # Snapshots in range plus each account's last snapshot before it (carried forward)
+        carried = db.query(
+            AccountBalanceSnapshot.account_id,
+            func.max(AccountBalanceSnapshot.date).label("date")
+        ).filter(
+            AccountBalanceSnapshot.date < start_date
+        ).group_by(AccountBalanceSnapshot.account_id).subquery()
+        rows = db.query(
+            AccountBalanceSnapshot.account_id, AccountBalanceSnapshot.date, AccountBalanceSnapshot.balance
+        ).outerjoin(
+            carried,
+            (carried.c.account_id == AccountBalanceSnapshot.account_id) & (carried.c.date == AccountBalanceSnapshot.date)
+        ).filter(
+            AccountBalanceSnapshot.date <= end_date,
+            (AccountBalanceSnapshot.date >= start_date) | carried.c.date.isnot(None)
+        ).order_by(AccountBalanceSnapshot.account_id, AccountBalanceSnapshot.date).all()
+
+        grid = self._period_ends(start_date, end_date, interval)
+        assets = np.zeros(len(grid))
+        liabilities = np.zeros(len(grid))
+        by_account = defaultdict(list)
+        for account_id, day, balance in rows:
+            by_account[account_id].append((day, balance))
+
+        for account_id, snapshots in by_account.items():
+            account = accounts.get(account_id)
+            if account is None:
+                continue
+            days = np.array([day for day, _ in snapshots], dtype="datetime64[D]")
+            balances = np.array([balance for _, balance in snapshots], dtype=np.float64)
+            # Index of the latest snapshot on or before each grid point (-1 = none yet)
+            position = np.searchsorted(days, grid, side="right") - 1
+            values = np.where(position >= 0, balances[np.maximum(position, 0)], 0.0)
+            if account.type in DEBT_ACCOUNT_TYPES:
+                liabilities += values
+            else:
+                assets += values
+
+        return NetWorthResponse(
+            interval=interval,
+            points=[
+                NetWorthPoint(
+                    date=day,
+                    assets=float(assets[i]),
+                    liabilities=float(liabilities[i]),
+                    net_worth=float(assets[i] - liabilities[i])
+                )
+                for i, day in enumerate(grid.astype(date))
+            ]
+        )
 
+    def _period_ends(self, start_date: date, end_date: date, interval: str) -> np.ndarray:
+        """Last day of each day/week/month bucket in range (the final bucket ends at end_date)."""
+        days = np.arange(np.datetime64(start_date, "D"), np.datetime64(end_date, "D") + 1)
+        if interval == "week":
+            # Epoch day 0 was a Thursday, so this makes 0 = Monday
+            weekday = (days.astype(np.int64) + 3) % 7
+            ends = days[weekday == 6]
+        elif interval == "month":
+            months = days.astype("datetime64[M]")
+            ends = days[np.append(months[1:] != months[:-1], False)]
+        else:
+            return days
+        if not len(ends) or ends[-1] != days[-1]:
+            ends = np.append(ends, days[-1])
+        return ends
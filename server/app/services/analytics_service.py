@@ -0,0 +1,629 @@
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import func, case, select, union
+from typing import Dict, Iterator, List, Optional, Tuple, Set
+from datetime import datetime, date
+from collections import defaultdict
+import logging
+
+import numpy as np
+
+from app.core.config import settings
+from app.models.transaction import Transaction
+from app.models.category import Category, Subcategory
+from app.models.account import Account
+from app.models.transaction_split import TransactionSplit
+from app.schemas.analytics import (
+    AnalyticsResponse, AnalyticsSummary, ColumnarSplits, ColumnarTransactions, PivotResponse, PivotRow,
+    TimeSeriesPoint, TimeSeriesResponse
+)
+from app.schemas.transaction import TransactionResponse
+from app.schemas.common import CategoryInfo, SubcategoryInfo, AccountInfo
+from app.services.transaction_store import get_transaction_store, to_epoch_seconds
+from app.utils.streaming import iter_ndjson
+from app.utils.transaction_lines import transaction_lines, effective_date_column, load_splits
+
+logger = logging.getLogger(__name__)
+
+DATA_FORMATS = ("json", "ndjson", "columnar")
+TIME_SERIES_INTERVALS = ("day", "week", "month")
+TIME_SERIES_GROUPS = ("category", "subcategory")
+INCOME_VS_SPENDING_GROUPS = ("month", "account", "category")
+PIVOT_GROUPS = ("category", "subcategory")
+
+
+class AnalyticsService:
+    """Service for analytics aggregates, computed in SQL or from the columnar transaction store."""
+
+    def _transaction_filters(self, start_date: Optional[datetime], end_date: Optional[datetime]) -> list:
+        """Filters shared by every analytics query (transfers are net-zero and always excluded)."""
+        filters = [Transaction.is_transfer == False]
+        if start_date:
+            filters.append(Transaction.posted >= start_date)
+        if end_date:
+            filters.append(Transaction.posted <= end_date)
+        return filters
+
+    def _sql_totals(self, db: Session, start_date: Optional[datetime], end_date: Optional[datetime]):
+        """Summary inputs from grouped SQL: (transaction_count, account_ids, date_range_days, subcategory_rows)."""
+        effective_date = effective_date_column()
+
+        # Transaction count and effective date range, grouped per account so the
+        # same query also tells us which accounts need a lookup entry
+        account_rows = db.query(
+            Transaction.account_id,
+            func.count(Transaction.id),
+            func.min(effective_date),
+            func.max(effective_date)
+        ).filter(
+            *self._transaction_filters(start_date, end_date)
+        ).group_by(Transaction.account_id).all()
+
+        transaction_count = sum(count for _, count, _, _ in account_rows)
+        account_ids = {account_id for account_id, _, _, _ in account_rows if account_id}
+        dates = [d for _, _, min_date, max_date in account_rows for d in (min_date, max_date) if d]
+        date_range_days = (max(dates) - min(dates)).days if dates else None
+
+        # Split-aware spending/income per subcategory
+        lines = transaction_lines(start_date=start_date, end_date=end_date)
+        subcategory_rows = db.query(
+            lines.c.subcategory_id,
+            func.sum(case((lines.c.amount < 0, lines.c.amount), else_=0.0)),
+            func.sum(case((lines.c.amount > 0, lines.c.amount), else_=0.0)),
+            func.sum(lines.c.amount)
+        ).group_by(lines.c.subcategory_id).all()
+
+        return transaction_count, account_ids, date_range_days, subcategory_rows
+
+    def _store_totals(self, db: Session, start_date: Optional[datetime], end_date: Optional[datetime]):
+        """Summary inputs from the in-memory columnar store (same shape as _sql_totals)."""
+        store = get_transaction_store()
+        store.refresh(db)
+        return store.summarize(start_date, end_date)
+
+    def get_summary(
+        self,
+        db: Session,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> Tuple[AnalyticsSummary, Set[str], Dict[int, Subcategory]]:
+        """
+        Compute the analytics summary without loading transactions as ORM objects.
+
+        Aggregates come from the columnar store when ANALYTICS_COLUMNAR_STORE is
+        enabled, otherwise from a fixed number of grouped SQL queries.
+        Returns the summary, the account ids seen in range and the subcategories
+        referenced by the breakdown (used to build the lookup maps).
+        """
+        if settings.ANALYTICS_COLUMNAR_STORE:
+            totals = self._store_totals(db, start_date, end_date)
+        else:
+            totals = self._sql_totals(db, start_date, end_date)
+        transaction_count, account_ids, date_range_days, subcategory_rows = totals
+
+        subcategory_ids = {sub_id for sub_id, _, _, _ in subcategory_rows if sub_id}
+        subcategories = {}
+        if subcategory_ids:
+            subcategories = {
+                sub.id: sub
+                for sub in db.query(Subcategory).filter(Subcategory.id.in_(subcategory_ids)).all()
+            }
+
+        total_spending = 0.0
+        total_income = 0.0
+        category_breakdown = defaultdict(float)
+        subcategory_breakdown = {}
+        for sub_id, spending, income, net_amount in subcategory_rows:
+            total_spending += float(spending or 0.0)
+            total_income += float(income or 0.0)
+            if sub_id:
+                subcategory_breakdown[sub_id] = float(net_amount or 0.0)
+                if sub_id in subcategories:
+                    category_breakdown[subcategories[sub_id].category_id] += float(net_amount or 0.0)
+
+        # Calculate date range
+        date_range_days = max(date_range_days or 0, 1)
+
+        # Calculate averages
+        months = date_range_days / 30.44  # Average days per month
+
+        summary = AnalyticsSummary(
+            total_spending=total_spending,
+            total_income=total_income,
+            net=total_income + total_spending,
+            transaction_count=transaction_count,
+            date_range_days=date_range_days,
+            monthly_average_spending=total_spending / months if months > 0 else 0,
+            monthly_average_income=total_income / months if months > 0 else 0,
+            daily_average_spending=total_spending / date_range_days,
+            daily_average_income=total_income / date_range_days,
+            category_breakdown=dict(category_breakdown),
+            subcategory_breakdown=subcategory_breakdown
+        )
+        return summary, account_ids, subcategories
+
+    def _transactions_query(
+        self,
+        db: Session,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ):
+        """Non-transfer transactions in range with their splits, oldest first."""
+        return db.query(Transaction).options(
+            selectinload(Transaction.splits)
+        ).filter(
+            *self._transaction_filters(start_date, end_date)
+        ).order_by(Transaction.posted, Transaction.id)
+
+    def get_transactions(
+        self,
+        db: Session,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        skip: int = 0,
+        limit: Optional[int] = None
+    ) -> list:
+        """Get the non-transfer transactions in range, oldest first, optionally paginated."""
+        query = self._transactions_query(db, start_date, end_date)
+        if skip:
+            query = query.offset(skip)
+        if limit is not None:
+            query = query.limit(limit)
+        return query.all()
+
+    def _add_referenced_subcategories(
+        self,
+        db: Session,
+        start_date: Optional[datetime],
+        end_date: Optional[datetime],
+        subcategories: Dict[int, Subcategory]
+    ) -> None:
+        """
+        Add lookup entries for every subcategory a transaction in range refers to.
+        A split transaction may still carry its old subcategory_id, which the
+        split-aware breakdown never sees.
+        """
+        filters = self._transaction_filters(start_date, end_date)
+        direct = select(Transaction.subcategory_id).where(Transaction.subcategory_id.isnot(None), *filters)
+        split = select(TransactionSplit.subcategory_id).join(
+            Transaction, Transaction.id == TransactionSplit.transaction_id
+        ).where(TransactionSplit.subcategory_id.isnot(None), *filters)
+
+        missing = set(db.scalars(union(direct, split))) - subcategories.keys()
+        if missing:
+            for sub in db.query(Subcategory).filter(Subcategory.id.in_(missing)).all():
+                subcategories[sub.id] = sub
+
+    def _build_response(
+        self,
+        db: Session,
+        summary: AnalyticsSummary,
+        account_ids: Set[str],
+        subcategories: Dict[int, Subcategory],
+        transactions: List[TransactionResponse],
+        columnar: Optional[ColumnarTransactions] = None
+    ) -> AnalyticsResponse:
+        """Attach category, subcategory and account lookups to the summary."""
+        subcategories_dict = {
+            sub_id: SubcategoryInfo.model_validate(sub) for sub_id, sub in subcategories.items()
+        }
+
+        categories_dict = {}
+        category_ids = {sub.category_id for sub in subcategories.values()}
+        if category_ids:
+            for cat in db.query(Category).filter(Category.id.in_(category_ids)).all():
+                categories_dict[cat.id] = CategoryInfo.model_validate(cat)
+
+        accounts_dict = {}
+        if account_ids:
+            for acc in db.query(Account).filter(Account.id.in_(account_ids)).all():
+                accounts_dict[acc.id] = AccountInfo.model_validate(acc)
+
+        return AnalyticsResponse(
+            transactions=transactions,
+            columnar=columnar,
+            categories=categories_dict,
+            subcategories=subcategories_dict,
+            accounts=accounts_dict,
+            summary=summary
+        )
+
+    def _columnar_transactions(self, transactions: List[Transaction], delta_encoded: bool) -> ColumnarTransactions:
+        """Encode transactions (and their splits) as parallel arrays with interned keys."""
+        account_keys: List[str] = []
+        account_codes: Dict[str, int] = {}
+        subcategory_keys: List[int] = []
+        subcategory_codes: Dict[int, int] = {}
+
+        def account_index(account_id: str) -> int:
+            if account_id not in account_codes:
+                account_codes[account_id] = len(account_keys)
+                account_keys.append(account_id)
+            return account_codes[account_id]
+
+        def subcategory_index(subcategory_id: Optional[int]) -> int:
+            if subcategory_id is None:
+                return -1
+            if subcategory_id not in subcategory_codes:
+                subcategory_codes[subcategory_id] = len(subcategory_keys)
+                subcategory_keys.append(subcategory_id)
+            return subcategory_codes[subcategory_id]
+
+        ids = np.array([t.id for t in transactions], dtype=np.int64)
+        posted = np.array([to_epoch_seconds(t.posted) for t in transactions], dtype=np.int64)
+        created_at = np.array([to_epoch_seconds(t.created_at) for t in transactions], dtype=np.int64)
+        if delta_encoded:
+            ids, posted, created_at = (np.diff(column, prepend=0) for column in (ids, posted, created_at))
+
+        splits = [(position, split) for position, t in enumerate(transactions) for split in t.splits]
+
+        return ColumnarTransactions(
+            delta_encoded=delta_encoded,
+            account_keys=account_keys,
+            subcategory_keys=subcategory_keys,
+            id=ids.tolist(),
+            account_index=[account_index(t.account_id) for t in transactions],
+            amount=[t.amount for t in transactions],
+            posted=posted.tolist(),
+            transacted_at_offset=[
+                to_epoch_seconds(t.transacted_at) - to_epoch_seconds(t.posted) if t.transacted_at else None
+                for t in transactions
+            ],
+            name=[t.name for t in transactions],
+            memo=[t.memo for t in transactions],
+            subcategory_index=[subcategory_index(t.subcategory_id) for t in transactions],
+            pending=[bool(t.pending) for t in transactions],
+            created_at=created_at.tolist(),
+            is_transfer=[bool(t.is_transfer) for t in transactions],
+            transfer_account_id=[t.transfer_account_id for t in transactions],
+            predicted_subcategory_index=[subcategory_index(t.predicted_subcategory_id) for t in transactions],
+            predicted_confidence=[t.predicted_confidence for t in transactions],
+            is_split=[bool(t.is_split) for t in transactions],
+            splits=ColumnarSplits(
+                id=[split.id for _, split in splits],
+                transaction_index=[position for position, _ in splits],
+                subcategory_index=[subcategory_index(split.subcategory_id) for _, split in splits],
+                amount=[split.amount for _, split in splits],
+                memo=[split.memo for _, split in splits],
+                created_at=[to_epoch_seconds(split.created_at) for _, split in splits]
+            )
+        )
+
+    def get_analytics_data(
+        self,
+        db: Session,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        include_transactions: bool = False,
+        skip: int = 0,
+        limit: Optional[int] = None,
+        columnar: bool = False,
+        delta_encoded: bool = False
+    ) -> AnalyticsResponse:
+        """
+        Build the normalized analytics response; transactions are only loaded when requested.
+        With columnar set they are returned as parallel arrays instead of objects.
+        """
+        summary, account_ids, subcategories = self.get_summary(db, start_date, end_date)
+
+        transaction_responses = []
+        columnar_transactions = None
+        if include_transactions or columnar:
+            transactions = self.get_transactions(db, start_date, end_date, skip, limit)
+            if columnar:
+                columnar_transactions = self._columnar_transactions(transactions, delta_encoded)
+            else:
+                transaction_responses = [TransactionResponse.model_validate(t) for t in transactions]
+            self._add_referenced_subcategories(db, start_date, end_date, subcategories)
+
+        return self._build_response(
+            db, summary, account_ids, subcategories, transaction_responses, columnar_transactions
+        )
+
+    def stream_analytics_data(
+        self,
+        db: Session,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> Iterator[bytes]:
+        """
+        NDJSON form of the analytics response: the first line holds summary and lookups
+        (without transactions), followed by one TransactionResponse per line.
+        """
+        summary, account_ids, subcategories = self.get_summary(db, start_date, end_date)
+        self._add_referenced_subcategories(db, start_date, end_date, subcategories)
+        header = self._build_response(db, summary, account_ids, subcategories, [])
+
+        query = db.query(Transaction).filter(
+            *self._transaction_filters(start_date, end_date)
+        ).order_by(Transaction.posted, Transaction.id)
+        return iter_ndjson(
+            query,
+            TransactionResponse,
+            header=header.model_dump(exclude={"transactions"}),
+            prepare_batch=lambda batch: load_splits(db, batch)
+        )
+
+    def _bucket_column(self, effective_date, interval: str):
+        """SQLite expression truncating the effective date to the start of its day, week (Monday) or month."""
+        if interval == "day":
+            return func.date(effective_date)
+        if interval == "week":
+            # Move forward to Sunday, then back six days to that week's Monday
+            return func.date(effective_date, "weekday 0", "-6 days")
+        return func.strftime("%Y-%m-01", effective_date)
+
+    def _sql_time_series(
+        self,
+        db: Session,
+        interval: str,
+        group_by: Optional[str],
+        start_date: Optional[datetime],
+        end_date: Optional[datetime]
+    ) -> list:
+        """Bucketed (period_start, group_id, spending, income) rows from one grouped SQL query."""
+        lines = transaction_lines(start_date=start_date, end_date=end_date)
+        bucket = self._bucket_column(lines.c.effective_date, interval).label("bucket")
+
+        if group_by == "subcategory":
+            group = lines.c.subcategory_id
+        elif group_by == "category":
+            group = Subcategory.category_id
+        else:
+            group = None
+
+        columns = [
+            bucket,
+            func.sum(case((lines.c.amount < 0, lines.c.amount), else_=0.0)),
+            func.sum(case((lines.c.amount > 0, lines.c.amount), else_=0.0))
+        ]
+        if group is not None:
+            columns.insert(1, group)
+        query = db.query(*columns)
+        if group_by == "category":
+            query = query.outerjoin(Subcategory, Subcategory.id == lines.c.subcategory_id)
+        group_columns = [bucket] if group is None else [bucket, group]
+        rows = query.group_by(*group_columns).order_by(*group_columns).all()
+
+        if group is None:
+            return [(date.fromisoformat(b), None, float(sp or 0.0), float(inc or 0.0)) for b, sp, inc in rows]
+        return [(date.fromisoformat(b), g, float(sp or 0.0), float(inc or 0.0)) for b, g, sp, inc in rows]
+
+    def _store_time_series(
+        self,
+        db: Session,
+        interval: str,
+        group_by: Optional[str],
+        start_date: Optional[datetime],
+        end_date: Optional[datetime]
+    ) -> list:
+        """Bucketed rows computed with vectorized group-bys over the columnar store."""
+        store = get_transaction_store()
+        store.refresh(db)
+        subcategory_categories = None
+        if group_by == "category":
+            subcategory_categories = dict(db.query(Subcategory.id, Subcategory.category_id).all())
+        return store.time_buckets(interval, group_by, start_date, end_date, subcategory_categories)
+
+    def get_time_series(
+        self,
+        db: Session,
+        interval: str = "day",
+        group_by: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> TimeSeriesResponse:
+        """
+        Split-aware spending/income per day, week or month of effective date, optionally
+        per category or subcategory. Buckets without any lines are omitted.
+        """
+        if settings.ANALYTICS_COLUMNAR_STORE:
+            rows = self._store_time_series(db, interval, group_by, start_date, end_date)
+        else:
+            rows = self._sql_time_series(db, interval, group_by, start_date, end_date)
+
+        return TimeSeriesResponse(
+            interval=interval,
+            group_by=group_by,
+            points=[
+                TimeSeriesPoint(
+                    period_start=period_start,
+                    group_id=group_id,
+                    spending=spending,
+                    income=income,
+                    net=spending + income
+                )
+                for period_start, group_id, spending, income in rows
+            ]
+        )
+
+    def get_spending_breakdown(
+        self,
+        db: Session,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        account_ids: Optional[List[str]] = None,
+        drill_down: bool = False
+    ) -> dict:
+        """
+        Get spending breakdown by category (split-aware, transfers excluded) in one
+        grouped query. With drill_down, each category also lists its subcategories.
+        Lines without a subcategory are reported as "Uncategorized".
+        """
+        lines = transaction_lines(start_date, end_date, account_ids=account_ids)
+        columns = [Subcategory.category_id, Category.name]
+        if drill_down:
+            columns += [Subcategory.id, Subcategory.name]
+
+        rows = db.query(
+            *columns,
+            func.sum(lines.c.amount).label('total')
+        ).select_from(lines).outerjoin(
+            Subcategory, Subcategory.id == lines.c.subcategory_id
+        ).outerjoin(
+            Category, Category.id == Subcategory.category_id
+        ).filter(
+            lines.c.amount < 0  #TODO check sign correct for credit cards too
+        ).group_by(*columns).all()
+
+        categories = defaultdict(float)
+        subcategories = defaultdict(dict)
+        total_spending = 0
+
+        for row in rows:
+            category_id, category_name = row[0], row[1]
+            uncategorized = category_id is None
+            if uncategorized:
+                category_name = "Uncategorized"
+            elif category_name is None:
+                category_name = f"Category {category_id}"
+            total = float(row[-1])
+            categories[category_name] += total
+            total_spending += total
+            if drill_down and not uncategorized:
+                subcategories[category_name][row[3] or f"Subcategory {row[2]}"] = total
+
+        result = {
+            "categories": dict(categories),
+            "total_spending": total_spending
+        }
+        if drill_down:
+            result["subcategories"] = dict(subcategories)
+        return result
+
+    def get_income_vs_spending(
+        self,
+        db: Session,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        group_by: Optional[str] = None
+    ) -> dict:
+        """
+        Get income vs spending analysis from conditional SUMs over the split-aware lines.
+        With group_by (month of effective date, account or category) the totals are
+        also broken down into "groups", computed in the same grouped query.
+        """
+        lines = transaction_lines(start_date, end_date)
+        # TODO check if correct for cc
+        sums = [
+            func.sum(case((lines.c.amount > 0, lines.c.amount), else_=0.0)).label('income'),
+            func.sum(case((lines.c.amount < 0, lines.c.amount), else_=0.0)).label('spending'),
+        ]
+
+        if group_by is None:
+            income, spending = db.query(*sums).select_from(lines).one()
+            return self._income_vs_spending_totals(income, spending)
+
+        if group_by == "month":
+            key = func.strftime('%Y-%m', lines.c.effective_date)
+            query = db.query(key, key, *sums).select_from(lines)
+        elif group_by == "account":
+            key = lines.c.account_id
+            query = db.query(key, Account.name, *sums).select_from(lines).outerjoin(
+                Account, Account.id == key
+            )
+        else:
+            key = Subcategory.category_id
+            query = db.query(key, Category.name, *sums).select_from(lines).outerjoin(
+                Subcategory, Subcategory.id == lines.c.subcategory_id
+            ).outerjoin(
+                Category, Category.id == Subcategory.category_id
+            )
+        rows = query.group_by(key).order_by(key).all()
+
+        groups = []
+        total_income = 0.0
+        total_spending = 0.0
+        for group_key, name, income, spending in rows:
+            totals = self._income_vs_spending_totals(income, spending)
+            total_income += totals["total_income"]
+            total_spending += totals["total_spending"]
+            groups.append({
+                "key": group_key,
+                "name": name if group_key is not None else "Uncategorized",
+                **totals
+            })
+
+        return {
+            **self._income_vs_spending_totals(total_income, total_spending),
+            "group_by": group_by,
+            "groups": groups
+        }
+
+    def _income_vs_spending_totals(self, income: Optional[float], spending: Optional[float]) -> dict:
+        income = float(income or 0.0)
+        spending = float(spending or 0.0)
+        return {
+            "total_income": income,
+            "total_spending": spending,
+            "net": income + spending
+        }
+
+    def get_pivot(
+        self,
+        db: Session,
+        start_date: datetime,
+        end_date: datetime,
+        group_by: str = "category"
+    ) -> PivotResponse:
+        """
+        Split-aware net amount per category (or subcategory) per posted month, with row and
+        column totals and per-month averages, from one grouped query. Every month in range
+        gets a column, including months without activity.
+        """
+        lines = transaction_lines(start_date, end_date)
+        month = func.strftime('%Y-%m', lines.c.posted)
+        if group_by == "subcategory":
+            columns = [lines.c.subcategory_id, Subcategory.name, Subcategory.category_id]
+        else:
+            columns = [Subcategory.category_id, Category.name, Subcategory.category_id]
+
+        rows = db.query(
+            month, *columns, func.sum(lines.c.amount)
+        ).select_from(lines).outerjoin(
+            Subcategory, Subcategory.id == lines.c.subcategory_id
+        ).outerjoin(
+            Category, Category.id == Subcategory.category_id
+        ).group_by(month, columns[0]).all()
+
+        months = []
+        cursor = date(start_date.year, start_date.month, 1)
+        while cursor <= end_date.date():
+            months.append(cursor.strftime('%Y-%m'))
+            cursor = date(cursor.year + cursor.month // 12, cursor.month % 12 + 1, 1)
+        month_index = {key: i for i, key in enumerate(months)}
+
+        matrix = defaultdict(lambda: [0.0] * len(months))
+        names = {}
+        for month_key, group_id, name, category_id, total in rows:
+            matrix[group_id][month_index[month_key]] += float(total or 0.0)
+            names[group_id] = (name, category_id)
+
+        pivot_rows = []
+        for group_id, values in matrix.items():
+            name, category_id = names[group_id]
+            if group_id is None:
+                name = "Uncategorized"
+            elif name is None:
+                name = f"{group_by.capitalize()} {group_id}"
+            row_total = sum(values)
+            pivot_rows.append(PivotRow(
+                id=group_id,
+                name=name,
+                category_id=category_id,
+                values=values,
+                total=row_total,
+                average=row_total / len(months)
+            ))
+        # Biggest spenders first
+        pivot_rows.sort(key=lambda row: row.total)
+
+        column_totals = [sum(row.values[i] for row in pivot_rows) for i in range(len(months))]
+        grand_total = sum(column_totals)
+        return PivotResponse(
+            group_by=group_by,
+            months=months,
+            rows=pivot_rows,
+            column_totals=column_totals,
+            grand_total=grand_total,
+            monthly_average=grand_total / len(months)
+        )
@@ -0,0 +1,177 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import func, select, update
+from typing import Dict, Optional, Tuple
+from datetime import datetime
+import calendar
+import logging
+
+import numpy as np
+
+from app.models.budget import Budget, SubcategoryBudget
+from app.models.category import Category, Subcategory
+from app.utils.transaction_lines import transaction_lines
+
+logger = logging.getLogger(__name__)
+
+# Months since year 0, so consecutive months differ by one across year boundaries
+BUDGET_MONTH = Budget.year * 12 + Budget.month - 1
+
+# Transactions in this category's subcategories are income available to assign
+INCOME_CATEGORY_NAME = "Income"
+
+
+def month_index(year: int, month: int) -> int:
+    """Month number comparable with the budgets' (year, month) ordering."""
+    return year * 12 + month - 1
+
+
+def month_bounds(index: int) -> tuple:
+    """(first moment, last second) of a month_index, matching Budget.start_date/end_date."""
+    year, month = divmod(index, 12)
+    last_day = calendar.monthrange(year, month + 1)[1]
+    return datetime(year, month + 1, 1), datetime(year, month + 1, last_day, 23, 59, 59)
+
+
+class BudgetLedgerService:
+    """
+    Maintains the rollover ledger: each SubcategoryBudget's opening (total_balance) and
+    closing balance, where a month opens with the previous month's closing balance,
+    and each Budget's ready-to-assign: income received minus amounts assigned to other
+    subcategories, carried forward the same way.
+
+    Writers that change assignments or spending mark the first affected budget dirty;
+    recompute() then rebuilds every month from the earliest dirty one forward in one
+    vectorized pass, so reading a budget never has to walk back through history.
+    """
+
+    def mark_dirty(self, db: Session, since: Optional[datetime]) -> None:
+        """Flag the first budget on or after the month of `since` for recomputation. Does not commit."""
+        if since is None:
+            return
+        first_affected = select(Budget.id).where(
+            BUDGET_MONTH >= month_index(since.year, since.month)
+        ).order_by(Budget.year, Budget.month).limit(1).scalar_subquery()
+        db.execute(
+            update(Budget).where(Budget.id == first_affected).values(ledger_dirty=True)
+            .execution_options(synchronize_session=False)
+        )
+
+    def monthly_totals(self, db: Session, first: int, last: int) -> Dict[Tuple[int, int], float]:
+        """Signed net amount per (month_index, subcategory_id) for months first..last from one grouped, split-aware query."""
+        range_start, _ = month_bounds(first)
+        _, range_end = month_bounds(last)
+        lines = transaction_lines(range_start, range_end)
+        month_key = func.strftime('%Y-%m', lines.c.posted)
+        rows = db.execute(
+            select(month_key, lines.c.subcategory_id, func.sum(lines.c.amount))
+            .where(lines.c.subcategory_id.isnot(None))
+            .group_by(month_key, lines.c.subcategory_id)
+        ).all()
+        totals = {}
+        for key, subcategory_id, total in rows:
+            year, month = key.split('-')
+            totals[(month_index(int(year), int(month)), subcategory_id)] = float(total or 0.0)
+        return totals
+
+    def monthly_activity(self, db: Session, first: int, last: int) -> Dict[Tuple[int, int], float]:
+        """Spending per (month_index, subcategory_id): the absolute of each month's net sum."""
+        return {key: abs(total) for key, total in self.monthly_totals(db, first, last).items()}
+
+    def recompute(self, db: Session) -> int:
+        """
+        Rebuild opening and closing balances from the earliest dirty month onward.
+
+        Months are laid out as rows and subcategories as columns: assigned and activity
+        matrices come from one query each, closing balances are the previous budget's
+        closing plus a cumulative sum of (assigned - activity) down the months, and the
+        results are written back with one executemany. Ready-to-assign is the same
+        cumulative sum over (Income subcategory totals - other assignments) per month.
+        Months without a budget carry balances through (their spending and income still
+        count). Does not commit.
+
+        Returns the number of budgets recomputed.
+        """
+        # Pending edits (e.g. a new assignment) must be visible to the queries below
+        db.flush()
+        start = db.execute(select(func.min(BUDGET_MONTH)).where(Budget.ledger_dirty.is_(True))).scalar()
+        if start is None:
+            return 0
+
+        previous = db.execute(
+            select(Budget.id, BUDGET_MONTH, Budget.ready_to_assign).where(BUDGET_MONTH < start)
+            .order_by(Budget.year.desc(), Budget.month.desc()).limit(1)
+        ).first()
+        first = previous[1] + 1 if previous else start
+        last = db.execute(select(func.max(BUDGET_MONTH))).scalar()
+
+        budgets = db.execute(select(Budget.id, BUDGET_MONTH).where(BUDGET_MONTH >= start)).all()
+        rows = db.execute(
+            select(SubcategoryBudget.id, BUDGET_MONTH, SubcategoryBudget.subcategory_id, SubcategoryBudget.monthly_assigned)
+            .join(Budget, Budget.id == SubcategoryBudget.budget_id)
+            .where(BUDGET_MONTH >= start)
+        ).all()
+        base = db.execute(
+            select(SubcategoryBudget.subcategory_id, SubcategoryBudget.closing_balance)
+            .where(SubcategoryBudget.budget_id == previous[0])
+        ).all() if previous else []
+
+        totals = self.monthly_totals(db, first, last)
+        income_ids = set(db.execute(
+            select(Subcategory.id).join(Category, Category.id == Subcategory.category_id)
+            .where(Category.name == INCOME_CATEGORY_NAME)
+        ).scalars())
+
+        subcategory_ids = sorted(
+            {row[2] for row in rows} | {row[0] for row in base} | {key[1] for key in totals}
+        )
+        column = {subcategory_id: i for i, subcategory_id in enumerate(subcategory_ids)}
+        shape = (last - first + 1, len(subcategory_ids))
+
+        assigned = np.zeros(shape)
+        if rows:
+            row_months = np.fromiter((row[1] - first for row in rows), dtype=np.int64, count=len(rows))
+            row_columns = np.fromiter((column[row[2]] for row in rows), dtype=np.int64, count=len(rows))
+            assigned[row_months, row_columns] = [row[3] for row in rows]
+
+        net_totals = np.zeros(shape)
+        for (index, subcategory_id), amount in totals.items():
+            net_totals[index - first, column[subcategory_id]] = amount
+        # Spending (outflows) is taken as the absolute of each month's net sum, as in BudgetService
+        activity = np.abs(net_totals)
+
+        opening = np.zeros(len(subcategory_ids))
+        for subcategory_id, closing_balance in base:
+            opening[column[subcategory_id]] = closing_balance
+
+        net = assigned - activity
+        closing = opening + np.cumsum(net, axis=0)
+        opening = closing - net
+
+        is_income = np.array([subcategory_id in income_ids for subcategory_id in subcategory_ids], dtype=bool)
+        income = net_totals[:, is_income].sum(axis=1)
+        ready_to_assign = (previous[2] if previous else 0.0) + np.cumsum(income - assigned[:, ~is_income].sum(axis=1))
+
+        if rows:
+            db.execute(update(SubcategoryBudget), [
+                {
+                    "id": row[0],
+                    "total_balance": float(opening[month, col]),
+                    "closing_balance": float(closing[month, col]),
+                }
+                for row, month, col in zip(rows, row_months.tolist(), row_columns.tolist())
+            ])
+        db.execute(update(Budget), [
+            {
+                "id": budget_id,
+                "income": float(income[index - first]),
+                "ready_to_assign": float(ready_to_assign[index - first]),
+                "ledger_dirty": False,
+            }
+            for budget_id, index in budgets
+        ])
+        recomputed = len(budgets)
+        # Bulk updates bypass loaded objects; reload balances on next access
+        db.expire_all()
+
+        logger.info(f"Recomputed budget ledger for {recomputed} months from {month_bounds(start)[0]:%b %Y}")
+        return recomputed
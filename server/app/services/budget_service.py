@@ -1,6 +1,7 @@
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func
-from typing import List, Optional, Dict
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from typing import List, Optional, Dict, Tuple
 from fastapi import HTTPException
 from datetime import datetime, timedelta
 from dateutil.relativedelta import relativedelta
@@ -9,15 +10,28 @@ import logging
 
 from app.models.budget import Budget, SubcategoryBudget
 from app.models.category import Category, Subcategory
-from app.models.transaction import Transaction
-from app.models.transaction_split import TransactionSplit
-from app.schemas.budget import BudgetCreate, BudgetUpdate, SubcategoryBudgetCreate, SubcategoryBudgetResponse
+from app.services.budget_ledger_service import BudgetLedgerService, month_index
+from app.services.funding_planner_service import FundingPlannerService
+from app.utils.transaction_lines import transaction_lines
+from app.schemas.budget import (
+    BudgetAssignmentBatch, BudgetCreate, BudgetUpdate, SubcategoryBudgetCreate, SubcategoryBudgetResponse
+)
 
 logger = logging.getLogger(__name__)
 
+MAX_BUDGET_RANGE_MONTHS = 24
+
 
 class BudgetService:
     """Service for managing budgets and subcategory budget allocations (envelope budgeting)."""
+
+    def __init__(
+        self,
+        ledger_service: Optional[BudgetLedgerService] = None,
+        funding_planner: Optional[FundingPlannerService] = None
+    ):
+        self.ledger_service = ledger_service or BudgetLedgerService()
+        self.funding_planner = funding_planner or FundingPlannerService()
     
     def get_all_budgets(self, db: Session) -> List[Budget]:
         """Get all budgets."""
@@ -35,12 +49,18 @@ class BudgetService:
         return query.filter(Budget.id == budget_id).first()
     
     def get_current_budget(self, db: Session, eager_load: bool = True) -> Optional[Budget]:
-        """Get or create the current month's budget with optional eager loading."""
+        """Get (creating it on first use) the current month's budget with optional eager loading."""
         now = datetime.utcnow()
         return self.get_budget_by_month(db, now.year, now.month, eager_load=eager_load)
     
     def get_budget_by_month(self, db: Session, year: int, month: int, eager_load: bool = True, auto_create: bool = True) -> Optional[Budget]:
-        """Get or optionally create a budget for a specific month/year."""
+        """
+        Get or optionally create a budget for a specific month/year.
+
+        Reading an existing budget never writes: its balances are kept current by the
+        rollover ledger when assignments or spending change. A missing month is
+        materialized once (see _materialize_budgets).
+        """
         query = db.query(Budget)
         if eager_load:
             query = query.options(
@@ -55,18 +75,56 @@ class BudgetService:
         ).first()
         
         if not budget and auto_create:
-            budget = self._create_monthly_budget(db, month, year)
-            if eager_load:
-                budget = self.get_budget_by_id(db, budget.id, eager_load=True)
-        else:
-            now = datetime.now()
-            if year > now.year or (year == now.year and month > now.month):
-                self._update_future_budget(db, budget)
+            self._materialize_budgets(db, [(year, month)])
+            budget = query.filter(
+                Budget.month == month,
+                Budget.year == year
+            ).first()
         
         return budget
     
+    def get_budget_range(self, db: Session, year: int, month: int, months: int) -> List[Budget]:
+        """
+        Budgets for `months` consecutive months starting at year/month, oldest first,
+        eager-loaded with one query. Missing months are materialized in one batch.
+        """
+        first = month_index(year, month)
+        keys = [(index // 12, index % 12 + 1) for index in range(first, first + months)]
+
+        def fetch() -> List[Budget]:
+            return db.query(Budget).options(
+                joinedload(Budget.subcategory_budgets)
+                .joinedload(SubcategoryBudget.subcategory)
+                .joinedload(Subcategory.category)
+            ).filter(tuple_(Budget.year, Budget.month).in_(keys)).order_by(Budget.year, Budget.month).all()
+
+        budgets = fetch()
+        if len(budgets) < len(keys):
+            found = {(budget.year, budget.month) for budget in budgets}
+            self._materialize_budgets(db, [key for key in keys if key not in found])
+            budgets = fetch()
+        return budgets
+
+    def get_spending_by_budget(self, db: Session, budgets: List[Budget]) -> Dict[int, Dict[int, float]]:
+        """
+        Spending per subcategory for each budget (budget id -> subcategory id -> amount),
+        from one grouped query across the whole span of months.
+        """
+        if not budgets:
+            return {}
+        indexes = {budget.id: month_index(budget.year, budget.month) for budget in budgets}
+        activity = self.ledger_service.monthly_activity(db, min(indexes.values()), max(indexes.values()))
+        return {
+            budget.id: {
+                row.subcategory_id: activity.get((indexes[budget.id], row.subcategory_id), 0.0)
+                for row in budget.subcategory_budgets
+            }
+            for budget in budgets
+        }
+
     def create_budget(self, db: Session, budget_data: BudgetCreate) -> Budget:
         """Create a new budget with subcategory allocations."""
+        self._ensure_month_available(db, budget_data.year, budget_data.month)
         db_budget = Budget(
             name=budget_data.name,
             month=budget_data.month,
@@ -94,6 +152,8 @@ class BudgetService:
             )
             db.add(db_subcat_budget)
         
+        # New budgets start dirty, so this fills in their rollover and anything after them
+        self.ledger_service.recompute(db)
         db.commit()
         db_budget = self.get_budget_by_id(db, db_budget.id, eager_load=True)
         logger.info(f"Created budget: {db_budget.name} (ID: {db_budget.id})")
@@ -111,10 +171,21 @@ class BudgetService:
             return None
         
         update_data = budget_data.model_dump(exclude_unset=True)
+        previous_start = db_budget.start_date
+        year = update_data.get("year", db_budget.year)
+        month = update_data.get("month", db_budget.month)
+        if (year, month) != (db_budget.year, db_budget.month):
+            self._ensure_month_available(db, year, month)
         
         for field, value in update_data.items():
             setattr(db_budget, field, value)
         
+        if db_budget.start_date != previous_start:
+            # Moving a month changes the rollover chain on both sides of the move
+            db_budget.ledger_dirty = True
+            db.flush()
+            self.ledger_service.mark_dirty(db, min(previous_start, db_budget.start_date))
+            self.ledger_service.recompute(db)
         db.commit()
         db_budget = self.get_budget_by_id(db, db_budget.id, eager_load=True)
         logger.info(f"Updated budget: {db_budget.name} (ID: {db_budget.id})")
@@ -126,7 +197,12 @@ class BudgetService:
         if not db_budget:
             return False
         
+        start_date = db_budget.start_date
         db.delete(db_budget)
+        db.flush()
+        # Later months now roll over from the month before the deleted one
+        self.ledger_service.mark_dirty(db, start_date)
+        self.ledger_service.recompute(db)
         db.commit()
         logger.info(f"Deleted budget ID: {budget_id}")
         return True
@@ -151,63 +227,123 @@ class BudgetService:
         if not db_subcat_budget:
             return None
         
-        db_subcat_budget.monthly_assigned = monthly_assigned
-        db.commit()
+        if db_subcat_budget.monthly_assigned != monthly_assigned:
+            db_subcat_budget.monthly_assigned = monthly_assigned
+            db_subcat_budget.budget.ledger_dirty = True
+            self.ledger_service.recompute(db)
+            db.commit()
         db.refresh(db_subcat_budget)
         return db_subcat_budget
     
+    def apply_assignment_batch(
+        self,
+        db: Session,
+        budget_id: int,
+        batch: BudgetAssignmentBatch
+    ) -> Optional[Budget]:
+        """
+        Apply many assignment and target changes to a budget in one transaction.
+
+        Copy-from-month, assign-to-targets and explicit changes are applied in that
+        order (see BudgetAssignmentBatch), so explicit changes win. The rollover ledger
+        is recomputed once, and only if an assigned amount actually changed.
+        """
+        db_budget = self.get_budget_by_id(db, budget_id, eager_load=False)
+        if not db_budget:
+            return None
+        rows = {row.id: row for row in db_budget.subcategory_budgets}
+
+        unknown = [change.subcategory_budget_id for change in batch.changes if change.subcategory_budget_id not in rows]
+        if unknown:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Subcategory budgets not found in budget {budget_id}: {', '.join(map(str, unknown))}"
+            )
+
+        assigned_before = {row_id: row.monthly_assigned for row_id, row in rows.items()}
+
+        if batch.copy_from:
+            source = db.query(Budget).filter(
+                Budget.year == batch.copy_from.year,
+                Budget.month == batch.copy_from.month
+            ).first()
+            if not source:
+                raise HTTPException(
+                    status_code=404,
+                    detail=f"Budget not found for {batch.copy_from.year}/{batch.copy_from.month}"
+                )
+            source_rows = {row.subcategory_id: row for row in source.subcategory_budgets}
+            for row in rows.values():
+                source_row = source_rows.get(row.subcategory_id)
+                if source_row:
+                    row.monthly_assigned = source_row.monthly_assigned
+                    if batch.copy_targets:
+                        row.monthly_target = source_row.monthly_target
+
+        if batch.assign_to_targets:
+            for row in rows.values():
+                if row.monthly_target > 0:
+                    row.monthly_assigned = row.monthly_target
+
+        for change in batch.changes:
+            row = rows[change.subcategory_budget_id]
+            if change.monthly_assigned is not None:
+                row.monthly_assigned = change.monthly_assigned
+            if change.monthly_target is not None:
+                row.monthly_target = change.monthly_target
+
+        changed = sum(1 for row_id, row in rows.items() if row.monthly_assigned != assigned_before[row_id])
+        if changed:
+            db_budget.ledger_dirty = True
+            self.ledger_service.recompute(db)
+        db.commit()
+        logger.info(f"Applied assignment batch to budget {budget_id}: {changed} assignments changed")
+        return self.get_budget_by_id(db, budget_id, eager_load=True)
+
     def get_spending_by_subcategory(
         self,
         db: Session,
         budget_id: int
     ) -> Dict[int, float]:
-        """Get current spending for each subcategory in a budget."""
-        budget = self.get_budget_by_id(db, budget_id, eager_load=False)
+        """
+        Get current spending for each subcategory in a budget.
+
+        One grouped, split-aware query over the budget's month returns every
+        subcategory total at once; subcategories without activity get 0.0.
+        """
+        budget = db.get(Budget, budget_id)
         if not budget:
             return {}
-        
-        spending = {}
-        for subcat_budget in budget.subcategory_budgets:
-            subcat_id = subcat_budget.subcategory_id
-
-            # Sum amounts for transactions directly categorized to the subcategory
-            query = db.query(func.sum(Transaction.amount)).filter(
-                Transaction.subcategory_id == subcat_id,
-                Transaction.posted >= budget.start_date,
-                Transaction.is_transfer == False
-            )
-            if budget.end_date:
-                query = query.filter(Transaction.posted <= budget.end_date)
 
-            direct_total = query.scalar() or 0.0
+        lines = transaction_lines(budget.start_date, budget.end_date)
+        totals = select(
+            lines.c.subcategory_id,
+            func.sum(lines.c.amount).label("total")
+        ).group_by(lines.c.subcategory_id).subquery()
 
-            # Sum amounts for splits that allocate to this subcategory
-            split_query = db.query(func.sum(TransactionSplit.amount)).join(
-                Transaction, Transaction.id == TransactionSplit.transaction_id
-            ).filter(
-                TransactionSplit.subcategory_id == subcat_id,
-                Transaction.posted >= budget.start_date,
-                Transaction.is_transfer == False
-            )
-            if budget.end_date:
-                split_query = split_query.filter(Transaction.posted <= budget.end_date)
+        rows = db.execute(
+            select(SubcategoryBudget.subcategory_id, totals.c.total).outerjoin(
+                totals, totals.c.subcategory_id == SubcategoryBudget.subcategory_id
+            ).where(SubcategoryBudget.budget_id == budget_id)
+        ).all()
 
-            splits_total = split_query.scalar() or 0.0
+        # We're dealing with spending (outflows) so take absolute of negative sums
+        return {subcat_id: abs(float(total or 0.0)) for subcat_id, total in rows}
 
-            # We're dealing with spending (outflows) so take absolute of negative sums
-            combined = float(direct_total or 0.0) + float(splits_total or 0.0)
-            total_spent = abs(combined)
-            spending[subcat_id] = total_spent
-        
-        return spending
-    
     def build_subcategory_budget_responses(
         self,
         budget: Budget,
         spending_by_subcategory: Dict[int, float]
     ) -> List[SubcategoryBudgetResponse]:
-        """Build subcategory budget response list from budget with eager-loaded relationships."""
+        """
+        Build subcategory budget response list from budget with eager-loaded relationships,
+        including each subcategory's funding plan (see FundingPlannerService).
+        """
         subcategory_budgets = []
+        plans = {
+            plan.subcategory_budget_id: plan
+            for plan in self.funding_planner.plan(budget, spending_by_subcategory)
+        }
         
         for subcat_budget in budget.subcategory_budgets:
             subcategory = subcat_budget.subcategory
@@ -215,6 +351,7 @@ class BudgetService:
                 category = subcategory.category
                 monthly_activity = spending_by_subcategory.get(subcat_budget.subcategory_id, 0.0)
                 monthly_available = subcat_budget.monthly_target - monthly_activity
+                plan = plans[subcat_budget.id]
                 
                 subcategory_budgets.append(
                     SubcategoryBudgetResponse(
@@ -226,8 +363,12 @@ class BudgetService:
                         monthly_assigned=subcat_budget.monthly_assigned,
                         monthly_target=subcat_budget.monthly_target,
                         total_balance=subcat_budget.total_balance,
+                        closing_balance=subcat_budget.closing_balance,
                         monthly_activity=monthly_activity,
                         monthly_available=monthly_available,
+                        projected_activity=plan.projected_activity,
+                        still_needed=plan.still_needed,
+                        suggested_allocation=plan.allocation,
                         created_at=subcat_budget.created_at,
                         updated_at=subcat_budget.updated_at
                     )
@@ -235,89 +376,60 @@ class BudgetService:
         
         return subcategory_budgets
     
-    def _update_future_budget(self, db: Session, future_budget: Budget):
-        all_subcategories = db.query(Subcategory).all()
-        
-        # Calculate previous month/year
-        if future_budget.month == 1:
-            prev_month = 12
-            prev_year = future_budget.year - 1
-        else:
-            prev_month = future_budget.month - 1
-            prev_year = future_budget.year
-        
-        previous_budget = db.query(Budget).filter(
-            Budget.month == prev_month,
-            Budget.year == prev_year
-        ).first()
-        
-        previous_balances = {}
-        if previous_budget:
-            spending = self.get_spending_by_subcategory(db, previous_budget.id)
-            for prev_subcat in previous_budget.subcategory_budgets:
-                monthly_activity = spending.get(prev_subcat.subcategory_id, 0.0)
-                total_balance = prev_subcat.total_balance + prev_subcat.monthly_assigned - monthly_activity
-                previous_balances[prev_subcat.subcategory_id] = total_balance
-        
-        for subcategory in all_subcategories:
-            prev_balance = previous_balances.get(subcategory.id, 0.0)
-            db_subcat_budget = db.query(SubcategoryBudget).filter(SubcategoryBudget.budget_id == future_budget.id, SubcategoryBudget.subcategory_id == subcategory.id).first()
-            db_subcat_budget.total_balance=prev_balance
-        
-        db.commit()
-        logger.info(f"Auto-updated monthly budget: {future_budget.name} ({future_budget.month}/{future_budget.year})")
+    def _ensure_month_available(self, db: Session, year: int, month: int) -> None:
+        """Reject a second budget for a month, which the (year, month) constraint would refuse."""
+        if db.query(Budget.id).filter(Budget.year == year, Budget.month == month).first():
+            raise HTTPException(status_code=400, detail=f"A budget for {month}/{year} already exists")
 
-    def _create_monthly_budget(self, db: Session, month: int, year: int) -> Budget:
-        """Create a new monthly budget with rollover from previous month."""
-        month_start = datetime(year, month, 1)
-        budget_name = month_start.strftime("%b %Y")
-        
-        db_budget = Budget(
-            name=budget_name,
-            month=month,
-            year=year
-        )
-        db.add(db_budget)
-        db.flush()
-        
-        all_subcategories = db.query(Subcategory).all()
-        
-        # Calculate previous month/year
-        if month == 1:
-            prev_month = 12
-            prev_year = year - 1
-        else:
-            prev_month = month - 1
-            prev_year = year
-        
-        previous_budget = db.query(Budget).filter(
-            Budget.month == prev_month,
-            Budget.year == prev_year
-        ).first()
-        
-        previous_balances = {}
-        if previous_budget:
-            spending = self.get_spending_by_subcategory(db, previous_budget.id)
-            for prev_subcat in previous_budget.subcategory_budgets:
-                monthly_activity = spending.get(prev_subcat.subcategory_id, 0.0)
-                monthly_available = prev_subcat.total_balance + prev_subcat.monthly_assigned - monthly_activity
-                previous_balances[prev_subcat.subcategory_id] = monthly_available
-        
-        for subcategory in all_subcategories:
-            prev_balance = previous_balances.get(subcategory.id, 0.0)
-            
-            db_subcat_budget = SubcategoryBudget(
-                budget_id=db_budget.id,
-                subcategory_id=subcategory.id,
-                monthly_assigned=0.0,
-                monthly_target=0.0,
-                total_balance=prev_balance
-            )
-            db.add(db_subcat_budget)
-        
+    def _materialize_budgets(self, db: Session, months: List[Tuple[int, int]]) -> None:
+        """
+        Create empty budgets, with a row per subcategory, for any of the given
+        (year, month)s that don't exist yet, and fill in their rollover from the ledger.
+
+        Budgets are inserted with ON CONFLICT DO NOTHING against the (year, month)
+        constraint, so concurrent requests for the same month create it exactly once.
+        Commits only if something was created.
+        """
+        now = datetime.utcnow()
+        new_budget_ids = db.execute(
+            sqlite_insert(Budget.__table__).on_conflict_do_nothing(
+                index_elements=["year", "month"]
+            ).returning(Budget.__table__.c.id),
+            [
+                {
+                    "name": datetime(year, month, 1).strftime("%b %Y"),
+                    "year": year,
+                    "month": month,
+                    "ledger_dirty": True,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for year, month in months
+            ]
+        ).scalars().all()
+        if not new_budget_ids:
+            return
+
+        subcategory_ids = db.execute(select(Subcategory.id)).scalars().all()
+        if subcategory_ids:
+            db.execute(SubcategoryBudget.__table__.insert(), [
+                {
+                    "budget_id": budget_id,
+                    "subcategory_id": subcategory_id,
+                    "monthly_assigned": 0.0,
+                    "monthly_target": 0.0,
+                    "total_balance": 0.0,
+                    "closing_balance": 0.0,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for budget_id in new_budget_ids
+                for subcategory_id in subcategory_ids
+            ])
+
+        self.ledger_service.recompute(db)
         db.commit()
-        logger.info(f"Auto-created monthly budget: {budget_name} ({month}/{year})")
-        return db_budget
+        logger.info(f"Auto-created {len(new_budget_ids)} monthly budget(s) among {', '.join(f'{m}/{y}' for y, m in months)}")
     
     def update_monthly_target(
         self,
@@ -0,0 +1,189 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import select
+from typing import List, NamedTuple, Optional
+from fastapi import HTTPException
+from datetime import datetime
+import logging
+import threading
+
+import numpy as np
+
+from app.core.cache import data_version
+from app.models.budget import Budget, SubcategoryBudget
+from app.models.category import Category, Subcategory
+from app.schemas.budget import BudgetScenario, BudgetSimulationResponse, SimulatedSubcategory
+from app.services.budget_ledger_service import BudgetLedgerService, BUDGET_MONTH, INCOME_CATEGORY_NAME, month_index
+
+logger = logging.getLogger(__name__)
+
+MAX_SIMULATION_MONTHS = 24
+# Complete months averaged for expected spending and income
+HISTORY_MONTHS = 6
+
+
+class SimulationBaseline(NamedTuple):
+    """Everything a scenario starts from, as arrays over (months, subcategories)."""
+    version: int
+    start: int                        # month_index of the current month
+    subcategory_ids: List[int]        # Non-income subcategories, the simulated columns
+    subcategory_names: List[str]
+    category_names: List[str]
+    opening: np.ndarray               # Balance at the start of the current month
+    assigned: np.ndarray              # (MAX_SIMULATION_MONTHS, subcategories)
+    average_spending: np.ndarray
+    month_to_date: np.ndarray         # Spending so far in the current month
+    ready_to_assign: float            # Carried in from before the current month
+    average_income: float
+
+
+class BudgetSimulationService:
+    """
+    What-if simulation of subcategory balances over the coming months.
+
+    Reads current budgets and spending history once per data version into a
+    SimulationBaseline; each scenario is then pure NumPy over months x subcategories
+    and never touches the database, so sliders can re-evaluate on every move.
+    """
+
+    def __init__(self, ledger_service: Optional[BudgetLedgerService] = None):
+        self.ledger_service = ledger_service or BudgetLedgerService()
+        self._lock = threading.Lock()
+        self._baseline: Optional[SimulationBaseline] = None
+
+    def get_baseline(self, db: Session) -> SimulationBaseline:
+        """The cached baseline, reloaded after any committed write or a change of month."""
+        now = datetime.utcnow()
+        start = month_index(now.year, now.month)
+        with self._lock:
+            baseline = self._baseline
+            if baseline is None or baseline.version != data_version.current or baseline.start != start:
+                baseline = self._load_baseline(db, start)
+                self._baseline = baseline
+            return baseline
+
+    def _load_baseline(self, db: Session, start: int) -> SimulationBaseline:
+        version = data_version.current
+        subcategories = db.execute(
+            select(Subcategory.id, Subcategory.name, Category.name)
+            .join(Category, Category.id == Subcategory.category_id)
+            .where(Category.name != INCOME_CATEGORY_NAME)
+            .order_by(Category.name, Subcategory.name)
+        ).all()
+        income_ids = set(db.execute(
+            select(Subcategory.id).join(Category, Category.id == Subcategory.category_id)
+            .where(Category.name == INCOME_CATEGORY_NAME)
+        ).scalars())
+        column = {row[0]: i for i, row in enumerate(subcategories)}
+        count = len(subcategories)
+
+        # The latest budget up to this month seeds balances and the assignments that repeat
+        anchor = db.execute(
+            select(Budget.id, BUDGET_MONTH).where(BUDGET_MONTH <= start)
+            .order_by(Budget.year.desc(), Budget.month.desc()).limit(1)
+        ).first()
+        previous = db.execute(
+            select(Budget.ready_to_assign).where(BUDGET_MONTH < start)
+            .order_by(Budget.year.desc(), Budget.month.desc()).limit(1)
+        ).scalar()
+
+        opening = np.zeros(count)
+        repeated = np.zeros(count)
+        if anchor:
+            for subcategory_id, total_balance, closing_balance, assigned in db.execute(
+                select(
+                    SubcategoryBudget.subcategory_id, SubcategoryBudget.total_balance,
+                    SubcategoryBudget.closing_balance, SubcategoryBudget.monthly_assigned
+                ).where(SubcategoryBudget.budget_id == anchor[0])
+            ):
+                if subcategory_id in column:
+                    # A budget for an earlier month: its closing balance is this month's opening
+                    opening[column[subcategory_id]] = total_balance if anchor[1] == start else closing_balance
+                    repeated[column[subcategory_id]] = assigned
+
+        assigned = np.tile(repeated, (MAX_SIMULATION_MONTHS, 1))
+        for subcategory_id, index, amount in db.execute(
+            select(SubcategoryBudget.subcategory_id, BUDGET_MONTH, SubcategoryBudget.monthly_assigned)
+            .join(Budget, Budget.id == SubcategoryBudget.budget_id)
+            .where(BUDGET_MONTH >= start, BUDGET_MONTH < start + MAX_SIMULATION_MONTHS)
+        ):
+            if subcategory_id in column:
+                assigned[index - start, column[subcategory_id]] = amount
+
+        totals = self.ledger_service.monthly_totals(db, start - HISTORY_MONTHS, start)
+        history = np.zeros((HISTORY_MONTHS + 1, count))
+        income = np.zeros(HISTORY_MONTHS + 1)
+        for (index, subcategory_id), total in totals.items():
+            if subcategory_id in income_ids:
+                income[index - start + HISTORY_MONTHS] += total
+            elif subcategory_id in column:
+                history[index - start + HISTORY_MONTHS, column[subcategory_id]] = abs(total)
+
+        logger.info(f"Loaded budget simulation baseline for {count} subcategories")
+        return SimulationBaseline(
+            version=version,
+            start=start,
+            subcategory_ids=[row[0] for row in subcategories],
+            subcategory_names=[row[1] for row in subcategories],
+            category_names=[row[2] for row in subcategories],
+            opening=opening,
+            assigned=assigned,
+            average_spending=history[:HISTORY_MONTHS].mean(axis=0),
+            month_to_date=history[HISTORY_MONTHS],
+            ready_to_assign=float(previous or 0.0),
+            average_income=float(income[:HISTORY_MONTHS].mean()),
+        )
+
+    def simulate(self, db: Session, scenario: BudgetScenario) -> BudgetSimulationResponse:
+        """
+        Project closing balances, overspending and ready-to-assign for scenario.months
+        months from the current one. Spending follows the last HISTORY_MONTHS months'
+        average (at least what was already spent this month), assignments repeat the
+        latest budget unless a later month is already budgeted. Never writes.
+        """
+        if scenario.months < 1 or scenario.months > MAX_SIMULATION_MONTHS:
+            raise HTTPException(status_code=400, detail=f"months must be between 1 and {MAX_SIMULATION_MONTHS}")
+        baseline = self.get_baseline(db)
+        column = {subcategory_id: i for i, subcategory_id in enumerate(baseline.subcategory_ids)}
+        requested = [change.subcategory_id for change in scenario.assignment_changes]
+        requested += [bill.subcategory_id for bill in scenario.recurring_bills]
+        unknown = sorted({subcategory_id for subcategory_id in requested if subcategory_id not in column})
+        if unknown:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Subcategories not found or not budgetable: {', '.join(map(str, unknown))}"
+            )
+        if any(bill.interval_months < 1 or bill.start_month < 0 for bill in scenario.recurring_bills):
+            raise HTTPException(status_code=400, detail="Bills need interval_months >= 1 and start_month >= 0")
+
+        months = scenario.months
+        assigned = baseline.assigned[:months].copy()
+        for change in scenario.assignment_changes:
+            assigned[:, column[change.subcategory_id]] = change.monthly_assigned
+
+        spending = np.tile(baseline.average_spending, (months, 1))
+        spending[0] = np.maximum(spending[0], baseline.month_to_date)
+        for bill in scenario.recurring_bills:
+            spending[bill.start_month:months:bill.interval_months, column[bill.subcategory_id]] += bill.amount
+
+        balances = baseline.opening + np.cumsum(assigned - spending, axis=0)
+        income = baseline.average_income + scenario.income_change
+        ready_to_assign = baseline.ready_to_assign + np.cumsum(income - assigned.sum(axis=1))
+        overspent = balances < 0
+
+        labels = [f"{index // 12}-{index % 12 + 1:02d}" for index in range(baseline.start, baseline.start + months)]
+        first_overspent = np.where(overspent.any(axis=0), overspent.argmax(axis=0), -1)
+        return BudgetSimulationResponse(
+            months=labels,
+            subcategories=[
+                SimulatedSubcategory(
+                    subcategory_id=subcategory_id,
+                    category_name=baseline.category_names[i],
+                    subcategory_name=baseline.subcategory_names[i],
+                    balances=column_balances,
+                    first_overspent_month=labels[first_overspent[i]] if first_overspent[i] >= 0 else None,
+                )
+                for i, (subcategory_id, column_balances) in enumerate(zip(baseline.subcategory_ids, balances.T.tolist()))
+            ],
+            ready_to_assign=ready_to_assign.tolist(),
+            overspent_total=(-np.where(overspent, balances, 0.0).sum(axis=1)).tolist(),
+        )
@@ -0,0 +1,171 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import select
+from typing import IO, Iterable, Iterator, List, Optional, Sequence
+from datetime import datetime
+import csv
+import io
+import logging
+
+from app.models.account import Account
+from app.models.category import Category, Subcategory
+from app.models.transaction import Transaction
+from app.utils.transaction_lines import transaction_lines
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = ("csv", "parquet")
+EXPORT_MEDIA_TYPES = {"csv": "text/csv", "parquet": "application/vnd.apache.parquet"}
+
+# Rows fetched from the cursor per round trip; also the size of each Parquet row group
+EXPORT_BATCH_SIZE = 10000
+
+EXPORT_COLUMNS = (
+    "id", "bank_transaction_id", "date", "posted", "account_id", "account_name", "name", "payee",
+    "memo", "amount", "transaction_amount", "is_split", "category", "subcategory", "pending", "is_transfer",
+)
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that hands out what was written since the last drain."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class ExportService:
+    """Service for streaming transaction exports (one row per split line) as CSV or Parquet."""
+
+    def _export_query(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        account_ids: Optional[Iterable[str]] = None,
+        include_transfers: bool = True
+    ):
+        lines = transaction_lines(start_date, end_date, include_transfers=include_transfers, account_ids=account_ids)
+        return select(
+            lines.c.transaction_id.label("id"),
+            Transaction.transaction_id.label("bank_transaction_id"),
+            lines.c.effective_date.label("date"),
+            lines.c.posted.label("posted"),
+            lines.c.account_id.label("account_id"),
+            Account.name.label("account_name"),
+            Transaction.name.label("name"),
+            Transaction.payee.label("payee"),
+            Transaction.memo.label("memo"),
+            lines.c.amount.label("amount"),
+            Transaction.amount.label("transaction_amount"),
+            Transaction.is_split.label("is_split"),
+            Category.name.label("category"),
+            Subcategory.name.label("subcategory"),
+            Transaction.pending.label("pending"),
+            lines.c.is_transfer.label("is_transfer"),
+        ).join(
+            Transaction, Transaction.id == lines.c.transaction_id
+        ).outerjoin(
+            Account, Account.id == lines.c.account_id
+        ).outerjoin(
+            Subcategory, Subcategory.id == lines.c.subcategory_id
+        ).outerjoin(
+            Category, Category.id == Subcategory.category_id
+        ).order_by(lines.c.effective_date, lines.c.transaction_id)
+
+    def iter_batches(
+        self,
+        db: Session,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        account_ids: Optional[Iterable[str]] = None,
+        include_transfers: bool = True,
+        batch_size: int = EXPORT_BATCH_SIZE
+    ) -> Iterator[Sequence[tuple]]:
+        """Export rows (in EXPORT_COLUMNS order) read from the cursor batch_size at a time."""
+        query = self._export_query(start_date, end_date, account_ids, include_transfers)
+        result = db.execute(query.execution_options(yield_per=batch_size))
+        for partition in result.partitions():
+            yield partition
+
+    def iter_csv(self, db: Session, **filters) -> Iterator[bytes]:
+        """CSV export, one encoded chunk per batch of rows."""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(EXPORT_COLUMNS)
+        for batch in self.iter_batches(db, **filters):
+            writer.writerows(
+                (*row[:2], row.date.isoformat(), row.posted.isoformat(), *row[4:]) for row in batch
+            )
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue().encode()
+
+    def iter_parquet(self, db: Session, **filters) -> Iterator[bytes]:
+        """Parquet export written one row group per batch, yielding the bytes as they are produced."""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        schema = pa.schema([
+            ("id", pa.int64()),
+            ("bank_transaction_id", pa.string()),
+            ("date", pa.timestamp("us")),
+            ("posted", pa.timestamp("us")),
+            ("account_id", pa.string()),
+            ("account_name", pa.string()),
+            ("name", pa.string()),
+            ("payee", pa.string()),
+            ("memo", pa.string()),
+            ("amount", pa.float64()),
+            ("transaction_amount", pa.float64()),
+            ("is_split", pa.bool_()),
+            ("category", pa.string()),
+            ("subcategory", pa.string()),
+            ("pending", pa.bool_()),
+            ("is_transfer", pa.bool_()),
+        ])
+        sink = _ChunkSink()
+        writer = pq.ParquetWriter(sink, schema, compression="zstd")
+        try:
+            for batch in self.iter_batches(db, **filters):
+                columns = list(zip(*batch))
+                writer.write_table(pa.Table.from_arrays(
+                    [pa.array(values, type=field.type) for values, field in zip(columns, schema)],
+                    schema=schema
+                ))
+                yield sink.drain()
+        finally:
+            writer.close()
+        yield sink.drain()
+
+    def iter_export(self, db: Session, file_format: str = "csv", **filters) -> Iterator[bytes]:
+        if file_format not in EXPORT_FORMATS:
+            raise ValueError(f"format must be one of {', '.join(EXPORT_FORMATS)}")
+        if file_format == "parquet":
+            return self.iter_parquet(db, **filters)
+        return self.iter_csv(db, **filters)
+
+    def write_export(self, db: Session, out: IO[bytes], file_format: str = "csv", **filters) -> int:
+        """Write an export to a binary file. Returns the number of bytes written."""
+        written = 0
+        for chunk in self.iter_export(db, file_format, **filters):
+            out.write(chunk)
+            written += len(chunk)
+        return written
@@ -0,0 +1,176 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import func
+from typing import List, Optional, Tuple
+from datetime import date, datetime
+import logging
+
+import numpy as np
+
+from app.models.account import Account
+from app.models.budget import Budget, SubcategoryBudget
+from app.models.recurring_series import RecurringSeries
+from app.schemas.account import AccountType
+from app.schemas.analytics import ForecastPoint, ForecastResponse
+from app.services.recurring_service import still_expected
+from app.utils.transaction_lines import transaction_lines
+
+logger = logging.getLogger(__name__)
+
+# Accounts whose balances make up spendable cash
+LIQUID_ACCOUNT_TYPES = (AccountType.CHECKING, AccountType.SAVINGS, AccountType.CREDIT)
+
+MAX_FORECAST_DAYS = 366
+
+_PERIOD_STEPS = {
+    "weekly": ("D", 7),
+    "biweekly": ("D", 14),
+    "monthly": ("M", 1),
+    "annual": ("M", 12),
+}
+
+
+def series_occurrences(series: RecurringSeries, start: np.datetime64, end: np.datetime64) -> np.ndarray:
+    """
+    Expected dates of a series in [start, end), as datetime64[D].
+    Monthly and annual series keep their day of month (clamped to the month's length).
+    Overdue occurrences collapse into a single one on start: a late bill is paid
+    once, not once for every period it is late.
+    """
+    first = np.datetime64(series.next_expected_date.date(), "D")
+    unit, step = _PERIOD_STEPS[series.period]
+    span_days = int((end - min(first, start)) / np.timedelta64(1, "D"))
+
+    if unit == "D":
+        dates = first + np.arange(span_days // step + 1) * step
+    else:
+        months = np.datetime64(first, "M") + np.arange(span_days // (28 * step) + 2) * step
+        month_starts = months.astype("datetime64[D]")
+        month_lengths = ((months + 1).astype("datetime64[D]") - month_starts).astype(np.int64)
+        day = int((first - np.datetime64(first, "M").astype("datetime64[D]")) / np.timedelta64(1, "D")) + 1
+        dates = month_starts + np.minimum(day, month_lengths) - 1
+
+    overdue = dates < start
+    if overdue.any():
+        dates = np.concatenate([[start], dates[~overdue]])
+    return dates[dates < end]
+
+
+class ForecastService:
+    """Service projecting daily balances from recurring series and budget targets."""
+
+    def _month_to_date_spending(self, db: Session, month_start: datetime) -> dict:
+        """Net spending (positive) per subcategory since the start of the month."""
+        lines = transaction_lines(start_date=month_start)
+        rows = db.query(
+            lines.c.subcategory_id, func.sum(lines.c.amount)
+        ).group_by(lines.c.subcategory_id).all()
+        return {sub_id: max(-float(total or 0.0), 0.0) for sub_id, total in rows if sub_id is not None}
+
+    def _budget_targets(self, db: Session, today: date) -> List[Tuple[int, float]]:
+        """(subcategory_id, monthly_target) of the current month's budget, if it exists."""
+        return db.query(
+            SubcategoryBudget.subcategory_id, SubcategoryBudget.monthly_target
+        ).join(Budget).filter(
+            Budget.year == today.year,
+            Budget.month == today.month,
+            SubcategoryBudget.monthly_target > 0
+        ).all()
+
+    def _budgeted_spending(
+        self,
+        db: Session,
+        grid: np.ndarray,
+        today: date,
+        excluded_subcategories: set
+    ) -> np.ndarray:
+        """
+        Daily outflow from budget targets: what is left of this month's targets is spread
+        over the remaining days, and later months spend their full target evenly.
+        Subcategories covered by a recurring bill are excluded (the bill is projected instead).
+        """
+        targets = [(sub_id, target) for sub_id, target in self._budget_targets(db, today)
+                   if sub_id not in excluded_subcategories]
+        daily = np.zeros(len(grid))
+        if not targets:
+            return daily
+
+        month_start = datetime(today.year, today.month, 1)
+        spent = self._month_to_date_spending(db, month_start)
+        monthly_total = sum(target for _, target in targets)
+        remaining_this_month = sum(max(target - spent.get(sub_id, 0.0), 0.0) for sub_id, target in targets)
+
+        months = grid.astype("datetime64[M]")
+        month_lengths = ((months + 1).astype("datetime64[D]") - months.astype("datetime64[D]")).astype(np.int64)
+        current = months == np.datetime64(month_start.date(), "M")
+
+        daily[~current] = monthly_total / month_lengths[~current]
+        days_left = np.count_nonzero(current)
+        if days_left:
+            daily[current] = remaining_this_month / days_left
+        return -daily
+
+    def get_forecast(self, db: Session, days: int = 30, today: Optional[date] = None) -> ForecastResponse:
+        """Project end-of-day liquid balance for each of the next `days` days (today first)."""
+        today = today or date.today()
+        start = np.datetime64(today, "D")
+        grid = start + np.arange(days)
+        end = grid[-1] + 1
+
+        accounts = db.query(Account).filter(Account.type.in_([int(t) for t in LIQUID_ACCOUNT_TYPES])).all()
+        account_ids = {account.id for account in accounts}
+        starting_balance = sum(account.signed_balance for account in accounts)
+
+        income = np.zeros(days)
+        bills = np.zeros(days)
+        next_payday = None
+        bill_subcategories = set()
+        # Judged by date rather than the stored flag, which only a sync refreshes
+        series_list = db.query(RecurringSeries).filter(still_expected(today)).all()
+        for series in series_list:
+            if series.account_id not in account_ids:
+                continue
+            occurrences = series_occurrences(series, start, end)
+            if not len(occurrences):
+                continue
+            offsets = ((occurrences - start) / np.timedelta64(1, "D")).astype(np.int64)
+            flows = np.bincount(offsets, minlength=days) * series.average_amount
+            if series.is_income:
+                income += flows
+                first = occurrences.min().astype(date)
+                next_payday = first if next_payday is None or first < next_payday else next_payday
+            else:
+                bills += flows
+                if series.subcategory_id is not None:
+                    bill_subcategories.add(series.subcategory_id)
+
+        budgeted = self._budgeted_spending(db, grid, today, bill_subcategories)
+        balances = starting_balance + np.cumsum(income + bills + budgeted)
+
+        lowest = int(balances.argmin())
+        lowest_before_payday = None
+        if next_payday is not None:
+            payday_offset = (next_payday - today).days
+            # The balance on the morning of payday is the previous day's close
+            window = balances[:payday_offset] if payday_offset > 0 else np.array([starting_balance])
+            lowest_before_payday = float(min(window.min(), starting_balance))
+
+        dates = grid.astype(date)
+        return ForecastResponse(
+            days=days,
+            account_ids=sorted(account_ids),
+            starting_balance=starting_balance,
+            points=[
+                ForecastPoint(
+                    date=dates[i],
+                    balance=float(balances[i]),
+                    recurring_income=float(income[i]),
+                    recurring_bills=float(bills[i]),
+                    budgeted_spending=float(budgeted[i])
+                )
+                for i in range(days)
+            ],
+            lowest_balance=float(balances[lowest]),
+            lowest_balance_date=dates[lowest],
+            next_payday=next_payday,
+            lowest_balance_before_payday=lowest_before_payday
+        )
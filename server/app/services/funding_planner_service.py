@@ -0,0 +1,107 @@
+from typing import Dict, List, Optional
+from datetime import datetime
+import logging
+
+import numpy as np
+
+from app.models.budget import Budget
+from app.schemas.budget import SubcategoryFundingPlan
+from app.services.budget_ledger_service import INCOME_CATEGORY_NAME
+
+logger = logging.getLogger(__name__)
+
+# Spending pace is not extrapolated from less than this share of a month, so a
+# single purchase on the 1st doesn't project a month of thirty of them
+MIN_PACE_FRACTION = 0.25
+
+
+class FundingPlannerService:
+    """
+    Works out how much each subcategory of a budget still needs this month and how
+    available funds should be spread across those needs.
+
+    Works purely on a loaded budget (rows with their subcategory and category) and
+    the spending map the budget endpoints already have, so it adds no queries.
+    """
+
+    def month_elapsed(self, budget: Budget, now: Optional[datetime] = None) -> float:
+        """Share of the budget's month that has passed: 0 for future months, 1 for past ones."""
+        now = now or datetime.utcnow()
+        if now <= budget.start_date:
+            return 0.0
+        if now >= budget.end_date:
+            return 1.0
+        return (now - budget.start_date) / (budget.end_date - budget.start_date)
+
+    def plan(
+        self,
+        budget: Budget,
+        spending_by_subcategory: Dict[int, float],
+        funds: Optional[float] = None,
+        now: Optional[datetime] = None
+    ) -> List[SubcategoryFundingPlan]:
+        """
+        Needs and allocations for every subcategory of the budget in one vectorized pass.
+
+        With funded = opening balance + assigned, a subcategory needs, in priority order:
+        what it has overspent, what is still missing to reach its monthly target, and
+        what spending at the current pace would take beyond both. Funds (the budget's
+        ready-to-assign unless given) cover each tier across all subcategories before
+        the next, pro rata when a tier can't be met in full. Income is never planned.
+        """
+        # Fixed order, so totals (and pro-rata shares) don't depend on how the rows were loaded
+        rows = sorted((row for row in budget.subcategory_budgets if row.subcategory), key=lambda row: row.id)
+        if not rows:
+            return []
+
+        opening = np.array([row.total_balance for row in rows])
+        assigned = np.array([row.monthly_assigned for row in rows])
+        target = np.array([row.monthly_target for row in rows])
+        activity = np.array([spending_by_subcategory.get(row.subcategory_id, 0.0) for row in rows])
+        is_income = np.array([
+            row.subcategory.category is not None and row.subcategory.category.name == INCOME_CATEGORY_NAME
+            for row in rows
+        ])
+
+        elapsed = self.month_elapsed(budget, now)
+        projected = activity / max(elapsed, MIN_PACE_FRACTION) if elapsed < 1.0 else activity.copy()
+        projected = np.maximum(projected, activity)
+
+        funded = opening + assigned
+        covered = np.maximum(funded, activity)
+        needs = np.stack([
+            np.maximum(activity - funded, 0.0),
+            np.maximum(target - covered, 0.0),
+            np.maximum(projected - np.maximum(covered, target), 0.0),
+        ])
+        needs[:, is_income] = 0.0
+        projected[is_income] = activity[is_income]
+
+        if funds is None:
+            funds = budget.ready_to_assign or 0.0
+        remaining = max(funds, 0.0)
+        allocation = np.zeros(len(rows))
+        for tier in needs:
+            total = tier.sum()
+            if remaining <= 0.0:
+                break
+            if total <= 0.0:
+                continue
+            share = min(1.0, remaining / total)
+            allocation += tier * share
+            remaining -= total * share
+
+        still_needed = needs.sum(axis=0)
+        return [
+            SubcategoryFundingPlan(
+                subcategory_budget_id=row.id,
+                subcategory_id=row.subcategory_id,
+                projected_activity=values[0],
+                overspent=values[1],
+                target_shortfall=values[2],
+                pace_shortfall=values[3],
+                still_needed=values[4],
+                allocation=values[5],
+            )
+            for row, values in zip(rows, np.column_stack([projected, needs.T, still_needed, allocation]).tolist())
+        ]
@@ -0,0 +1,356 @@
+from sqlalchemy.orm import Session
+from collections import defaultdict
+from typing import Dict, Iterator, List, Optional, Set, TextIO, Tuple
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+import csv
+import hashlib
+import logging
+import re
+
+from app.models.transaction import Transaction
+from app.schemas.transaction import CsvColumnMapping, ImportResult
+from app.services.transaction_service import TransactionService, UPSERT_BATCH_SIZE
+from app.services.budget_ledger_service import BudgetLedgerService
+from app.services.recurring_service import RecurringService
+from app.utils.payee import normalize_payee
+
+logger = logging.getLogger(__name__)
+
+IMPORT_FORMATS = ("csv", "ofx")
+IMPORT_CHUNK_SIZE = 5000
+
+# Header names tried (lowercased) for columns the mapping leaves unset
+CSV_HEADER_CANDIDATES = {
+    "date": ("date", "posted", "posted date", "posting date", "transaction date"),
+    "amount": ("amount", "transaction amount"),
+    "debit": ("debit", "withdrawal", "withdrawals", "debit amount"),
+    "credit": ("credit", "deposit", "deposits", "credit amount"),
+    "description": ("description", "name", "payee", "details", "merchant"),
+    "id": ("id", "transaction id", "fitid", "reference", "reference number"),
+    "transacted_at": ("transacted at", "transaction date"),
+    "memo": ("memo", "notes", "note"),
+}
+CSV_DATE_FORMATS = ("%m/%d/%Y", "%Y/%m/%d", "%m/%d/%y", "%d-%b-%Y", "%b %d, %Y")
+
+OFX_READ_SIZE = 1 << 16
+
+_OFX_TRANSACTION = re.compile(r"<STMTTRN>(.*?)</STMTTRN>", re.IGNORECASE | re.DOTALL)
+_OFX_FIELD = re.compile(r"<(\w+)>([^<\r\n]*)")
+
+
+def _parse_amount(value: str) -> Optional[float]:
+    """Parse "$1,234.56", "-12.00" or "(12.00)"; None for an empty cell."""
+    value = (value or "").strip().replace("$", "").replace(",", "")
+    if not value:
+        return None
+    if value.startswith("(") and value.endswith(")"):
+        return -float(value[1:-1])
+    return float(value)
+
+
+def _cell(row: dict, column: Optional[str]) -> Optional[str]:
+    """Stripped cell value, None for a missing column or empty cell."""
+    if column is None:
+        return None
+    return (row.get(column) or "").strip() or None
+
+
+def _parse_date(value: str, date_format: Optional[str]) -> datetime:
+    value = value.strip()
+    if date_format:
+        return datetime.strptime(value, date_format)
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        pass
+    for fmt in CSV_DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    raise ValueError(f"Unrecognized date '{value}'")
+
+
+@lru_cache(maxsize=8192)  # Exports repeat each date many times
+def _parse_timestamp(value: str, date_format: Optional[str]) -> float:
+    return _parse_date(value, date_format).timestamp()
+
+
+def _parse_ofx_date(value: str) -> datetime:
+    """OFX dates are YYYYMMDD[HHMMSS[.XXX]][[offset:TZ]]; the offset is ignored."""
+    digits = re.match(r"\d+", value.strip()).group(0)
+    if len(digits) >= 14:
+        return datetime.strptime(digits[:14], "%Y%m%d%H%M%S")
+    return datetime.strptime(digits[:8], "%Y%m%d")
+
+
+def _chunks(rows: Iterator[dict], chunk_size: int) -> Iterator[List[dict]]:
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class ImportService:
+    """Service for bulk importing historical transactions from CSV and OFX bank exports."""
+
+    def __init__(
+        self,
+        transaction_service: Optional[TransactionService] = None,
+        recurring_service: Optional[RecurringService] = None,
+        budget_ledger_service: Optional[BudgetLedgerService] = None
+    ):
+        self.transaction_service = transaction_service or TransactionService()
+        self.recurring_service = recurring_service
+        self.budget_ledger_service = budget_ledger_service
+
+    def _resolve_columns(self, fieldnames: List[str], mapping: CsvColumnMapping) -> Dict[str, Optional[str]]:
+        """Map each logical column to a header of the file."""
+        by_lower = {name.strip().lower(): name for name in fieldnames if name}
+        columns = {}
+        for field, candidates in CSV_HEADER_CANDIDATES.items():
+            configured = getattr(mapping, field)
+            if configured is not None:
+                if configured not in fieldnames and configured.lower() not in by_lower:
+                    raise ValueError(f"Column '{configured}' not found in CSV header")
+                columns[field] = by_lower.get(configured.lower(), configured)
+            else:
+                columns[field] = next((by_lower[c] for c in candidates if c in by_lower), None)
+
+        if columns["date"] is None or columns["description"] is None:
+            raise ValueError("CSV needs a date and a description column")
+        if columns["amount"] is None and columns["debit"] is None and columns["credit"] is None:
+            raise ValueError("CSV needs an amount column or debit/credit columns")
+        if columns["transacted_at"] == columns["date"]:
+            columns["transacted_at"] = None
+        return columns
+
+    def parse_csv(self, stream: TextIO, mapping: Optional[CsvColumnMapping] = None) -> Iterator[dict]:
+        """
+        Yield SimpleFIN-shaped transaction dicts from a CSV export, one row at a time.
+        The id is only set when the file has an id column.
+        """
+        mapping = mapping or CsvColumnMapping()
+        reader = csv.DictReader(stream)
+        columns = self._resolve_columns(reader.fieldnames or [], mapping)
+        sign = -1 if mapping.negate else 1
+
+        for row in reader:
+            try:
+                if columns["amount"] is not None:
+                    amount = _parse_amount(row[columns["amount"]]) or 0.0
+                else:
+                    # Debit/credit exports list both as positive numbers
+                    debit = _parse_amount(_cell(row, columns["debit"]))
+                    credit = _parse_amount(_cell(row, columns["credit"]))
+                    amount = abs(credit or 0.0) - abs(debit or 0.0)
+                transacted = _cell(row, columns["transacted_at"])
+                yield {
+                    "id": _cell(row, columns["id"]),
+                    "posted": _parse_timestamp(row[columns["date"]], mapping.date_format),
+                    "amount": sign * amount,
+                    "description": _cell(row, columns["description"]) or "",
+                    "transacted_at": _parse_timestamp(transacted, mapping.date_format) if transacted else None,
+                    "pending": False,
+                    "memo": _cell(row, columns["memo"]),
+                }
+            except (ValueError, TypeError) as ex:
+                raise ValueError(f"CSV line {reader.line_num}: {ex}")
+
+    def _ofx_transaction(self, block: str) -> dict:
+        fields = {tag.upper(): value.strip() for tag, value in _OFX_FIELD.findall(block)}
+        if "DTPOSTED" not in fields or "TRNAMT" not in fields:
+            raise ValueError("OFX transaction without DTPOSTED or TRNAMT")
+        return {
+            "id": fields.get("FITID") or None,
+            "posted": _parse_ofx_date(fields["DTPOSTED"]).timestamp(),
+            "amount": _parse_amount(fields["TRNAMT"]) or 0.0,
+            "description": fields.get("NAME") or fields.get("PAYEE") or fields.get("MEMO", ""),
+            "transacted_at": _parse_ofx_date(fields["DTUSER"]).timestamp() if fields.get("DTUSER") else None,
+            "pending": False,
+            "memo": fields.get("MEMO") if fields.get("NAME") else None,
+        }
+
+    def parse_ofx(self, stream: TextIO) -> Iterator[dict]:
+        """
+        Yield SimpleFIN-shaped transaction dicts from an OFX/QFX file, reading it in
+        fixed-size blocks. Handles SGML (unclosed field tags, often a single line) and XML OFX.
+        """
+        buffer = ""
+        while True:
+            data = stream.read(OFX_READ_SIZE)
+            buffer += data
+            position = 0
+            for match in _OFX_TRANSACTION.finditer(buffer):
+                yield self._ofx_transaction(match.group(1))
+                position = match.end()
+            buffer = buffer[position:]
+            if not data:
+                break
+            # Only keep a transaction that is still open (or a tag cut off by the read)
+            start = buffer.upper().rfind("<STMTTRN>")
+            buffer = buffer[start:] if start >= 0 else buffer[-len("<STMTTRN>"):]
+
+    def _content_key(self, txn: dict) -> Tuple[str, int]:
+        return (datetime.fromtimestamp(txn["posted"]).date().isoformat(), round(float(txn["amount"]) * 100))
+
+    def _assign_ids(self, account_id: str, chunk: List[dict], occurrences: Dict[Tuple, int]) -> None:
+        """
+        Give rows without a bank id a stable content hash, so re-importing the same
+        file maps to the same ids. Identical rows are told apart by their occurrence.
+        """
+        for txn in chunk:
+            if txn["id"]:
+                continue
+            key = self._content_key(txn) + (normalize_payee(txn["description"]),)
+            occurrence = occurrences[key]
+            occurrences[key] += 1
+            digest = hashlib.sha1(f"{account_id}|{key[0]}|{key[1]}|{key[2]}|{occurrence}".encode()).hexdigest()
+            txn["id"] = f"import:{digest[:24]}"
+
+    def _load_existing(
+        self,
+        db: Session,
+        account_id: str,
+        chunk: List[dict],
+        loaded: Optional[Tuple[date, date]],
+        existing_ids: Set[str],
+        by_content: Dict[Tuple[str, int], List[str]],
+        imported: Set[str]
+    ) -> Tuple[date, date]:
+        """
+        Extend the snapshot of the account's rows to what a chunk can collide with:
+        rows with the chunk's ids, and rows per (posted date, amount in cents) over the
+        chunk's dates, for matching rows that came from another source. Only days outside
+        the already loaded span are read, so an import touches its own date range rather
+        than the account's whole history. Rows inserted by this import are left out.
+
+        Returns the loaded span of posted dates.
+        """
+        unknown = list({txn["id"] for txn in chunk} - existing_ids)
+        for start in range(0, len(unknown), UPSERT_BATCH_SIZE):
+            existing_ids.update(transaction_id for transaction_id, in db.query(Transaction.transaction_id).filter(
+                Transaction.account_id == account_id,
+                Transaction.transaction_id.in_(unknown[start:start + UPSERT_BATCH_SIZE])
+            ))
+
+        days = [datetime.fromtimestamp(txn["posted"]).date() for txn in chunk]
+        first, last = min(days), max(days)
+        if loaded is None:
+            missing = [(first, last)]
+        else:
+            missing = [span for span in ((first, loaded[0] - timedelta(days=1)), (loaded[1] + timedelta(days=1), last))
+                       if span[0] <= span[1]]
+            first, last = min(first, loaded[0]), max(last, loaded[1])
+
+        for span_start, span_end in missing:
+            rows = db.query(Transaction.transaction_id, Transaction.posted, Transaction.amount).filter(
+                Transaction.account_id == account_id,
+                Transaction.posted >= datetime.combine(span_start, datetime.min.time()),
+                Transaction.posted < datetime.combine(span_end + timedelta(days=1), datetime.min.time())
+            )
+            for transaction_id, posted, amount in rows:
+                if transaction_id in imported:
+                    continue
+                existing_ids.add(transaction_id)
+                by_content[(posted.date().isoformat(), round(amount * 100))].append(transaction_id)
+        return first, last
+
+    def _drop_duplicates(
+        self,
+        chunk: List[dict],
+        existing_ids: Set[str],
+        by_content: Dict[Tuple[str, int], List[str]],
+        claimed: Set[str]
+    ) -> List[dict]:
+        """
+        Drop rows whose id already exists for the account, and rows matching an existing
+        row of another source (e.g. synced from SimpleFIN) on posted date and amount.
+        Each existing row absorbs at most one imported row, so genuine repeats survive.
+        """
+        # Existing rows matched by id first, so they cannot also absorb a different row
+        claimed.update(txn["id"] for txn in chunk if txn["id"] in existing_ids)
+
+        fresh = []
+        for txn in chunk:
+            if txn["id"] in existing_ids:
+                continue
+            candidates = by_content.get(self._content_key(txn))
+            while candidates and candidates[-1] in claimed:
+                candidates.pop()
+            if candidates:
+                claimed.add(candidates.pop())
+                continue
+            fresh.append(txn)
+            existing_ids.add(txn["id"])
+        return fresh
+
+    def import_rows(
+        self,
+        db: Session,
+        account_id: str,
+        rows: Iterator[dict],
+        chunk_size: int = IMPORT_CHUNK_SIZE
+    ) -> ImportResult:
+        """
+        Deduplicate and bulk-insert parsed rows in chunks through the same batched
+        path as sync. Re-fits recurring series for the imported payees and rolls budget
+        balances forward from the earliest imported month. Does not commit.
+        """
+        rows_read = 0
+        inserted = 0
+        occurrences = defaultdict(int)
+        existing_ids: Set[str] = set()
+        by_content: Dict[Tuple[str, int], List[str]] = defaultdict(list)
+        loaded = None
+        imported: Set[str] = set()
+        claimed: Set[str] = set()
+        payees = set()
+        earliest_posted = None
+
+        for chunk in _chunks(rows, chunk_size):
+            rows_read += len(chunk)
+            self._assign_ids(account_id, chunk, occurrences)
+            loaded = self._load_existing(db, account_id, chunk, loaded, existing_ids, by_content, imported)
+            fresh = self._drop_duplicates(chunk, existing_ids, by_content, claimed)
+            imported.update(txn["id"] for txn in fresh)
+            if fresh:
+                added, _, chunk_earliest = self.transaction_service.upsert_transactions(fresh, account_id, db, update_existing=False)
+                inserted += added
+                if chunk_earliest and (earliest_posted is None or chunk_earliest < earliest_posted):
+                    earliest_posted = chunk_earliest
+                payees.update(normalize_payee(txn["description"]) for txn in fresh)
+
+        if self.recurring_service and payees:
+            self.recurring_service.update_payees(db, payees)
+        if self.budget_ledger_service and earliest_posted:
+            self.budget_ledger_service.mark_dirty(db, earliest_posted)
+            self.budget_ledger_service.recompute(db)
+
+        logger.info(f"Imported {inserted} of {rows_read} rows into account {account_id}")
+        return ImportResult(
+            account_id=account_id,
+            rows_read=rows_read,
+            inserted=inserted,
+            duplicates=rows_read - inserted
+        )
+
+    def import_file(
+        self,
+        db: Session,
+        account_id: str,
+        stream: TextIO,
+        file_format: str = "csv",
+        mapping: Optional[CsvColumnMapping] = None,
+        chunk_size: int = IMPORT_CHUNK_SIZE
+    ) -> ImportResult:
+        """Parse a CSV or OFX export and import it into an account. Does not commit."""
+        if file_format not in IMPORT_FORMATS:
+            raise ValueError(f"format must be one of {', '.join(IMPORT_FORMATS)}")
+        rows = self.parse_csv(stream, mapping) if file_format == "csv" else self.parse_ofx(stream)
+        return self.import_rows(db, account_id, rows, chunk_size=chunk_size)
@@ -1,14 +1,6 @@
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.model_selection import train_test_split
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.preprocessing import StandardScaler
-from sklearn.metrics import accuracy_score, classification_report
-import numpy as np
-from scipy.sparse import hstack
-import pandas as pd
-import joblib
 import os
-from typing import Dict, List, Optional
+import threading
+from typing import Dict, List, Optional, TYPE_CHECKING
 from sqlalchemy.orm import Session
 import logging
 
@@ -16,6 +8,9 @@ from app.core.config import settings
 from app.models.transaction import Transaction
 from app.models.category import Subcategory
 
+if TYPE_CHECKING:
+    import numpy as np
+
 logger = logging.getLogger(__name__)
 
 class MLService:
@@ -29,6 +24,28 @@ class MLService:
     """
     
     def __init__(self):
+        # Estimators are created (or loaded from disk) on first ML use so that
+        # importing this module does not pull in scikit-learn, scipy and joblib.
+        self.model = None
+        self.vectorizer = None
+        self.scaler = None
+        self._model_loaded = False
+        self._load_lock = threading.Lock()
+        
+        self.categorical_columns = None
+        self.model_path = settings.MODEL_PATH
+        self.best_model_name = 'transaction_categorizer'
+        # Category name mappings for portability
+        self.name_to_id_map = {}  # Maps subcategory name to current DB ID
+        self.id_to_name_map = {}  # Maps current DB ID to subcategory name
+        os.makedirs(self.model_path, exist_ok=True)
+    
+    def _create_estimators(self):
+        """Create fresh, untrained estimators for a training run."""
+        from sklearn.ensemble import RandomForestClassifier
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        from sklearn.preprocessing import StandardScaler
+        
         # Use only RandomForest - simplest and most effective for mixed features
         self.model = RandomForestClassifier(
             n_estimators=200,
@@ -48,19 +65,43 @@ class MLService:
         )
         
         self.scaler = StandardScaler()
-        self.categorical_columns = None
-        self.model_path = settings.MODEL_PATH
-        self.best_model_name = 'transaction_categorizer'
-        # Category name mappings for portability
-        self.name_to_id_map = {}  # Maps subcategory name to current DB ID
-        self.id_to_name_map = {}  # Maps current DB ID to subcategory name
-        os.makedirs(self.model_path, exist_ok=True)
+    
+    def _ensure_model_loaded(self):
+        """Load the saved model, vectorizer and scaler from disk once, on first prediction."""
+        if self._model_loaded:
+            return
+        with self._load_lock:
+            if self._model_loaded:
+                return
+            import joblib
+            
+            self.model = self.load_model(self.best_model_name)
+            self.vectorizer = self.load_model(f"{self.best_model_name}_vectorizer")
+            self.scaler = self.load_model(f"{self.best_model_name}_scaler")
+            columns_path = os.path.join(self.model_path, f"{self.best_model_name}_columns.joblib")
+            if os.path.exists(columns_path):
+                self.categorical_columns = joblib.load(columns_path)
+            self._model_loaded = True
+    
+    def warm_up(self):
+        """
+        Import the ML stack and load the saved model ahead of the first request.
+        Intended to run in a background thread after startup.
+        """
+        try:
+            import numpy  # noqa: F401
+            import scipy.sparse  # noqa: F401
+            import sklearn.ensemble  # noqa: F401
+            self._ensure_model_loaded()
+            logger.info("ML service warmed up")
+        except Exception as e:
+            logger.error(f"ML warm-up failed: {str(e)}")
     
     def prepare_features(
         self, 
         transactions: List[Transaction], 
         fit: bool = True
-    ) -> np.ndarray:
+    ) -> "np.ndarray":
         """
         Extract features prioritizing transaction name text.
         
@@ -77,6 +118,9 @@ class MLService:
         Returns:
             Sparse feature matrix of shape (n_transactions, ~250 features)
         """
+        import numpy as np
+        from scipy.sparse import hstack
+        
         if not transactions:
             raise ValueError("Cannot prepare features from empty transaction list")
         
@@ -142,6 +186,11 @@ class MLService:
         Returns:
             Training metrics and status
         """
+        import numpy as np
+        import joblib
+        from sklearn.model_selection import train_test_split
+        from sklearn.metrics import accuracy_score
+        
         try:
             # 1. Query labeled transactions
             labeled_txns = db.query(Transaction).filter(
@@ -180,6 +229,7 @@ class MLService:
                 }
             
             # 4. Prepare features and labels (using NAMES instead of IDs)
+            self._create_estimators()
             X = self.prepare_features(valid_txns, fit=True)
             y = np.array([
                 self.id_to_name_map.get(t.subcategory_id, 'Unknown') 
@@ -219,6 +269,8 @@ class MLService:
                     os.path.join(self.model_path, f"{self.best_model_name}_columns.joblib")
                 )
                 
+                self._model_loaded = True
+                
                 status = "success"
                 message = f"Model trained successfully with {test_accuracy:.2%} accuracy"
             else:
@@ -260,14 +312,10 @@ class MLService:
             }
         """
         try:
+            import numpy as np
+            
             # Load model if not in memory
-            if not hasattr(self.model, 'n_estimators') or self.model.n_estimators is None:
-                self.model = self.load_model(self.best_model_name)
-                self.vectorizer = self.load_model(f"{self.best_model_name}_vectorizer")
-                self.scaler = self.load_model(f"{self.best_model_name}_scaler")
-                self.categorical_columns = joblib.load(
-                    os.path.join(self.model_path, f"{self.best_model_name}_columns.joblib")
-                )
+            self._ensure_model_loaded()
             
             # Load current category mappings (may differ from training time)
             if db and not self.name_to_id_map:
@@ -338,14 +386,10 @@ class MLService:
         Efficiently predict categories for multiple transactions.
         """
         try:
+            import numpy as np
+            
             # Load model once
-            if not hasattr(self.model, 'n_estimators') or self.model.n_estimators is None:
-                self.model = self.load_model(self.best_model_name)
-                self.vectorizer = self.load_model(f"{self.best_model_name}_vectorizer")
-                self.scaler = self.load_model(f"{self.best_model_name}_scaler")
-                self.categorical_columns = joblib.load(
-                    os.path.join(self.model_path, f"{self.best_model_name}_columns.joblib")
-                )
+            self._ensure_model_loaded()
             
             # Load current category mappings
             if not self.name_to_id_map:
@@ -394,14 +438,29 @@ class MLService:
     
     def save_model(self, model_name: str, model):
         """Save trained model/vectorizer/scaler to disk."""
+        import joblib
+        
         filepath = os.path.join(self.model_path, f"{model_name}.joblib")
         joblib.dump(model, filepath)
         logger.info(f"Saved model to {filepath}")
     
     def load_model(self, model_name: str):
         """Load trained model/vectorizer/scaler from disk."""
+        import joblib
+        
         filepath = os.path.join(self.model_path, f"{model_name}.joblib")
         if os.path.exists(filepath):
             logger.info(f"Loaded model from {filepath}")
             return joblib.load(filepath)
         return None
+
+
+_shared_ml_service: Optional[MLService] = None
+
+
+def get_ml_service() -> MLService:
+    """Return the process-wide MLService so the trained model is only loaded once."""
+    global _shared_ml_service
+    if _shared_ml_service is None:
+        _shared_ml_service = MLService()
+    return _shared_ml_service
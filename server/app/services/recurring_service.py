@@ -0,0 +1,263 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import select, update, delete, and_, or_
+from sqlalchemy.orm.attributes import set_committed_value
+from typing import Iterable, List, Optional, Set, TYPE_CHECKING
+from datetime import date, datetime, timedelta
+import logging
+
+import numpy as np
+
+from app.models.transaction import Transaction
+from app.models.recurring_series import RecurringSeries
+from app.utils.payee import normalize_payee
+from app.utils.transaction_lines import effective_date_column
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Nominal period length and allowed deviation of a single gap, in days
+PERIODS = {
+    "weekly": (7.0, 1.5),
+    "biweekly": (14.0, 2.5),
+    "monthly": (30.44, 4.0),
+    "annual": (365.25, 20.0),
+}
+MIN_OCCURRENCES = {"weekly": 4, "biweekly": 3, "monthly": 3, "annual": 2}
+
+# Share of gaps that must fall within the period tolerance
+MIN_REGULAR_GAP_SHARE = 0.6
+# Mean relative deviation of amounts from their median (bills vary a little, groceries a lot)
+MAX_AMOUNT_DEVIATION = 0.3
+
+PAYEE_BACKFILL_BATCH_SIZE = 5000
+
+
+def still_expected(today: date):
+    """
+    SQL condition for series whose next occurrence is not yet overdue by more than its
+    period's tolerance, i.e. next_expected_date + tolerance >= today (as detect() decides).
+    """
+    midnight = datetime(today.year, today.month, today.day)
+    return or_(*(
+        and_(RecurringSeries.period == period, RecurringSeries.next_expected_date >= midnight - timedelta(days=tolerance))
+        for period, (_, tolerance) in PERIODS.items()
+    ))
+
+
+class RecurringService:
+    """Service for detecting recurring series (subscriptions, bills, income) from transaction history."""
+
+    def backfill_payees(self, db: Session) -> int:
+        """Set Transaction.payee where it is missing (rows synced before payees were stored)."""
+        rows = db.execute(select(Transaction.id, Transaction.name).where(Transaction.payee.is_(None))).all()
+        if not rows:
+            return 0
+
+        # Descriptions repeat heavily, so normalize each distinct one once
+        payees = {name: normalize_payee(name) for name in {name for _, name in rows}}
+        for start in range(0, len(rows), PAYEE_BACKFILL_BATCH_SIZE):
+            batch = rows[start:start + PAYEE_BACKFILL_BATCH_SIZE]
+            db.execute(update(Transaction), [{"id": tid, "payee": payees[name]} for tid, name in batch])
+        logger.info(f"Backfilled payee for {len(rows)} transactions")
+        return len(rows)
+
+    def _load_history(self, db: Session, payees: Optional[Set[str]] = None) -> "pd.DataFrame":
+        """Non-transfer transactions as a DataFrame, optionally limited to some payees."""
+        import pandas as pd
+
+        query = select(
+            Transaction.payee,
+            Transaction.name,
+            Transaction.account_id,
+            Transaction.subcategory_id,
+            Transaction.amount,
+            effective_date_column().label("date"),
+        ).where(
+            Transaction.is_transfer == False,
+            Transaction.payee.isnot(None),
+            Transaction.amount != 0
+        )
+        if payees is not None:
+            query = query.where(Transaction.payee.in_(list(payees)))
+
+        frame = pd.DataFrame(
+            db.execute(query).all(),
+            columns=["payee", "name", "account_id", "subcategory_id", "amount", "date"]
+        )
+        frame["date"] = pd.to_datetime(frame["date"]).dt.normalize()
+        frame["is_income"] = frame["amount"] > 0
+        return frame
+
+    def detect(self, frame: "pd.DataFrame", today: Optional[date] = None) -> "pd.DataFrame":
+        """
+        Fit recurring series to transaction history with vectorized group-bys.
+
+        Transactions are grouped by (payee, direction). A group is recurring when its
+        median gap matches one of PERIODS, most gaps fall within that period's tolerance,
+        and amounts stay close to their median. Returns one row per detected series.
+        """
+        import pandas as pd
+
+        if frame.empty:
+            return frame.iloc[0:0]
+
+        today = pd.Timestamp(today or date.today())
+        keys = ["payee", "is_income"]
+        frame = frame.sort_values(keys + ["date"], kind="stable").reset_index(drop=True)
+        groups = frame.groupby(keys, sort=False)
+
+        frame["gap"] = groups["date"].diff().dt.days
+        frame["median_amount"] = groups["amount"].transform("median")
+        frame["amount_deviation"] = (
+            (frame["amount"] - frame["median_amount"]).abs() / frame["median_amount"].abs()
+        )
+
+        series = groups.agg(
+            name=("name", "last"),
+            account_id=("account_id", "last"),
+            subcategory_id=("subcategory_id", "last"),
+            average_amount=("median_amount", "first"),
+            last_amount=("amount", "last"),
+            occurrences=("amount", "size"),
+            first_date=("date", "min"),
+            last_date=("date", "max"),
+            amount_deviation=("amount_deviation", "mean"),
+            interval_days=("gap", "median"),
+        )
+        series = series[series["interval_days"].notna()]
+
+        # Pick the period whose nominal length the median gap is closest to (within tolerance)
+        names = list(PERIODS)
+        nominal = np.array([PERIODS[name][0] for name in names])
+        tolerance = np.array([PERIODS[name][1] for name in names])
+        distance = np.abs(series["interval_days"].to_numpy()[:, None] - nominal[None, :])
+        fits = distance <= tolerance[None, :]
+        best = np.where(fits, distance, np.inf).argmin(axis=1)
+        series = series.assign(
+            period=np.where(fits.any(axis=1), np.array(names, dtype=object)[best], None),
+            nominal_days=nominal[best],
+            tolerance_days=tolerance[best],
+        )
+        series = series[series["period"].notna()]
+        if series.empty:
+            return series.reset_index()
+
+        # Share of each group's gaps that fall within its period's tolerance
+        gaps = frame[frame["gap"].notna()].join(series[["nominal_days", "tolerance_days"]], on=keys, how="inner")
+        regular = (gaps["gap"] - gaps["nominal_days"]).abs() <= gaps["tolerance_days"]
+        series["regular_share"] = regular.groupby([gaps["payee"], gaps["is_income"]]).mean()
+
+        min_occurrences = series["period"].map(MIN_OCCURRENCES)
+        series = series[
+            (series["occurrences"] >= min_occurrences)
+            & (series["regular_share"] >= MIN_REGULAR_GAP_SHARE)
+            & (series["amount_deviation"] <= MAX_AMOUNT_DEVIATION)
+        ].copy()
+        if series.empty:
+            return series.reset_index()
+
+        series["confidence"] = (
+            series["regular_share"] * (1 - series["amount_deviation"] / MAX_AMOUNT_DEVIATION * 0.5)
+        ).clip(0.0, 1.0)
+
+        # Step monthly and annual series by calendar months so they stay on their billing day
+        next_expected = series["last_date"] + pd.to_timedelta(series["nominal_days"], unit="D")
+        for period, offset in (("monthly", pd.DateOffset(months=1)), ("annual", pd.DateOffset(years=1))):
+            mask = series["period"] == period
+            if mask.any():
+                next_expected[mask] = series.loc[mask, "last_date"] + offset
+        series["next_expected_date"] = next_expected
+        series["is_active"] = next_expected + pd.to_timedelta(series["tolerance_days"], unit="D") >= today
+
+        return series.reset_index()
+
+    def _store(self, db: Session, series: "pd.DataFrame") -> int:
+        """Insert detected series rows."""
+        import pandas as pd
+
+        if series.empty:
+            return 0
+        now = datetime.utcnow()
+        rows = [
+            {
+                "payee": row.payee,
+                "name": row.name,
+                "is_income": bool(row.is_income),
+                "account_id": row.account_id,
+                "subcategory_id": int(row.subcategory_id) if pd.notna(row.subcategory_id) else None,
+                "period": row.period,
+                "interval_days": float(row.interval_days),
+                "average_amount": float(row.average_amount),
+                "last_amount": float(row.last_amount),
+                "occurrences": int(row.occurrences),
+                "confidence": float(row.confidence),
+                "first_date": row.first_date.to_pydatetime(),
+                "last_date": row.last_date.to_pydatetime(),
+                "next_expected_date": row.next_expected_date.to_pydatetime(),
+                "is_active": bool(row.is_active),
+                "created_at": now,
+                "updated_at": now,
+            }
+            for row in series.itertuples(index=False)
+        ]
+        db.execute(RecurringSeries.__table__.insert(), rows)
+        return len(rows)
+
+    def rebuild(self, db: Session) -> int:
+        """Re-detect every recurring series from the full history. Does not commit."""
+        self.backfill_payees(db)
+        series = self.detect(self._load_history(db))
+        db.execute(delete(RecurringSeries))
+        count = self._store(db, series)
+        logger.info(f"Rebuilt recurring series: {count} detected")
+        return count
+
+    def deactivate_missed(self, db: Session, today: Optional[date] = None) -> int:
+        """
+        Mark series inactive once their expected occurrence is overdue beyond tolerance,
+        including payees that no longer appear in syncs. Does not commit.
+        """
+        result = db.execute(
+            update(RecurringSeries)
+            .where(RecurringSeries.is_active == True, ~still_expected(today or date.today()))
+            .values(is_active=False, updated_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount:
+            logger.info(f"Deactivated {result.rowcount} recurring series with missed occurrences")
+        return result.rowcount
+
+    def update_payees(self, db: Session, payees: Iterable[str]) -> int:
+        """
+        Re-detect the series of the given payees only (e.g. those touched by a sync),
+        and deactivate any other series that has missed its expected occurrence.
+        Does not commit.
+        """
+        self.deactivate_missed(db)
+        payees = {payee for payee in payees if payee}
+        if not payees:
+            return 0
+        series = self.detect(self._load_history(db, payees))
+        db.execute(delete(RecurringSeries).where(RecurringSeries.payee.in_(list(payees))))
+        count = self._store(db, series)
+        logger.debug(f"Updated recurring series for {len(payees)} payees: {count} detected")
+        return count
+
+    def get_series(self, db: Session, active_only: bool = True, today: Optional[date] = None) -> List[RecurringSeries]:
+        """
+        Detected series ordered by next expected date. Activity is judged against today
+        rather than the stored flag, which is only refreshed when a sync runs.
+        """
+        today = today or date.today()
+        query = db.query(RecurringSeries)
+        if active_only:
+            query = query.filter(still_expected(today))
+        series_list = query.order_by(RecurringSeries.next_expected_date, RecurringSeries.id).all()
+        midnight = datetime(today.year, today.month, today.day)
+        for series in series_list:
+            # Reported without marking the row dirty, so reads stay read-only
+            active = series.next_expected_date + timedelta(days=PERIODS[series.period][1]) >= midnight
+            set_committed_value(series, "is_active", active)
+        return series_list
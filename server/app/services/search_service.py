@@ -0,0 +1,97 @@
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import column, func, literal_column, select, table
+from typing import Iterable, List, Optional
+from datetime import datetime
+import logging
+import re
+
+from app.core.search_index import SEARCH_TABLE
+from app.models.transaction import Transaction
+
+logger = logging.getLogger(__name__)
+
+MAX_SEARCH_LIMIT = 500
+# bm25 scores every match, so broader queries are ordered newest-first instead
+RANKED_MATCH_LIMIT = 5000
+
+# A double-quoted phrase, or a bare run of non-space characters
+_QUERY_TOKEN = re.compile(r'"([^"]*)"?|(\S+)')
+_WORD = re.compile(r"\w+")
+
+_search_table = table(SEARCH_TABLE, column("rowid"), column("rank"))
+
+
+def build_match_query(query: str) -> str:
+    """
+    Translate user input into an FTS5 MATCH expression.
+
+    Quoted text becomes a phrase; every other word is a prefix term ("amaz" finds
+    "AMAZON MKTPLACE"). Terms are ANDed. Words are quoted so FTS5 operators and
+    punctuation in the input cannot break the expression.
+    """
+    terms = []
+    for phrase, word in _QUERY_TOKEN.findall(query):
+        if phrase:
+            words = _WORD.findall(phrase)
+            if words:
+                terms.append('"' + " ".join(words) + '"')
+        else:
+            terms.extend(f'"{w}"*' for w in _WORD.findall(word))
+    return " ".join(terms)
+
+
+class SearchService:
+    """Service for full-text search across transaction names, memos and merchant names."""
+
+    def search(
+        self,
+        db: Session,
+        query: str,
+        min_amount: Optional[float] = None,
+        max_amount: Optional[float] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        account_ids: Optional[Iterable[str]] = None,
+        skip: int = 0,
+        limit: int = 50
+    ) -> List[Transaction]:
+        """
+        Transactions matching the query, best match (bm25) first, then most recent.
+        Queries matching more than RANKED_MATCH_LIMIT rows after filtering (where
+        relevance barely differs) are ordered newest-inserted first, which FTS5 serves
+        from its index.
+        Amount bounds apply to the signed amount; dates filter on posted.
+        """
+        match = build_match_query(query)
+        if not match:
+            return []
+
+        matches = literal_column(SEARCH_TABLE).op("MATCH")(match)
+        filters = []
+        if min_amount is not None:
+            filters.append(Transaction.amount >= min_amount)
+        if max_amount is not None:
+            filters.append(Transaction.amount <= max_amount)
+        if start_date:
+            filters.append(Transaction.posted >= start_date)
+        if end_date:
+            filters.append(Transaction.posted <= end_date)
+        if account_ids:
+            filters.append(Transaction.account_id.in_(list(account_ids)))
+
+        # Count what the filters leave, stopping once past the limit. Matches are read once
+        # as a rowid list: joined, SQLite may drive from a filter's index and re-run MATCH per row
+        matching = select(Transaction.id).where(
+            Transaction.id.in_(select(_search_table.c.rowid).where(matches)), *filters
+        ).limit(RANKED_MATCH_LIMIT + 1).subquery()
+        match_count = db.execute(select(func.count()).select_from(matching)).scalar()
+        if match_count > RANKED_MATCH_LIMIT:
+            order = (_search_table.c.rowid.desc(),)
+        else:
+            order = (_search_table.c.rank, Transaction.posted.desc(), Transaction.id.desc())
+
+        statement = select(Transaction).join(
+            _search_table, _search_table.c.rowid == Transaction.id
+        ).where(matches, *filters)
+        statement = statement.options(selectinload(Transaction.splits)).order_by(*order).offset(skip).limit(limit)
+        return db.execute(statement).scalars().all()
@@ -7,6 +7,7 @@ import logging
 from app.core.config import settings
 from app.models import SimplefinItem
 from app.core.database import get_db
+from app.utils.payee import normalize_payee
 
 logger = logging.getLogger(__name__)
 
@@ -14,9 +15,11 @@ logger = logging.getLogger(__name__)
 class SimplefinService:
     """Service for handling simplefin-related operations."""
     
-    def __init__(self, account_service=None, transaction_service=None):
+    def __init__(self, account_service=None, transaction_service=None, recurring_service=None, budget_ledger_service=None):
         self.account_service = account_service
         self.transaction_service = transaction_service
+        self.recurring_service = recurring_service
+        self.budget_ledger_service = budget_ledger_service
 
     def add_access_token(self, access_token, db: Session) -> tuple:
         try:
@@ -71,6 +74,8 @@ class SimplefinService:
             """Convert a timestamp (seconds since epoch) to a datetime string."""
             return datetime.fromtimestamp(ts).strftime('%Y-%m-%d %H:%M:%S')
         
+        synced_payees = set()
+        earliest_posted = None
         try:
             for account in data['accounts']:
                 account['balance-date-formatted'] = ts_to_datetime(account['balance-date'])
@@ -90,9 +95,18 @@ class SimplefinService:
                         print("Transaction extra:")
                         for k, v in transaction['extra'].items():
                             print(f"  {k}: {v}")
-                    txn_succ, txn_msg = self.transaction_service.add_transaction(transaction, account['id'], db)
-                    if not txn_succ:
-                        return (False, txn_msg)
+                    synced_payees.add(normalize_payee(transaction['description']))
+                inserted, updated, account_earliest = self.transaction_service.upsert_transactions(account['transactions'], account['id'], db)
+                logger.info(f"Synced account {account['id']}: {inserted} new, {updated} updated transactions")
+                if account_earliest and (earliest_posted is None or account_earliest < earliest_posted):
+                    earliest_posted = account_earliest
+            # Re-fit recurring series only for payees that appeared in this sync
+            if self.recurring_service:
+                self.recurring_service.update_payees(db, synced_payees)
+            # Roll budget balances forward from the earliest month this sync touched
+            if self.budget_ledger_service:
+                self.budget_ledger_service.mark_dirty(db, earliest_posted)
+                self.budget_ledger_service.recompute(db)
             return (True, "") 
         except Exception as ex:
             return (False, f"Failed to save accounts and transactions: {ex}")
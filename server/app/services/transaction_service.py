@@ -1,50 +1,101 @@
 from sqlalchemy.orm import Session
+from sqlalchemy import update
+from typing import List, Optional, Tuple
 from datetime import datetime, timedelta
 import logging
 
 from app.models import SimplefinItem, Account, Transaction, Merchant
 from app.models.category import Category, Subcategory
-from app.services.ml_service import MLService
+from app.services.ml_service import get_ml_service
+from app.utils.payee import normalize_payee
 
 logger = logging.getLogger(__name__)
 
+# Transactions matched against existing rows per IN query (well below SQLite's variable limit)
+UPSERT_BATCH_SIZE = 900
+
 
 class TransactionService:
     """Service for handling transaction syncing and management."""
     
     def __init__(self):
-        self.ml_service = MLService()
+        self.ml_service = get_ml_service()
   
-    def _update_transaction(self, existing: Transaction, txn: dict, db: Session):
-        """Update an existing transaction with modified data."""
-
-        existing.posted = datetime.fromtimestamp(txn['posted'])        
-        existing.amount = txn['amount']
-        existing.name = txn['description']
-        existing.transacted_at = datetime.fromtimestamp(float(txn.get('transacted_at'))) if txn.get('transacted_at') is not None else None
-        existing.pending = txn.get('pending', False)
-        existing.updated_at = datetime.utcnow()
-
-    def add_transaction(self, transaction: dict, account_id: str, db: Session) -> tuple:
-        try:
-            existing_trans = db.query(Transaction).filter(
-                Transaction.transaction_id == transaction['id'],
-                Transaction.account_id == account_id
-            ).first()
-            if existing_trans:
-                self._update_transaction(existing_trans, transaction, db)
-            else:
-                new_trans = Transaction(
-                    transaction_id = transaction['id'],
-                    account_id = account_id,
-                    posted = datetime.fromtimestamp(transaction['posted']),
-                    amount = transaction['amount'],
-                    name  = transaction['description'],
-                    transacted_at = datetime.fromtimestamp(float(transaction.get('transacted_at'))) if transaction.get('transacted_at') is not None else None,
-                    pending = transaction.get('pending', False)
-                )
-                db.add(new_trans)
-                db.flush()
-            return (True, "")
-        except Exception as ex:
-            return (False, f"Failed to add transaction id {transaction['id']}: {ex}")
+    def _transaction_values(self, txn: dict) -> dict:
+        """Column values for a SimpleFIN-shaped transaction dict."""
+        return {
+            "posted": datetime.fromtimestamp(txn['posted']),
+            "amount": float(txn['amount']),
+            "name": txn['description'],
+            "payee": normalize_payee(txn['description']),
+            "transacted_at": datetime.fromtimestamp(float(txn['transacted_at'])) if txn.get('transacted_at') is not None else None,
+            "pending": txn.get('pending', False),
+        }
+
+    def upsert_transactions(
+        self,
+        transactions: List[dict],
+        account_id: str,
+        db: Session,
+        update_existing: bool = True
+    ) -> Tuple[int, int, Optional[datetime]]:
+        """
+        Insert or update a batch of SimpleFIN-shaped transactions for one account.
+
+        Existing rows are matched on (account_id, transaction_id) with one IN query per
+        UPSERT_BATCH_SIZE ids, then updated and inserted with executemany statements
+        instead of per-row ORM objects. Used by sync and by file imports.
+
+        Returns (inserted, updated, earliest posted date of an inserted row or of an
+        updated row whose date or amount changed, covering both its old and new date),
+        so callers can tell which budget months changed.
+        """
+        inserted = 0
+        updated = 0
+        earliest = None
+        for start in range(0, len(transactions), UPSERT_BATCH_SIZE):
+            # A repeated id within the batch is the same transaction sent twice; keep the last copy
+            batch = list({txn['id']: txn for txn in transactions[start:start + UPSERT_BATCH_SIZE]}.values())
+            existing = {}
+            previous = {}
+            for transaction_id, row_id, posted, amount in db.query(
+                Transaction.transaction_id, Transaction.id, Transaction.posted, Transaction.amount
+            ).filter(
+                Transaction.account_id == account_id,
+                Transaction.transaction_id.in_([txn['id'] for txn in batch])
+            ):
+                existing[transaction_id] = row_id
+                previous[transaction_id] = (posted, amount)
+
+            now = datetime.utcnow()
+            new_rows = []
+            changed_rows = []
+            for txn in batch:
+                values = self._transaction_values(txn)
+                if txn['id'] in existing:
+                    if update_existing:
+                        # Sync re-sends recent history; only moved or re-priced rows change budgets
+                        old_posted, old_amount = previous.get(txn['id'], (None, None))
+                        if old_posted is not None and (old_posted, old_amount) != (values["posted"], values["amount"]):
+                            low = min(old_posted, values["posted"])
+                            earliest = min(earliest, low) if earliest else low
+                        changed_rows.append({"id": existing[txn['id']], "updated_at": now, **values})
+                else:
+                    earliest = min(earliest, values["posted"]) if earliest else values["posted"]
+                    new_rows.append({
+                        "transaction_id": txn['id'],
+                        "account_id": account_id,
+                        "memo": txn.get('memo'),
+                        "created_at": now,
+                        "updated_at": now,
+                        **values
+                    })
+
+            if changed_rows:
+                db.execute(update(Transaction), changed_rows)
+            if new_rows:
+                db.execute(Transaction.__table__.insert(), new_rows)
+            inserted += len(new_rows)
+            updated += len(changed_rows)
+
+        return inserted, updated, earliest
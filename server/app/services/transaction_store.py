@@ -0,0 +1,286 @@
+import calendar
+import threading
+from datetime import datetime, date, timedelta
+from typing import Dict, List, Optional, Tuple
+import logging
+
+import numpy as np
+from sqlalchemy import select, func
+from sqlalchemy.orm import Session
+
+from app.models.transaction import Transaction
+from app.utils.transaction_lines import transaction_lines
+
+logger = logging.getLogger(__name__)
+
+NO_SUBCATEGORY = -1
+
+COLUMN_DTYPES = {
+    "transaction_id": np.int32,
+    "account": np.int16,        # Interned index into TransactionStore.account_ids
+    "subcategory": np.int32,    # NO_SUBCATEGORY when uncategorized
+    "amount_cents": np.int32,
+    "posted": np.uint32,        # Epoch seconds
+    "effective": np.uint32,     # Epoch seconds (transacted_at, falling back to posted)
+    "is_transfer": np.bool_,
+    "is_primary": np.bool_,     # First line of its transaction, used for transaction counts
+}
+
+
+def to_epoch_seconds(value: datetime) -> int:
+    """Convert a naive datetime (as stored by SQLite) to epoch seconds."""
+    return calendar.timegm(value.timetuple())
+
+
+class TransactionStore:
+    """
+    In-memory columnar read model of split-aware transaction lines.
+
+    Every split (or unsplit transaction) is one line, stored as parallel NumPy arrays
+    with compact dtypes (~22 bytes per line). The store is loaded once and afterwards
+    refreshed incrementally from Transaction.updated_at: lines of changed transactions
+    are dropped and re-read, so categorizing or splitting a transaction only costs
+    the rows that changed.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._watermark = 0
+        self.account_ids: List[str] = []
+        self._account_codes: Dict[str, int] = {}
+        self._columns = self._empty_columns()
+
+    @staticmethod
+    def _empty_columns() -> Dict[str, np.ndarray]:
+        return {name: np.empty(0, dtype=dtype) for name, dtype in COLUMN_DTYPES.items()}
+
+    @property
+    def line_count(self) -> int:
+        return len(self._columns["transaction_id"])
+
+    @property
+    def transaction_count(self) -> int:
+        return int(np.count_nonzero(self._columns["is_primary"]))
+
+    @property
+    def id_fingerprint(self) -> Tuple[int, int]:
+        """(count, sum) of the transaction ids held, comparable with the transactions table."""
+        ids = self._columns["transaction_id"][self._columns["is_primary"]]
+        return len(ids), int(ids.sum(dtype=np.int64))
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the column arrays."""
+        return sum(column.nbytes for column in self._columns.values())
+
+    def _intern_account(self, account_id: Optional[str]) -> int:
+        code = self._account_codes.get(account_id)
+        if code is None:
+            code = len(self.account_ids)
+            self._account_codes[account_id] = code
+            self.account_ids.append(account_id)
+        return code
+
+    def _fetch_lines(self, db: Session, changed_since: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """Read split-aware lines (including transfers) into column arrays."""
+        lines = transaction_lines(include_transfers=True, changed_since=changed_since)
+        rows = db.execute(
+            select(
+                lines.c.transaction_id,
+                lines.c.account_id,
+                lines.c.subcategory_id,
+                lines.c.amount,
+                lines.c.posted,
+                lines.c.effective_date,
+                lines.c.is_transfer
+            ).order_by(lines.c.transaction_id)
+        ).all()
+
+        if not rows:
+            return self._empty_columns()
+
+        transaction_ids, account_ids, subcategory_ids, amounts, posted, effective, transfers = zip(*rows)
+        columns = {
+            "transaction_id": np.array(transaction_ids, dtype=COLUMN_DTYPES["transaction_id"]),
+            "account": np.array(
+                [self._intern_account(account_id) for account_id in account_ids],
+                dtype=COLUMN_DTYPES["account"]
+            ),
+            "subcategory": np.array(
+                [sub_id if sub_id is not None else NO_SUBCATEGORY for sub_id in subcategory_ids],
+                dtype=COLUMN_DTYPES["subcategory"]
+            ),
+            "amount_cents": np.rint(np.array(amounts, dtype=np.float64) * 100).astype(COLUMN_DTYPES["amount_cents"]),
+            "posted": np.array([to_epoch_seconds(d) for d in posted], dtype=COLUMN_DTYPES["posted"]),
+            "effective": np.array([to_epoch_seconds(d) for d in effective], dtype=COLUMN_DTYPES["effective"]),
+            "is_transfer": np.array([bool(t) for t in transfers], dtype=COLUMN_DTYPES["is_transfer"]),
+        }
+        # Lines are ordered by transaction, so the first line of each run is the primary one
+        ids = columns["transaction_id"]
+        is_primary = np.ones(len(ids), dtype=COLUMN_DTYPES["is_primary"])
+        is_primary[1:] = ids[1:] != ids[:-1]
+        columns["is_primary"] = is_primary
+        return columns
+
+    def refresh(self, db: Session) -> None:
+        """
+        Load the store on first use; afterwards apply transactions changed since the last
+        refresh. Deletes leave no change_seq behind, so the count and sum of ids are
+        compared with the table after applying changes, and a mismatch (rows deleted,
+        even alongside inserts) reloads the store in full.
+        """
+        with self._lock:
+            # Read the watermark first so anything committed while we load is picked up next time
+            watermark, transaction_count, id_sum = db.execute(
+                select(
+                    func.coalesce(func.max(Transaction.change_seq), 0),
+                    func.count(Transaction.id),
+                    func.coalesce(func.sum(Transaction.id), 0)
+                )
+            ).one()
+            fingerprint = (transaction_count, id_sum)
+
+            if self._loaded:
+                if watermark == self._watermark and fingerprint == self.id_fingerprint:
+                    return
+                delta = self._fetch_lines(db, changed_since=self._watermark)
+                self._watermark = watermark
+                if len(delta["transaction_id"]):
+                    changed = np.unique(delta["transaction_id"])
+                    keep = ~np.isin(self._columns["transaction_id"], changed)
+                    self._columns = {
+                        name: np.concatenate([column[keep], delta[name]])
+                        for name, column in self._columns.items()
+                    }
+                    logger.debug(f"Refreshed transaction store: {len(changed)} transactions updated")
+                if self.id_fingerprint == fingerprint:
+                    return
+
+            self._columns = self._fetch_lines(db)
+            self._watermark = watermark
+            self._loaded = True
+            logger.info(f"Loaded transaction store: {self.line_count} lines, {self.nbytes / 1024:.0f} KiB")
+
+    def _mask(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        include_transfers: bool = False
+    ) -> np.ndarray:
+        columns = self._columns
+        mask = np.ones(len(columns["transaction_id"]), dtype=bool)
+        if not include_transfers:
+            mask &= ~columns["is_transfer"]
+        if start_date:
+            mask &= columns["posted"] >= to_epoch_seconds(start_date)
+        if end_date:
+            mask &= columns["posted"] <= to_epoch_seconds(end_date)
+        return mask
+
+    def summarize(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> Tuple[int, set, Optional[int], List[Tuple[Optional[int], float, float, float]]]:
+        """
+        Vectorized equivalent of the analytics summary queries for non-transfer lines.
+
+        Returns (transaction_count, account_ids, date_range_days or None, per-subcategory
+        rows of (subcategory_id, spending, income, net)). Uncategorized lines are reported
+        under subcategory None.
+        """
+        columns = self._columns
+        mask = self._mask(start_date, end_date)
+        if not mask.any():
+            return 0, set(), None, []
+
+        transaction_count = int(np.count_nonzero(columns["is_primary"] & mask))
+        account_ids = {self.account_ids[code] for code in np.unique(columns["account"][mask])}
+        effective = columns["effective"][mask]
+        date_range_days = int(effective.max() - effective.min()) // 86400
+
+        amounts = columns["amount_cents"][mask].astype(np.int64)
+        subcategories = columns["subcategory"][mask]
+        keys, inverse = np.unique(subcategories, return_inverse=True)
+        net = np.bincount(inverse, weights=amounts, minlength=len(keys))
+        spending = np.bincount(inverse, weights=np.minimum(amounts, 0), minlength=len(keys))
+        income = np.bincount(inverse, weights=np.maximum(amounts, 0), minlength=len(keys))
+
+        rows = [
+            (
+                int(key) if key != NO_SUBCATEGORY else None,
+                float(spending[i]) / 100,
+                float(income[i]) / 100,
+                float(net[i]) / 100
+            )
+            for i, key in enumerate(keys)
+        ]
+        return transaction_count, account_ids, date_range_days, rows
+
+    def time_buckets(
+        self,
+        interval: str,
+        group_by: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        subcategory_categories: Optional[Dict[int, int]] = None
+    ) -> List[Tuple[date, Optional[int], float, float]]:
+        """
+        Spending/income per day, week (Monday start) or month of effective date, optionally
+        per subcategory or per category (using the subcategory -> category map).
+
+        Returns sorted (period_start, group_id, spending, income) rows; group_id is None
+        for uncategorized lines or when not grouping.
+        """
+        columns = self._columns
+        mask = self._mask(start_date, end_date)
+        if not mask.any():
+            return []
+
+        days = (columns["effective"][mask] // 86400).astype(np.int64)
+        if interval == "week":
+            # Epoch day 0 was a Thursday; shift so buckets start on Monday
+            days = days - (days + 3) % 7
+        elif interval == "month":
+            days = days.astype("datetime64[D]").astype("datetime64[M]").astype("datetime64[D]").astype(np.int64)
+
+        groups = np.full(len(days), NO_SUBCATEGORY, dtype=np.int64)
+        if group_by == "subcategory":
+            groups = columns["subcategory"][mask].astype(np.int64)
+        elif group_by == "category" and subcategory_categories:
+            lookup = np.full(max(subcategory_categories) + 1, NO_SUBCATEGORY, dtype=np.int64)
+            lookup[list(subcategory_categories.keys())] = list(subcategory_categories.values())
+            subcategories = columns["subcategory"][mask].astype(np.int64)
+            known = (subcategories >= 0) & (subcategories < len(lookup))
+            groups[known] = lookup[subcategories[known]]
+
+        # Combine bucket and group into one sortable key for a single np.unique pass
+        span = int(groups.max()) + 2
+        keys, inverse = np.unique(days * span + (groups + 1), return_inverse=True)
+        amounts = columns["amount_cents"][mask].astype(np.int64)
+        spending = np.bincount(inverse, weights=np.minimum(amounts, 0), minlength=len(keys))
+        income = np.bincount(inverse, weights=np.maximum(amounts, 0), minlength=len(keys))
+
+        epoch = date(1970, 1, 1)
+        rows = []
+        for i, key in enumerate(keys):
+            day, group = divmod(int(key), span)
+            rows.append((
+                epoch + timedelta(days=day),
+                group - 1 if group - 1 != NO_SUBCATEGORY else None,
+                float(spending[i]) / 100,
+                float(income[i]) / 100
+            ))
+        return rows
+
+
+_shared_transaction_store: Optional[TransactionStore] = None
+
+
+def get_transaction_store() -> TransactionStore:
+    """Return the process-wide TransactionStore."""
+    global _shared_transaction_store
+    if _shared_transaction_store is None:
+        _shared_transaction_store = TransactionStore()
+    return _shared_transaction_store
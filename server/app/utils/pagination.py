@@ -0,0 +1,22 @@
+"""Opaque keyset cursors for (effective date, id) ordered listings."""
+import base64
+from datetime import datetime
+from typing import Tuple
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(effective_date: datetime, row_id: int) -> str:
+    """Cursor pointing just past the given row."""
+    raw = f"{effective_date.isoformat()}|{row_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Inverse of encode_cursor. Raises ValueError for a malformed cursor."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        effective_date, row_id = base64.urlsafe_b64decode(padded.encode()).decode().split("|")
+        return datetime.fromisoformat(effective_date), int(row_id)
+    except (ValueError, UnicodeDecodeError) as ex:
+        raise ValueError(f"Invalid cursor: {ex}")
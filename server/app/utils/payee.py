@@ -0,0 +1,36 @@
+"""Payee normalization used to group transactions from the same merchant."""
+import re
+from functools import lru_cache
+
+# Applied in order to the lowercased description
+_NOISE_PATTERNS = [
+    # Card network / processor prefixes: "POS PURCHASE", "SQ *", "TST* ", "PP*"
+    re.compile(r"^(pos|purchase|debit|credit|preauthorized|pre-authorized|recurring|online|card)(\s+purchase)?\s+"),
+    re.compile(r"\b(sq|tst|pp|sp|paypal)\s*\*\s*"),
+    # Dates, store numbers and reference numbers
+    re.compile(r"\b\d{1,2}/\d{1,2}(/\d{2,4})?\b"),
+    re.compile(r"#\s*\d+"),
+    re.compile(r"\d{3,}"),
+    # Web suffixes and company forms
+    re.compile(r"\.(com|ca|net|org)\b"),
+    re.compile(r"\b(www|inc|llc|ltd|corp|co)\b"),
+    re.compile(r"[^a-z&\s]"),
+]
+_WHITESPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=4096)  # Descriptions repeat heavily across syncs and imports
+def normalize_payee(name: str) -> str:
+    """
+    Reduce a raw transaction description to a stable payee key, e.g.
+    "NETFLIX.COM 866-579" and "Netflix.com #12" both become "netflix".
+    """
+    if not name:
+        return ""
+    raw = name.lower().replace("'", "").strip()
+    payee = raw
+    for pattern in _NOISE_PATTERNS:
+        payee = pattern.sub(" ", payee)
+    payee = _WHITESPACE.sub(" ", payee).strip()
+    # Descriptions that are nothing but noise keep their raw form
+    return payee or _WHITESPACE.sub(" ", raw)
@@ -0,0 +1,77 @@
+"""Streaming responses (NDJSON, file exports) for large result sets."""
+from typing import Any, Callable, Dict, Iterator, List, Optional, Type
+
+import orjson
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy.orm import Query, Session
+
+from app.core.database import SessionLocal
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# Rows fetched from the cursor (and written to the socket) per round trip
+STREAM_BATCH_SIZE = 500
+
+
+def dump_json_line(content: Any) -> bytes:
+    return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS) + b"\n"
+
+
+def iter_ndjson(
+    query: Query,
+    schema: Type[BaseModel],
+    header: Optional[dict] = None,
+    prepare_batch: Optional[Callable[[List[Any]], None]] = None,
+    batch_size: int = STREAM_BATCH_SIZE
+) -> Iterator[bytes]:
+    """
+    Serialize query results one object per line, optionally preceded by a header object.
+
+    Rows are read with yield_per, so only one batch of ORM objects (and one chunk of
+    output) is held in memory at a time regardless of how many rows match.
+    yield_per cannot be combined with selectinload of collections, so relationships
+    are loaded per batch by prepare_batch instead.
+    """
+    if header is not None:
+        yield dump_json_line(header)
+
+    def flush(batch: List[Any]) -> bytes:
+        if prepare_batch is not None:
+            prepare_batch(batch)
+        return b"".join(dump_json_line(schema.model_validate(row).model_dump()) for row in batch)
+
+    batch = []
+    for row in query.yield_per(batch_size):
+        batch.append(row)
+        if len(batch) >= batch_size:
+            yield flush(batch)
+            batch.clear()
+    if batch:
+        yield flush(batch)
+
+
+def stream_response(
+    generate: Callable[[Session], Iterator[bytes]],
+    media_type: str,
+    headers: Optional[Dict[str, str]] = None
+) -> StreamingResponse:
+    """
+    Stream the chunks produced by generate(db).
+
+    The request's own session is closed before the body is sent, so the stream
+    opens a dedicated session that lives as long as the response.
+    """
+    def body() -> Iterator[bytes]:
+        db = SessionLocal()
+        try:
+            yield from generate(db)
+        finally:
+            db.close()
+
+    return StreamingResponse(body(), media_type=media_type, headers=headers)
+
+
+def ndjson_response(generate: Callable[[Session], Iterator[bytes]]) -> StreamingResponse:
+    """Stream the lines produced by generate(db) as application/x-ndjson."""
+    return stream_response(generate, NDJSON_MEDIA_TYPE)
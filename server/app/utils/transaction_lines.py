@@ -0,0 +1,86 @@
+"""Split-aware transaction line queries shared by analytics and budget services."""
+from collections import defaultdict
+from datetime import datetime
+from typing import Iterable, List, Optional
+
+from sqlalchemy import select, exists, func, union_all
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.sql import Subquery
+
+from app.models.transaction import Transaction
+from app.models.transaction_split import TransactionSplit
+
+
+def effective_date_column():
+    """SQL expression for a transaction's effective date (transacted_at, falling back to posted)."""
+    return func.coalesce(Transaction.transacted_at, Transaction.posted)
+
+
+def transaction_lines(
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    include_transfers: bool = False,
+    account_ids: Optional[Iterable[str]] = None,
+    changed_since: Optional[int] = None,
+) -> Subquery:
+    """
+    Build a subquery with one row per spending line.
+
+    A transaction without splits contributes a single line with its own amount and
+    subcategory; a split transaction contributes one line per split instead. Filters
+    are applied to both halves of the UNION so they can use the transactions indexes.
+
+    Columns: transaction_id, account_id, subcategory_id, amount, posted, effective_date, is_transfer
+    """
+    effective_date = effective_date_column()
+    has_splits = exists().where(TransactionSplit.transaction_id == Transaction.id)
+
+    direct = select(
+        Transaction.id.label("transaction_id"),
+        Transaction.account_id.label("account_id"),
+        Transaction.subcategory_id.label("subcategory_id"),
+        Transaction.amount.label("amount"),
+        Transaction.posted.label("posted"),
+        effective_date.label("effective_date"),
+        Transaction.is_transfer.label("is_transfer"),
+    ).where(~has_splits)
+
+    split = select(
+        Transaction.id.label("transaction_id"),
+        Transaction.account_id.label("account_id"),
+        TransactionSplit.subcategory_id.label("subcategory_id"),
+        TransactionSplit.amount.label("amount"),
+        Transaction.posted.label("posted"),
+        effective_date.label("effective_date"),
+        Transaction.is_transfer.label("is_transfer"),
+    ).join(TransactionSplit, TransactionSplit.transaction_id == Transaction.id)
+
+    filters = []
+    if not include_transfers:
+        filters.append(Transaction.is_transfer == False)
+    if start_date:
+        filters.append(Transaction.posted >= start_date)
+    if end_date:
+        filters.append(Transaction.posted <= end_date)
+    if account_ids:
+        filters.append(Transaction.account_id.in_(list(account_ids)))
+    if changed_since is not None:
+        filters.append(Transaction.change_seq > changed_since)
+
+    if filters:
+        direct = direct.where(*filters)
+        split = split.where(*filters)
+
+    return union_all(direct, split).subquery("lines")
+
+
+def load_splits(db: Session, transactions: List[Transaction]) -> None:
+    """Populate the splits collection of a batch of transactions with a single query."""
+    splits_by_transaction = defaultdict(list)
+    ids = [t.id for t in transactions]
+    if ids:
+        for split in db.query(TransactionSplit).filter(TransactionSplit.transaction_id.in_(ids)).order_by(TransactionSplit.id):
+            splits_by_transaction[split.transaction_id].append(split)
+    for t in transactions:
+        set_committed_value(t, "splits", splits_by_transaction.get(t.id, []))
@@ -1,17 +1,26 @@
+import time
+_startup_began = time.perf_counter()
+
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from app.core.config import settings
 from app.api.routes import transactions, ml, categories, budgets, accounts, analytics
 from app.core.database import init_db, get_db
 from app.services.category_service import CategoryService
 from apscheduler.schedulers.background import BackgroundScheduler
 import logging
+import threading
 
 from app.api.routes import simplefin
 from app.services.simplefin_service import SimplefinService
 from app.services.account_service import AccountService
 from app.services.transaction_service import TransactionService
+from app.services.recurring_service import RecurringService
+from app.services.budget_ledger_service import BudgetLedgerService
+from app.services.ml_service import get_ml_service
+from app.utils.pagination import NEXT_CURSOR_HEADER
 from sqlalchemy.orm import Session
 
 scheduler = BackgroundScheduler()
@@ -24,13 +33,21 @@ logging.basicConfig(
 # Reduce noise from libraries
 logging.getLogger("urllib3").setLevel(logging.WARNING)
 
+logger = logging.getLogger(__name__)
+
 def scheduled_simplefin_job():
     db = next(get_db())
     try:
         account_service = AccountService()
         transaction_service = TransactionService()
-        simplefin_service = SimplefinService(account_service, transaction_service)
-        simplefin_service.get_accounts(db)
+        simplefin_service = SimplefinService(account_service, transaction_service, RecurringService(), BudgetLedgerService())
+        success, msg = simplefin_service.get_accounts(db)
+        if not success:
+            # Don't keep a half-applied sync (or the ledger marks for it)
+            logger.error(f"Scheduled sync failed: {msg}")
+            db.rollback()
+            return
+        db.commit()
     finally:
         db.close()
 
@@ -48,14 +65,32 @@ async def lifespan(app: FastAPI):
     try:
         category_service = CategoryService()
         category_service.seed_default_categories(db)
+        # Settle balances left stale (e.g. by a migration) so budget reads stay read-only
+        if BudgetLedgerService().recompute(db):
+            db.commit()
     finally:
         db.close()
 
     start_scheduler()
+
+    # Import scikit-learn and load the saved model off the request path
+    if settings.ML_WARMUP_ON_STARTUP:
+        threading.Thread(target=get_ml_service().warm_up, name="ml-warmup", daemon=True).start()
+
+    startup_seconds = time.perf_counter() - _startup_began
+    if startup_seconds > settings.STARTUP_TIME_BUDGET_SECONDS:
+        logger.warning(f"Startup took {startup_seconds:.2f}s (budget {settings.STARTUP_TIME_BUDGET_SECONDS:.2f}s)")
+    else:
+        logger.info(f"Startup took {startup_seconds:.2f}s")
     
     yield
 
-app = FastAPI(title="Budget App API", version="1.0.0", lifespan=lifespan)
+app = FastAPI(
+    title="Budget App API",
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
+)
 
 # CORS configuration for Flutter app
 app.add_middleware(
@@ -64,6 +99,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", NEXT_CURSOR_HEADER],
 )
 
 # Include routers
@@ -0,0 +1,39 @@
+"""Shared fixtures: a fresh in-memory SQLite database per test, built like init_db builds the real one."""
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.database import init_db
+from app.models.account import Account
+from app.models.organization import Organization
+
+
+@pytest.fixture
+def engine():
+    # One shared connection, so every session sees the same in-memory database
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    init_db(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db(engine):
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def account(db) -> Account:
+    db.add(Organization(domain="bank.test", name="Test Bank"))
+    account = Account(
+        id="checking", organization_domain="bank.test", name="Checking",
+        current_balance=1000.0, balance_date=datetime(2026, 1, 1)
+    )
+    db.add(account)
+    db.commit()
+    return account
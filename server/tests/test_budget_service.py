@@ -0,0 +1,86 @@
+from contextlib import contextmanager
+from datetime import datetime
+
+import pytest
+from sqlalchemy import event
+
+from app.models.budget import Budget, SubcategoryBudget
+from app.models.category import Category, Subcategory
+from app.models.transaction import Transaction
+from app.models.transaction_split import TransactionSplit
+from app.services.budget_service import BudgetService
+
+
+@contextmanager
+def count_statements(engine):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+def seed_budget(db, account, subcategory_count: int, year: int = 2026) -> Budget:
+    """A March budget over `subcategory_count` subcategories, each with spending and one split."""
+    category = Category(name=f"Needs {year}")
+    subcategories = [Subcategory(category=category, name=f"Sub {i}") for i in range(subcategory_count)]
+    budget = Budget(name=f"March {year}", year=year, month=3, subcategory_budgets=[
+        SubcategoryBudget(subcategory=subcategory, monthly_assigned=100.0) for subcategory in subcategories
+    ])
+    db.add_all([category, budget])
+    db.flush()
+
+    for i, subcategory in enumerate(subcategories):
+        db.add(Transaction(
+            account_id=account.id, transaction_id=f"direct-{year}-{i}", amount=-10.0,
+            posted=datetime(year, 3, 5), name="Shop", subcategory_id=subcategory.id
+        ))
+        split = Transaction(
+            account_id=account.id, transaction_id=f"split-{year}-{i}", amount=-5.0,
+            posted=datetime(year, 3, 6), name="Shop", is_split=True
+        )
+        db.add(split)
+        db.flush()
+        db.add_all([
+            TransactionSplit(transaction_id=split.id, subcategory_id=subcategory.id, amount=-2.0),
+            TransactionSplit(transaction_id=split.id, subcategory_id=subcategories[0].id, amount=-3.0),
+        ])
+    # Outside the budget's month
+    db.add(Transaction(
+        account_id=account.id, transaction_id=f"april-{year}", amount=-99.0,
+        posted=datetime(year, 4, 1), name="Shop", subcategory_id=subcategories[0].id
+    ))
+    db.commit()
+    return budget
+
+
+@pytest.mark.parametrize("subcategory_count", [5, 50])
+def test_spending_by_subcategory_is_split_aware(db, account, subcategory_count):
+    budget = seed_budget(db, account, subcategory_count)
+
+    spending = BudgetService().get_spending_by_subcategory(db, budget.id)
+
+    first, *others = [row.subcategory_id for row in budget.subcategory_budgets]
+    assert spending[first] == pytest.approx(12.0 + 3.0 * subcategory_count)
+    assert all(spending[subcategory_id] == pytest.approx(12.0) for subcategory_id in others)
+
+
+def test_spending_by_subcategory_query_count_does_not_grow_with_subcategories(engine, db, account):
+    budgets = [seed_budget(db, account, 5, year=2026), seed_budget(db, account, 50, year=2027)]
+    budget_ids = [budget.id for budget in budgets]
+    db.expire_all()
+
+    counts = []
+    for budget_id in budget_ids:
+        with count_statements(engine) as statements:
+            spending = BudgetService().get_spending_by_subcategory(db, budget_id)
+        assert len(spending) in (5, 50)
+        counts.append(len(statements))
+
+    assert counts[0] == counts[1]
+    assert counts[0] <= 2
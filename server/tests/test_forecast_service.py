@@ -0,0 +1,49 @@
+from datetime import date, datetime
+
+import numpy as np
+
+from app.models.recurring_series import RecurringSeries
+from app.services.forecast_service import ForecastService, series_occurrences
+
+TODAY = date(2026, 10, 19)
+START = np.datetime64(TODAY, "D")
+END = START + 30
+
+
+def make_series(period, next_expected_date, amount=-20.0, account_id="checking") -> RecurringSeries:
+    return RecurringSeries(
+        payee=f"{period} payee", name=f"{period} payee", is_income=amount > 0, account_id=account_id,
+        period=period, interval_days=7.0, average_amount=amount, last_amount=amount, occurrences=8,
+        confidence=0.9, first_date=datetime(2025, 1, 1), last_date=datetime(2025, 1, 1),
+        next_expected_date=next_expected_date, is_active=True
+    )
+
+
+def test_overdue_occurrences_collapse_into_one_on_start():
+    weekly = series_occurrences(make_series("weekly", datetime(2026, 8, 20)), START, END)
+    assert np.count_nonzero(weekly == START) == 1
+    assert np.all(np.diff(weekly) > np.timedelta64(0, "D"))
+
+    monthly = series_occurrences(make_series("monthly", datetime(2026, 5, 3)), START, END)
+    assert list(monthly.astype(date)) == [TODAY, date(2026, 11, 3)]
+
+
+def test_forecast_ignores_series_overdue_beyond_tolerance(db, account):
+    db.add_all([
+        make_series("weekly", datetime(2026, 8, 20)),
+        make_series("monthly", datetime(2026, 5, 3)),
+    ])
+    db.commit()
+
+    forecast = ForecastService().get_forecast(db, days=30, today=TODAY)
+    assert all(point.recurring_bills == 0.0 for point in forecast.points)
+    assert forecast.points[-1].balance == account.current_balance
+
+
+def test_forecast_charges_a_slightly_late_bill_once(db, account):
+    db.add(make_series("monthly", datetime(2026, 10, 17), amount=-50.0))
+    db.commit()
+
+    forecast = ForecastService().get_forecast(db, days=20, today=TODAY)
+    assert forecast.points[0].recurring_bills == -50.0
+    assert forecast.points[-1].balance == account.current_balance - 50.0
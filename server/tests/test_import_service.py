@@ -0,0 +1,40 @@
+import io
+from datetime import datetime
+
+from app.models.transaction import Transaction
+from app.services.import_service import ImportService
+
+CSV = """Date,Description,Amount
+03/02/2026,COFFEE SHOP,-4.50
+03/02/2026,COFFEE SHOP,-4.50
+03/05/2026,GROCER,-62.10
+04/01/2026,RENT,-1500.00
+"""
+
+
+def import_csv(db, account, chunk_size=5000):
+    result = ImportService().import_file(db, account.id, io.StringIO(CSV), chunk_size=chunk_size)
+    db.commit()
+    return result
+
+
+def test_reimporting_a_file_is_a_no_op(db, account):
+    assert import_csv(db, account, chunk_size=1).inserted == 4
+    # Chunks load existing rows for their own dates only; identical rows in one file both survive
+    assert import_csv(db, account, chunk_size=2).inserted == 0
+    assert db.query(Transaction).count() == 4
+
+
+def test_rows_synced_from_another_source_are_matched_on_date_and_amount(db, account):
+    db.add_all([
+        Transaction(account_id=account.id, transaction_id="sync-1", amount=-62.10,
+                    posted=datetime(2026, 3, 5, 9, 30), name="GROCER #12"),
+        # Same amount on a date the file doesn't cover
+        Transaction(account_id=account.id, transaction_id="sync-old", amount=-4.50,
+                    posted=datetime(2020, 1, 1), name="COFFEE SHOP"),
+    ])
+    db.commit()
+
+    result = import_csv(db, account, chunk_size=1)
+    assert (result.inserted, result.duplicates) == (3, 1)
+    assert db.query(Transaction).filter(Transaction.amount == -4.50).count() == 3
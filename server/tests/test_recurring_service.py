@@ -0,0 +1,44 @@
+from datetime import date, datetime
+
+from app.models.recurring_series import RecurringSeries
+from app.services.recurring_service import RecurringService
+
+TODAY = date(2026, 10, 19)
+
+
+def add_series(db, payee, period, next_expected_date, is_active=True) -> RecurringSeries:
+    series = RecurringSeries(
+        payee=payee, name=payee.title(), is_income=False, period=period,
+        interval_days=30.44, average_amount=-15.0, last_amount=-15.0, occurrences=6, confidence=0.9,
+        first_date=datetime(2026, 1, 1), last_date=datetime(2026, 1, 1),
+        next_expected_date=next_expected_date, is_active=is_active
+    )
+    db.add(series)
+    db.commit()
+    return series
+
+
+def test_series_past_their_tolerance_are_not_active(db):
+    add_series(db, "streaming", "monthly", datetime(2026, 10, 17))  # Two days late, within tolerance
+    add_series(db, "cancelled gym", "monthly", datetime(2026, 8, 3))
+    add_series(db, "old podcast", "weekly", datetime(2026, 10, 16))
+
+    service = RecurringService()
+    assert [s.payee for s in service.get_series(db, active_only=True, today=TODAY)] == ["streaming"]
+
+    everything = {s.payee: s.is_active for s in service.get_series(db, active_only=False, today=TODAY)}
+    assert everything == {"streaming": True, "cancelled gym": False, "old podcast": False}
+    # Reading never writes the derived flag back
+    assert not db.dirty
+
+
+def test_sync_deactivates_series_of_payees_it_did_not_see(db):
+    add_series(db, "streaming", "monthly", datetime(2026, 10, 17))
+    add_series(db, "cancelled gym", "monthly", datetime(2026, 8, 3))
+
+    service = RecurringService()
+    assert service.deactivate_missed(db, today=TODAY) == 1
+    db.commit()
+
+    stored = {s.payee: s.is_active for s in db.query(RecurringSeries)}
+    assert stored == {"streaming": True, "cancelled gym": False}
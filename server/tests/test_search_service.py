@@ -0,0 +1,27 @@
+from datetime import datetime
+
+from app.models.account import Account
+from app.models.transaction import Transaction
+from app.services import search_service
+from app.services.search_service import SearchService
+
+
+def test_filtered_results_are_ranked_when_few_rows_remain(db, account, monkeypatch):
+    monkeypatch.setattr(search_service, "RANKED_MATCH_LIMIT", 3)
+    db.add(Account(id="visa", organization_domain="bank.test", name="Visa"))
+    # Inserted first but the better match, so bm25 and newest-first disagree
+    db.add(Transaction(account_id="visa", transaction_id="v1", amount=-4.0, posted=datetime(2026, 5, 1), name="COFFEE COFFEE"))
+    db.add(Transaction(account_id="visa", transaction_id="v2", amount=-6.0, posted=datetime(2026, 5, 2),
+                       name="COFFEE HOUSE DOWNTOWN LOCATION 42 ORDER"))
+    # Enough unfiltered matches to exceed the ranking limit
+    db.add_all([
+        Transaction(account_id=account.id, transaction_id=f"c{i}", amount=-3.0, posted=datetime(2026, 5, 3), name="COFFEE")
+        for i in range(5)
+    ])
+    db.commit()
+
+    results = SearchService().search(db, "coffee", account_ids=["visa"])
+    assert [t.transaction_id for t in results] == ["v1", "v2"]
+
+    newest_first = SearchService().search(db, "coffee")
+    assert newest_first[0].transaction_id == "c4"
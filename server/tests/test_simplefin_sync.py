@@ -0,0 +1,34 @@
+from fastapi.testclient import TestClient
+
+import main
+from app.api.routes import simplefin
+from app.core.database import get_db
+from app.models.organization import Organization
+from app.services.simplefin_service import SimplefinService
+
+
+def failing_sync(self, db, access_token=None):
+    # Writes part of the sync, then fails
+    db.add(Organization(domain="half.test", name="Half applied"))
+    db.flush()
+    return False, "connection dropped"
+
+
+def test_scheduled_sync_discards_a_failed_sync(db, monkeypatch):
+    monkeypatch.setattr(SimplefinService, "get_accounts", failing_sync)
+    monkeypatch.setattr(main, "get_db", lambda: iter([db]))
+
+    main.scheduled_simplefin_job()
+    assert db.query(Organization).count() == 0
+
+
+def test_sync_route_discards_a_failed_sync(db, monkeypatch):
+    monkeypatch.setattr(SimplefinService, "get_accounts", failing_sync)
+    main.app.dependency_overrides[get_db] = lambda: db
+    try:
+        response = TestClient(main.app).post("/api/simplefin/sync")
+    finally:
+        main.app.dependency_overrides.clear()
+
+    assert "connection dropped" in response.json()["error"]
+    assert db.query(Organization).count() == 0
@@ -0,0 +1,39 @@
+"""Cold-start budget: importing the app must stay fast and must not pull in the ML stack."""
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from app.core.config import settings
+
+SERVER_DIR = Path(__file__).resolve().parent.parent
+
+# Loaded lazily by MLService (warm-up thread or first ML request), never by `import main`
+HEAVY_MODULES = ("sklearn", "pandas", "joblib")
+
+IMPORT_MAIN = f"""
+import json, sys, time
+started = time.perf_counter()
+import main
+seconds = time.perf_counter() - started
+print(json.dumps({{
+    "seconds": seconds,
+    "heavy_modules": [name for name in {HEAVY_MODULES!r} if name in sys.modules],
+}}))
+"""
+
+
+def test_import_main_is_within_startup_budget(tmp_path):
+    env = {**os.environ, "DATABASE_URL": f"sqlite:///{tmp_path / 'startup.db'}"}
+    result = subprocess.run(
+        [sys.executable, "-c", IMPORT_MAIN],
+        cwd=SERVER_DIR, env=env, capture_output=True, text=True, check=True
+    )
+    measured = json.loads(result.stdout.strip().splitlines()[-1])
+
+    assert measured["heavy_modules"] == []
+    assert measured["seconds"] < settings.STARTUP_TIME_BUDGET_SECONDS, (
+        f"import main took {measured['seconds']:.2f}s "
+        f"(budget {settings.STARTUP_TIME_BUDGET_SECONDS:.2f}s); see `python -X importtime -c 'import main'`"
+    )
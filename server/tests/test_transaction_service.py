@@ -0,0 +1,47 @@
+from datetime import datetime
+
+import pytest
+
+from app.models.transaction import Transaction
+from app.services.transaction_service import TransactionService
+
+
+def simplefin_transaction(transaction_id: str, amount: float, day: int) -> dict:
+    return {
+        "id": transaction_id,
+        "posted": datetime(2026, 3, day).timestamp(),
+        "amount": amount,
+        "description": "COFFEE SHOP",
+        "pending": False,
+    }
+
+
+@pytest.mark.parametrize("update_existing", [True, False])
+def test_upsert_keeps_the_last_copy_of_a_repeated_id(db, account, update_existing):
+    batch = [
+        simplefin_transaction("bank-1", -4.0, 2),
+        simplefin_transaction("bank-2", -9.0, 3),
+        simplefin_transaction("bank-1", -4.5, 2),
+    ]
+
+    inserted, updated, _ = TransactionService().upsert_transactions(batch, account.id, db, update_existing=update_existing)
+    db.commit()
+
+    assert (inserted, updated) == (2, 0)
+    rows = {t.transaction_id: t.amount for t in db.query(Transaction)}
+    assert rows == {"bank-1": -4.5, "bank-2": -9.0}
+
+
+@pytest.mark.parametrize("update_existing", [True, False])
+def test_upsert_handles_a_repeated_id_that_already_exists(db, account, update_existing):
+    service = TransactionService()
+    service.upsert_transactions([simplefin_transaction("bank-1", -4.0, 2)], account.id, db)
+    db.commit()
+
+    batch = [simplefin_transaction("bank-1", -4.25, 2), simplefin_transaction("bank-1", -4.5, 2)]
+    inserted, updated, _ = service.upsert_transactions(batch, account.id, db, update_existing=update_existing)
+    db.commit()
+
+    assert inserted == 0
+    assert updated == (1 if update_existing else 0)
+    assert db.query(Transaction).one().amount == (-4.5 if update_existing else -4.0)
@@ -0,0 +1,68 @@
+from datetime import datetime, timedelta
+
+from app.models.transaction import Transaction
+from app.services.transaction_store import TransactionStore
+
+
+def add_transaction(db, account, amount, posted, **values) -> Transaction:
+    transaction = Transaction(
+        account_id=account.id, transaction_id=f"bank-{amount}-{posted:%Y%m%d}",
+        amount=amount, posted=posted, name="Test", **values
+    )
+    db.add(transaction)
+    db.commit()
+    return transaction
+
+
+def store_total(store: TransactionStore) -> float:
+    _, _, _, rows = store.summarize()
+    return round(sum(net for _, _, _, net in rows), 2)
+
+
+def test_refresh_picks_up_rows_committed_after_a_later_write(db, account):
+    store = TransactionStore()
+    add_transaction(db, account, -10.0, datetime(2026, 3, 1))
+    store.refresh(db)
+    assert store_total(store) == -10.0
+
+    # A long sync or import stamps updated_at when it starts and commits after
+    # others have already written newer timestamps
+    stale = datetime.utcnow() - timedelta(minutes=10)
+    add_transaction(db, account, -25.0, datetime(2026, 3, 2), updated_at=stale)
+    store.refresh(db)
+    assert store_total(store) == -35.0
+
+    late_update = db.query(Transaction).filter(Transaction.amount == -25.0).one()
+    late_update.amount = -30.0
+    late_update.updated_at = stale
+    db.commit()
+    store.refresh(db)
+    assert store_total(store) == -40.0
+    assert store.transaction_count == 2
+
+
+def test_refresh_reloads_when_transactions_are_deleted(db, account):
+    store = TransactionStore()
+    add_transaction(db, account, -10.0, datetime(2026, 3, 1))
+    removed = add_transaction(db, account, -25.0, datetime(2026, 3, 2))
+    store.refresh(db)
+
+    db.delete(removed)
+    db.commit()
+    store.refresh(db)
+    assert store_total(store) == -10.0
+    assert store.transaction_count == 1
+
+
+def test_refresh_reloads_when_a_delete_and_an_insert_balance_out(db, account):
+    store = TransactionStore()
+    add_transaction(db, account, -10.0, datetime(2026, 3, 1))
+    removed = add_transaction(db, account, -25.0, datetime(2026, 3, 2))
+    add_transaction(db, account, -40.0, datetime(2026, 3, 3))
+    store.refresh(db)
+
+    db.delete(removed)
+    add_transaction(db, account, -5.0, datetime(2026, 3, 4))
+    store.refresh(db)
+    assert store.transaction_count == 3
+    assert store_total(store) == -55.0